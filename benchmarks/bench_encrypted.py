@@ -0,0 +1,46 @@
+"""Benchmarks for the encrypted API's crypto."""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("py3rijndael")
+
+from samsungtvws.encrypted.authenticator import (  # noqa: E402
+    SamsungTVEncryptedWSAsyncAuthenticator,
+    _generate_server_hello,
+    _parse_client_hello,
+)
+from samsungtvws.encrypted.remote import SendRemoteKey  # noqa: E402
+from samsungtvws.encrypted.session import SamsungTVEncryptedSession  # noqa: E402
+
+TOKEN = "037739871315caef138547b03e348b72"
+PIN = "0997"
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+with open(os.path.join(FIXTURES, "auth_generator_client_hello.json")) as file:
+    CLIENT_HELLO = json.loads(json.loads(file.read())["auth_data"])[
+        "GeneratorClientHello"
+    ]
+
+
+def test_encrypt_command(benchmark) -> None:
+    session = SamsungTVEncryptedSession(TOKEN, "1")
+    command = SendRemoteKey.click("KEY_POWER")
+    benchmark(session.encrypt_command, command)
+
+
+def test_generate_server_hello(benchmark) -> None:
+    benchmark(_generate_server_hello, SamsungTVEncryptedWSAsyncAuthenticator.USER_ID, PIN)
+
+
+def test_parse_client_hello(benchmark) -> None:
+    user_id = SamsungTVEncryptedWSAsyncAuthenticator.USER_ID
+    hello = _generate_server_hello(user_id, PIN)
+    result = benchmark(
+        _parse_client_hello, CLIENT_HELLO, hello["hash"], hello["AES_key"], user_id
+    )
+    assert result is not None
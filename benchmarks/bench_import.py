@@ -0,0 +1,19 @@
+"""Benchmark for the import time of samsungtvws."""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_samsungtvws(benchmark) -> None:
+    """A fresh interpreter importing the package, startup included."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def run():
+        subprocess.run(
+            [sys.executable, "-c", "import samsungtvws"], check=True, env=env
+        )
+
+    benchmark.pedantic(run, rounds=10, warmup_rounds=1)
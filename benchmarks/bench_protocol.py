@@ -0,0 +1,69 @@
+"""Benchmarks for command serialization and response parsing."""
+
+import json
+
+from samsungtvws.async_art import ArtChannelEmitCommand
+from samsungtvws.emulator import make_content
+from samsungtvws.helper import iter_content_list, process_api_response
+from samsungtvws.remote import SendRemoteKey
+
+CONTENT_LIST = json.dumps(make_content(2000, "MY-C0002") + make_content(500, "MY-C0004"))
+RESPONSE = json.dumps(
+    {
+        "event": "d2d_service_message",
+        "from": "77151bce-7dd2-4c4c-9b78-4d33b16fb1b",
+        "data": json.dumps(
+            {
+                "event": "content_list",
+                "id": "ed082caa-8467-4e3b-9131-0c693a0fc42e",
+                "content_list": json.dumps(make_content(20)),
+            }
+        ),
+    }
+)
+
+
+def test_remote_key_payload(benchmark) -> None:
+    command = SendRemoteKey.click("KEY_POWER")
+    benchmark(command.get_payload)
+
+
+def test_art_request_payload(benchmark) -> None:
+    def serialize():
+        return ArtChannelEmitCommand.art_app_request(
+            {
+                "request": "select_image",
+                "category_id": None,
+                "content_id": "MY_F0001",
+                "show": True,
+                "id": "ed082caa-8467-4e3b-9131-0c693a0fc42e",
+                "request_id": "ed082caa-8467-4e3b-9131-0c693a0fc42e",
+            }
+        ).get_payload()
+
+    benchmark(serialize)
+
+
+def test_process_api_response(benchmark) -> None:
+    benchmark(process_api_response, RESPONSE)
+
+
+def test_art_response_double_decode(benchmark) -> None:
+    """The websocket frame, then the art event in its data field."""
+
+    def decode():
+        return json.loads(process_api_response(RESPONSE)["data"])
+
+    benchmark(decode)
+
+
+def test_content_list_full(benchmark) -> None:
+    result = benchmark(lambda: list(iter_content_list(CONTENT_LIST)))
+    assert len(result) == 2500
+
+
+def test_content_list_category(benchmark) -> None:
+    result = benchmark(
+        lambda: list(iter_content_list(CONTENT_LIST, "MY-C0004", ["content_id"]))
+    )
+    assert len(result) == 500
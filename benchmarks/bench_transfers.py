@@ -0,0 +1,62 @@
+"""Benchmarks for art request round trips and D2D transfers against the emulator."""
+
+import pytest
+
+from samsungtvws.art import SamsungTVArt
+from samsungtvws.async_art import SamsungTVAsyncArt
+
+UPLOAD = b"\xff\xd8" + bytes(range(256)) * (4 * 1024 * 4)  # ~4 MiB
+THUMBNAILS = ["MY_F{:04d}".format(i) for i in range(1, 9)]
+
+
+@pytest.fixture(name="async_art")
+def get_async_art(fake_tv, loop):
+    tv_art = SamsungTVAsyncArt(
+        fake_tv.host, port=fake_tv.port, key_press_delay=0, check_token=False
+    )
+    loop.run_until_complete(tv_art.start_listening())
+    yield tv_art
+    loop.run_until_complete(tv_art.close())
+
+
+@pytest.fixture(name="sync_art")
+def get_sync_art(fake_tv):
+    tv_art = SamsungTVArt(fake_tv.host, port=fake_tv.port, key_press_delay=0, timeout=5)
+    yield tv_art
+    tv_art.close()
+
+
+def test_async_art_request_rtt(benchmark, async_art, loop) -> None:
+    result = benchmark(lambda: loop.run_until_complete(async_art.get_artmode()))
+    assert result == "on"
+
+
+def test_sync_art_request_rtt(benchmark, sync_art) -> None:
+    result = benchmark(sync_art.get_artmode)
+    assert result == "on"
+
+
+def test_async_upload(benchmark, async_art, loop) -> None:
+    benchmark.extra_info["bytes"] = len(UPLOAD)
+    content_id = benchmark.pedantic(
+        lambda: loop.run_until_complete(async_art.upload(UPLOAD, file_type="jpg")),
+        rounds=10,
+    )
+    assert content_id
+
+
+def test_async_thumbnail_download(benchmark, fake_tv, async_art, loop) -> None:
+    benchmark.extra_info["bytes"] = fake_tv.thumbnail_size * len(THUMBNAILS)
+    result = benchmark.pedantic(
+        lambda: loop.run_until_complete(async_art.get_thumbnail_list(THUMBNAILS)),
+        rounds=20,
+    )
+    assert len(result) == len(THUMBNAILS)
+
+
+def test_sync_thumbnail_download(benchmark, fake_tv, sync_art) -> None:
+    benchmark.extra_info["bytes"] = fake_tv.thumbnail_size * len(THUMBNAILS)
+    result = benchmark.pedantic(
+        sync_art.get_thumbnail_list, args=(THUMBNAILS,), rounds=20
+    )
+    assert len(result) == len(THUMBNAILS)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare benchmark results against the tracked baseline.
+
+Usage (from the repository root):
+    pytest benchmarks --benchmark-json=.benchmarks/latest.json
+    python -m benchmarks.check .benchmarks/latest.json [--threshold 0.25]
+    python -m benchmarks.check .benchmarks/latest.json --update
+
+A benchmark regresses when its median is more than threshold (a fraction)
+above the baseline median. --update writes the results as the new
+baseline. Timings depend on the machine, so compare runs from the machine
+the baseline was recorded on, or record a local baseline first.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from typing import Any, Dict, List, Optional
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read the medians out of a pytest-benchmark json file."""
+    with open(path) as file:
+        data = json.load(file)
+    results = {}
+    for bench in data["benchmarks"]:
+        result = {"median": bench["stats"]["median"], "min": bench["stats"]["min"]}
+        if "bytes" in bench.get("extra_info", {}):
+            result["bytes_per_second"] = bench["extra_info"]["bytes"] / bench["stats"]["median"]
+        results[bench["fullname"]] = result
+    return results
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    results: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """Print a comparison table, return the names of regressed benchmarks."""
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{'new':>8}  {result['median'] * 1e6:14.1f} us  {name}")
+            continue
+        change = result["median"] / base["median"] - 1
+        status = "SLOWER" if change > threshold else "ok"
+        if change > threshold:
+            regressions.append(name)
+        print(f"{status:>8}  {result['median'] * 1e6:14.1f} us  {change:+7.1%}  {name}")
+    for name in sorted(set(baseline) - set(results)):
+        print(f"{'missing':>8}  {'':14}     {name}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", help="pytest-benchmark json output")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--update", action="store_true", help="save results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = load_results(args.results)
+    if args.update:
+        with open(args.baseline, "w") as file:
+            json.dump(
+                {
+                    "machine": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+                    "threshold": args.threshold if args.threshold is not None else 0.25,
+                    "benchmarks": results,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+            file.write("\n")
+        print(f"Saved {len(results)} benchmarks to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    threshold = args.threshold if args.threshold is not None else baseline["threshold"]
+    print(f"baseline: {baseline['machine']}, threshold {threshold:.0%}")
+    regressions = compare(baseline["benchmarks"], results, threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
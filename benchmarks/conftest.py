@@ -0,0 +1,48 @@
+"""Fixtures for the benchmarks."""
+
+import asyncio
+import threading
+
+import pytest
+
+from samsungtvws.emulator import FakeSamsungTV, make_content
+
+
+class ThreadedFakeTV:
+    """A FakeSamsungTV on its own event loop thread.
+
+    The client under test keeps its own loop, so the emulator's work is not
+    counted against the client, as with a real TV.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self.tv = FakeSamsungTV(**kwargs)
+        self.call(self.tv.start())
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self) -> None:
+        self.call(self.tv.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+@pytest.fixture(name="fake_tv", scope="module")
+def get_fake_tv():
+    """Start an emulated TV with a thousand images and 256 KiB thumbnails."""
+    server = ThreadedFakeTV(content=make_content(1000), thumbnail_size=256 * 1024)
+    yield server.tv
+    server.close()
+
+
+@pytest.fixture(name="loop")
+def get_loop():
+    """An event loop for the client side of a benchmark."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
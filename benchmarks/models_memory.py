@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Compare memory used by art content records against plain dicts.
+
+Usage (from the repository root):
+    python -m benchmarks.models_memory [tvs] [entries_per_tv]
+"""
+
+import json
+import sys
+import tracemalloc
+
+from samsungtvws.models import ArtContent
+
+CATEGORIES = ["MY-C0002", "MY-C0004", "MY-C0008"]
+MATTES = ["none", "shadowbox_polar", "modern_apricot", "flexible_black"]
+
+
+def content_list(entries: int) -> str:
+    """Build a content list string with the keys a TV sends for each entry."""
+    return json.dumps(
+        [
+            {
+                "content_id": "MY_F{:04d}".format(i),
+                "category_id": CATEGORIES[i % len(CATEGORIES)],
+                "matte_id": MATTES[i % len(MATTES)],
+                "portrait_matte_id": MATTES[(i + 1) % len(MATTES)],
+                "width": 3840,
+                "height": 2160,
+                "image_date": "2024:05:0{} 12:00:00".format(i % 9 + 1),
+                "content_type": "mobile",
+                "slideshow": "false",
+            }
+            for i in range(entries)
+        ]
+    )
+
+
+def measure(tvs: int, entries: int, as_records: bool) -> int:
+    raw = [content_list(entries) for _ in range(tvs)]
+    tracemalloc.start()
+    catalogs = [
+        [ArtContent.from_dict(v) for v in json.loads(data)]
+        if as_records
+        else json.loads(data)
+        for data in raw
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalogs
+    return current
+
+
+def main() -> None:
+    tvs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    entries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    dicts = measure(tvs, entries, as_records=False)
+    records = measure(tvs, entries, as_records=True)
+    print(f"{tvs} TVs x {entries} entries")
+    print(f"dicts:   {dicts / 1024 / 1024:8.1f} MiB")
+    print(f"records: {records / 1024 / 1024:8.1f} MiB ({records / dicts:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,7 @@ import os
 from pathlib import Path
 from signal import SIGTERM, SIGINT
 
-from samsungtvws.async_art import SamsungTVAsyncArt
-from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.async_tv import SamsungTV
 from samsungtvws.remote import SendRemoteKey
 from samsungtvws import exceptions, __version__
 
@@ -28,9 +27,8 @@ class EnsureArtMode:
         self.exit = False
         self.task = None
         self.add_signals()
-        self.log.info('opening art websocket with token')
-        self.tv_art = SamsungTVAsyncArt(host=self.ip, port=8002, token_file=self.token_file)
-        self.tv = SamsungTVWSAsyncRemote(host=self.ip, port=8002, token_file=self.token_file)
+        self.log.info('opening remote and art websockets with token')
+        self.tv = SamsungTV(host=self.ip, port=8002, token_file=self.token_file)
         
     def close(self):
         '''
@@ -55,8 +53,7 @@ class EnsureArtMode:
         '''
         Start monitoring art mode
         '''
-        await self.tv.start_listening()
-        await self.tv_art.start_listening()
+        await self.tv.start()
         # this is just an example, really could just await self.ensure_artmode()
         #await self.ensure_artmode()
         # or example of running as a task
@@ -80,22 +77,22 @@ class EnsureArtMode:
             while not self.exit:
                 try:
                     #is tv on (calls tv rest api)
-                    tv_on = await self.tv_art.on()
+                    tv_on = await self.tv.on()
                     self.log.info('tv is on: {}'.format(tv_on))
                     
                     if tv_on:
                         #is art mode on
-                        art_mode = await self.tv_art.get_artmode()                  #calls websocket command to determine status
+                        art_mode = await self.tv.art.get_artmode()                  #calls websocket command to determine status
                         self.log.info('art mode is: {}'.format(art_mode))
                         
                         #is tv on and in art mode (alternative)
-                        #art_mode = await self.tv_art.in_artmode()                   #calls rest api and websocket command to determine status
+                        #art_mode = await self.tv.art.in_artmode()                   #calls rest api and websocket command to determine status
                         #self.info('TV is in art mode: {}'.format(art_mode))
                 
                         if art_mode != "on":
                             # Turn off
                             self.log.info('Turning TV off - to art mode')
-                            await self.tv.send_command(SendRemoteKey.click("KEY_POWER"))
+                            await self.tv.remote.send_command(SendRemoteKey.click("KEY_POWER"))
                         
                 except exceptions.ResponseError as e:
                     self.log.warning('ERROR: {}'.format(e))
@@ -109,7 +106,6 @@ class EnsureArtMode:
         except Exception as e:
             self.log.exception(e)
         await self.tv.close()
-        await self.tv_art.close()
 
 
 def parseargs():
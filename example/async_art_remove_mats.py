@@ -7,6 +7,7 @@ import asyncio
 import argparse
 
 from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.art_batch import ArtOperation
 from samsungtvws import __version__
 from samsungtvws.exceptions import ResponseError
 
@@ -67,6 +68,7 @@ async def main():
         # List the art available in My-Photos on the device (or all art if -A selected)
         available_art = await tv.available(None if args.all else 'MY-C0002', timeout=10)
         
+        operations = []
         for art in available_art:
             try:
                 #set target mat/color combo
@@ -89,13 +91,21 @@ async def main():
                     logging.info(
                         "Setting matte to {} for {}".format(target_matte_type, art["content_id"])
                     )
-                    try:
-                        await tv.change_matte(art["content_id"], target_matte_type)
-                    except ResponseError:
-                        logging.warning('Unable to change mat to {} for {} ({}x{})'.format(target_matte_type, art["content_id"], art["width"], art["height"]))
+                    operations.append(ArtOperation.change_matte(art["content_id"], target_matte_type))
             except KeyError:
                 logging.warning('no mat for {}'.format(art))    
                 
+        # send all the changes at once, with several requests in flight
+        art_by_id = {art["content_id"]: art for art in available_art}
+        outcomes = await tv.run_batch(operations)
+        for index, operation in enumerate(operations):
+            outcome = outcomes[index]
+            if isinstance(outcome, ResponseError):
+                art = art_by_id[operation.content_id]
+                logging.warning('Unable to change mat to {} for {} ({}x{})'.format(operation.params["matte_id"], art["content_id"], art.get("width"), art.get("height")))
+            elif isinstance(outcome, Exception):
+                logging.warning('Error changing mat for {}: {}'.format(operation.content_id, outcome))
+
     await tv.close()
 
 
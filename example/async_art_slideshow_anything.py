@@ -32,6 +32,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.thumbnail_cache import ThumbnailCache, guess_file_type
 from samsungtvws import __version__
 
 logging.basicConfig(level=logging.INFO)
@@ -85,6 +86,8 @@ class slideshow:
         self.api_version = 1
         self.start = time.time()
         self.tv = SamsungTVAsyncArt(host=self.ip, port=8002, token_file=self.token_file)
+        self.thumbnail_cache = ThumbnailCache('./thumbnail_cache')
+        self.thumbnail_cache.attach(self.tv)
         
         self.log.info('check thumbnails {}, slideshow rotation every: {}'.format('every {}s'.format(self.period) if self.period else 'once', datetime.timedelta(seconds = self.random_update)))
         try:
@@ -124,12 +127,12 @@ class slideshow:
     async def get_thumbnails(self, content_ids):
         thumbnails = {}
         if content_ids:
-            if self.api_version == 0:
-                if len(content_ids) > 10:
-                    self.log.info('This may take a few minutes...')
-                thumbnails = await self.tv.get_thumbnail(content_ids, True)
-            elif self.api_version == 1:
-                thumbnails = await self.tv.get_thumbnail_list(content_ids)
+            if len(content_ids) > 10:
+                self.log.info('This may take a few minutes...')
+            cached, failures = await self.thumbnail_cache.get_thumbnails(self.tv, list(content_ids))
+            if failures:
+                self.log.warning('failed to get {} thumbnails: {}'.format(len(failures), list(failures.keys())))
+            thumbnails = {'{}.{}'.format(content_id, guess_file_type(data)): data for content_id, data in cached.items()}
         self.log.info('got {} thumbnails'.format(len(thumbnails)))
         return thumbnails
         
@@ -30,6 +30,8 @@ class Slideshow:
         #self.tv = SamsungTVWS(host=args.ip, port=8002, token_file=args.token_file)
         if self.get_tv_content():
             self.input_loop()
+        # tv.art() is shared, so all requests above used one art connection
+        self.tv.close()
         
     def input_loop(self):
         '''
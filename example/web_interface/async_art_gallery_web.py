@@ -35,16 +35,20 @@ import asyncio
 import time
 import datetime
 from signal import SIGTERM, SIGINT
+
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.image_hash import HashStore, match_hashes
+from samsungtvws.watcher import FolderWatcher
+from samsungtvws.thumbnail_cache import ThumbnailCache
+from samsungtvws import __version__
+
 HAVE_PIL = False
 try:
-    from PIL import Image, ImageFilter, ImageChops
+    from PIL import Image
     HAVE_PIL=True
 except ImportError:
     pass
 
-from samsungtvws.async_art import SamsungTVAsyncArt
-from samsungtvws import __version__
-
 logging.basicConfig(level=logging.INFO)
     
 class PIL_methods:
@@ -54,6 +58,7 @@ class PIL_methods:
         self.mon = mon
         self.folder = self.mon.folder
         self.uploaded_files = self.mon.uploaded_files
+        self.hash_store = HashStore('./image_hashes.json')
         
     async def initialize(self):
         '''
@@ -92,25 +97,15 @@ class PIL_methods:
     def compare_thumbnails(self, files_images, my_photos_thumbnails):
         '''
         compare file data with thumbnails to find a match, and update update_uploaded_files
-        '''
-        for k, (filename, file_data) in enumerate(files_images.items()):
-            for i, (my_content_id, my_data) in enumerate(my_photos_thumbnails.items()):
-                self.log_progress(len(files_images)*len(my_photos_thumbnails), k*len(files_images)+i)
-                self.log.debug('checking: {} against {}, thumbnail: {} bytes'.format(filename, my_content_id, len(my_data)))
-                if self.are_images_equal(Image.open(io.BytesIO(my_data)), file_data):
-                    self.log.info('found uploaded file: {} as {}'.format(filename, my_content_id))
-                    if filename not in self.uploaded_files.keys():
-                        self.mon.update_uploaded_files(filename, my_content_id)
-                    break
-        
-    def log_progress(self, total, count):
-        '''
-        log % progress every 10% if this will take a while
-        '''
-        if total >= 1000:
-            percent = min(100,(count*100)//total)
-            if count % (total//10) == 0:
-                self.log.info('{}% complete'.format(percent))
+        uses perceptual hashes, so each image is only hashed once (and files only when changed)
+        '''
+        file_hashes = {filename: self.hash_store.hash_file(os.path.join(self.folder, filename)) for filename in files_images.keys()}
+        thumbnail_hashes = {content_id: self.hash_store.hash_bytes('{}/{}'.format(self.mon.ip, content_id), data) for content_id, data in my_photos_thumbnails.items()}
+        self.hash_store.save()
+        for filename, my_content_id in match_hashes(file_hashes, thumbnail_hashes).items():
+            self.log.info('found uploaded file: {} as {}'.format(filename, my_content_id))
+            if filename not in self.uploaded_files.keys():
+                self.mon.update_uploaded_files(filename, my_content_id)
         
     def load_files(self):
         '''
@@ -149,10 +144,9 @@ class PIL_methods:
         '''
         thumbnails = {}
         if content_ids:
-            if self.mon.api_version == 0:
-                thumbnails = {content_id:await self.mon.tv.get_thumbnail(content_id) for content_id in content_ids}
-            elif self.mon.api_version == 1:
-                thumbnails = {os.path.splitext(k)[0]:v for k,v in (await self.mon.tv.get_thumbnail_list(content_ids)).items()}
+            thumbnails, failures = await self.mon.thumbnail_cache.get_thumbnails(self.mon.tv, content_ids)
+            if failures:
+                self.log.warning('failed to get {} thumbnails: {}'.format(len(failures), list(failures.keys())))
         self.log.info('got {} thumbnails'.format(len(thumbnails)))
         return thumbnails
         
@@ -167,18 +161,6 @@ class PIL_methods:
             self.log.warning('file {} type changed from {} to {}'.format(filename, org, file_type))
         return file_type
         
-    def are_images_equal(self, img1, img2):
-        '''
-        rough check if images are similar using PIL (avoid numpy which is faster)
-        '''
-        img1 = img1.convert('L').resize((384, 216)).filter(ImageFilter.GaussianBlur(radius=2))
-        img2 = img2.convert('L').resize((384, 216)).filter(ImageFilter.GaussianBlur(radius=2))
-        img3 = ImageChops.difference(img1, img2)    #updated 11/3/25 per suggestion in issue #11
-        diff = sum(list(img3.getdata()))/(384*216)  #normalize
-        equal_content = diff <= 1.0                 #pick a threshhold
-        self.log.debug('equal_content: {}, diff: {}'.format(equal_content, diff))
-        return equal_content
-    
 class monitor_and_display:
     
     allowed_ext = ['jpg', 'jpeg', 'png', 'bmp', 'tif']
@@ -205,10 +187,13 @@ class monitor_and_display:
         self.start = time.time()
         self.skip = time.time() - self.display_for
         self.current_content_id = None
+        self.settled_files = set()
         self.prev_filename = None
         self.updated = True
         self.pil = PIL_methods(self)
         self.tv = SamsungTVAsyncArt(host=self.ip, port=8002, token_file=self.token_file)
+        self.thumbnail_cache = ThumbnailCache('./thumbnail_cache')
+        self.thumbnail_cache.attach(self.tv)
         try:
             #doesn't work in Windows
             asyncio.get_running_loop().add_signal_handler(SIGINT, self.close)
@@ -462,8 +447,10 @@ class monitor_and_display:
         return False
             
     async def wait_for_files(self, files):
-        #wait for files to arrive
-        await asyncio.sleep(min(10, 5 * len(files)))
+        #wait for files to arrive, files reported by the folder watcher have already finished changing
+        unsettled = [f for f in files if f not in self.settled_files]
+        if unsettled:
+            await asyncio.sleep(min(10, 5 * len(unsettled)))
             
     async def update_art_timer(self):
         '''
@@ -600,11 +587,16 @@ class monitor_and_display:
         initialize, check directory for changed files and update
         '''
         await self.initialize()
-        while True:
-            await self.check_dir()
-            if self.period == 0:
-                break
-            await asyncio.sleep(self.period)
+        await self.check_dir()
+        if self.period == 0:
+            return
+        #wake as soon as files finish changing (inotify on Linux, polling elsewhere), or every period for the slideshow
+        async with FolderWatcher(self.folder, self.allowed_ext, poll_interval=min(5, self.period)) as watcher:
+            while True:
+                self.settled_files = await watcher.wait(timeout=self.period)
+                if self.settled_files:
+                    self.log.info('files changed: {}'.format(sorted(self.settled_files)))
+                await self.check_dir()
             
 async def main():
     global log
@@ -19,12 +19,13 @@ import uuid
 
 import websocket
 
-from . import exceptions, helper
+from . import exceptions, helper, metrics, recorder, tracing
 from .command import SamsungTVCommand
 from .connection import SamsungTVWSConnection
 from .event import D2D_SERVICE_MESSAGE_EVENT, MS_CHANNEL_READY_EVENT
 from .rest import SamsungTVRest
 from .helper import get_ssl_context
+from .models import ArtContent, Matte, MatteColor, PhotoFilter
 
 _LOGGING = logging.getLogger(__name__)
 
@@ -70,6 +71,28 @@ class SamsungTVArt(SamsungTVWSConnection):
         self.art_uuid = str(uuid.uuid4())
         self._rest_api: Optional[SamsungTVRest] = None
         self.pending_requests = None
+        self._refs = 0
+
+    def acquire(self) -> "SamsungTVArt":
+        '''
+        take a reference to a shared channel, see SamsungTVWS.art()
+        a dropped connection is discarded, so the next request opens a new one
+        '''
+        if self.connection is not None and not self.is_alive():
+            _LOGGING.debug('art channel connection lost, reconnecting on next request')
+            self.connection = None
+        self._refs += 1
+        return self
+
+    def close(self, force: bool = False) -> None:
+        '''
+        the connection is only closed when the last reference to a shared channel is closed, or if force is set
+        '''
+        if self._refs > 1 and not force:
+            self._refs -= 1
+            return
+        self._refs = 0
+        super().close()
 
     def open(self) -> websocket.WebSocket:
         super().open()
@@ -77,7 +100,7 @@ class SamsungTVArt(SamsungTVWSConnection):
         # Override base class to wait for MS_CHANNEL_READY_EVENT
         assert self.connection
         data = self.connection.recv()
-        response = helper.process_api_response(data)
+        response = helper.process_api_response(data, self.recorder)
         event = response.get("event", "*")
         self._websocket_event(event, response)
 
@@ -94,32 +117,37 @@ class SamsungTVArt(SamsungTVWSConnection):
     def get_websocket_message(self):
         try:
             raw_data = self.connection.recv()
-            response = helper.process_api_response(raw_data)
+            response = helper.process_api_response(raw_data, self.recorder)
             event = response.get("event", "*")
             self._websocket_event(event, response)
             _LOGGING.debug('event: {}'.format(event))
             if event == D2D_SERVICE_MESSAGE_EVENT:
                 return json.loads(response["data"])
         except websocket.WebSocketTimeoutException as e:
+            if self.recorder is not None:
+                self.recorder.dump_to_log("Art channel timed out")
             raise exceptions.TimeoutError('Websocket Time out: {}'.format(e))
         return {}
         
     def wait_for_response(self, wait_for_event, request_uuid=None):
-        while True:
-            data = self.get_websocket_message()
-            _LOGGING.debug('request_uuid: {}, message uuid: {}'.format(request_uuid, data.get('request_id', data.get('id'))))
-            if data.get('request_id', data.get('id')) == request_uuid:
-                sub_event = data.get("event", "*")
-                _LOGGING.debug('sub_event: {}, wait_for_event: {}'.format(sub_event, wait_for_event))
-                if sub_event == "error":
-                    raise exceptions.ResponseError(
-                        f"{json.loads(data['request_data'])['request']} request failed "
-                        f"with error number {data['error_code']}"
-                    )
-                # Check sub event, return if found or not defined
-                if not wait_for_event or sub_event == wait_for_event:
-                    return data
-        return None
+        with tracing.span(tracing.WAIT_FOR_RESPONSE, host=self.host, request_id=request_uuid, sub_event=wait_for_event):
+            while True:
+                data = self.get_websocket_message()
+                _LOGGING.debug('request_uuid: {}, message uuid: {}'.format(request_uuid, data.get('request_id', data.get('id'))))
+                if data.get('request_id', data.get('id')) == request_uuid:
+                    sub_event = data.get("event", "*")
+                    _LOGGING.debug('sub_event: {}, wait_for_event: {}'.format(sub_event, wait_for_event))
+                    if sub_event == "error":
+                        if self.recorder is not None:
+                            self.recorder.dump_to_log("Art request failed")
+                        raise exceptions.ResponseError(
+                            f"{json.loads(data['request_data'])['request']} request failed "
+                            f"with error number {data['error_code']}"
+                        )
+                    # Check sub event, return if found or not defined
+                    if not wait_for_event or sub_event == wait_for_event:
+                        return data
+            return None
 
     def _send_art_request(
         self,
@@ -129,8 +157,22 @@ class SamsungTVArt(SamsungTVWSConnection):
         if not request_data.get("id"):
             request_data["id"] = self.get_uuid()            #old api
         request_data["request_id"] = request_data["id"]     #new api  
-        self.send_command(ArtChannelEmitCommand.art_app_request(request_data))
-        return self.wait_for_response(wait_for_event, request_data["id"])
+        with tracing.span(
+            tracing.ART_REQUEST,
+            host=self.host,
+            request=request_data.get("request"),
+            request_id=request_data["id"],
+            content_id=request_data.get("content_id"),
+        ):
+            started = metrics.start()
+            self.send_command(ArtChannelEmitCommand.art_app_request(request_data))
+            try:
+                data = self.wait_for_response(wait_for_event, request_data["id"])
+            except exceptions.TimeoutError:
+                metrics.increment(metrics.ART_REQUEST_TIMEOUTS, self.host, ART_ENDPOINT, request_data.get("request", ""))
+                raise
+        metrics.observe(metrics.ART_REQUEST_SECONDS, started, self.host, ART_ENDPOINT, request_data.get("request", ""))
+        return data
 
     def _get_rest_api(self) -> SamsungTVRest:
         if self._rest_api is None:
@@ -162,19 +204,32 @@ class SamsungTVArt(SamsungTVWSConnection):
         assert data
         return data
 
-    def available(self, category=None):
+    def available(self, category=None, fields=None, as_records=False):
+        '''
+        category is 'MY-C0004' or 'MY-C0002' where 4 is favourites, 2 is my pictures, and 8 is store
+        fields is an optional list of keys to keep in each entry, eg ['content_id', 'matte_id']
+        as_records returns compact ArtContent records instead of dicts
+        '''
+        entries = self.iter_available(category, fields)
+        return [ArtContent.from_dict(v) for v in entries] if as_records else list(entries)
+
+    def iter_available(self, category=None, fields=None):
+        '''
+        as available(), but returns a generator that parses entries one at a time
+        entries not in category are skipped without being decoded
+        '''
         data = self._send_art_request(
             {"request": "get_content_list", "category": category}
         )
         assert data
-        return [ v for v in json.loads(data["content_list"]) if v['category_id'] == category] if category else json.loads(data["content_list"])
+        return helper.iter_content_list(data["content_list"], category, fields)
 
-    def get_current(self):
+    def get_current(self, as_records=False):
         data = self._send_art_request(
             {"request": "get_current_artwork"}
         )
         assert data
-        return data
+        return ArtContent.from_dict(data) if as_records else data
         
     def set_favourite(self, content_id, status='on'):
         data = self._send_art_request(
@@ -289,24 +344,34 @@ class SamsungTVArt(SamsungTVWSConnection):
         )
         assert data
         conn_info = json.loads(data["conn_info"])
-        art_socket_raw = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        art_socket = get_ssl_context().wrap_socket(art_socket_raw) if conn_info.get('secured', False) else art_socket_raw
-        art_socket.connect((conn_info["ip"], int(conn_info["port"])))
-        total_num_thumbnails = 1
-        current_thumb = -1
-        thumbnail_data_dict = {}
-        while current_thumb+1 < total_num_thumbnails:
-            header_len = int.from_bytes(art_socket.recv(4), "big")
-            header = json.loads(art_socket.recv(header_len))
-            thumbnail_data_len = int(header["fileLength"])
-            current_thumb = int(header["num"])
-            total_num_thumbnails = int(header["total"])
-            filename = "{}.{}".format(header["fileID"], header["fileType"])
-            thumbnail_data = bytearray()
-            while len(thumbnail_data) < thumbnail_data_len:
-                packet = art_socket.recv(thumbnail_data_len - len(thumbnail_data))
-                thumbnail_data.extend(packet)
-            thumbnail_data_dict[filename]=thumbnail_data
+        started = metrics.start()
+        with tracing.span(tracing.D2D_CONNECT, host=self.host, request="get_thumbnail_list"):
+            art_socket_raw = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            art_socket = get_ssl_context().wrap_socket(art_socket_raw) if conn_info.get('secured', False) else art_socket_raw
+            art_socket.connect((conn_info["ip"], int(conn_info["port"])))
+        with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="get_thumbnail_list") as span:
+            total_num_thumbnails = 1
+            current_thumb = -1
+            thumbnail_data_dict = {}
+            while current_thumb+1 < total_num_thumbnails:
+                header_len = int.from_bytes(art_socket.recv(4), "big")
+                raw_header = art_socket.recv(header_len)
+                header = json.loads(raw_header)
+                thumbnail_data_len = int(header["fileLength"])
+                current_thumb = int(header["num"])
+                total_num_thumbnails = int(header["total"])
+                filename = "{}.{}".format(header["fileID"], header["fileType"])
+                thumbnail_data = bytearray()
+                while len(thumbnail_data) < thumbnail_data_len:
+                    packet = art_socket.recv(thumbnail_data_len - len(thumbnail_data))
+                    thumbnail_data.extend(packet)
+                thumbnail_data_dict[filename]=thumbnail_data
+                if self.recorder is not None:
+                    self.recorder.record_transfer(recorder.D2D_INBOUND, "{}:{}".format(conn_info["ip"], conn_info["port"]), raw_header.decode(), thumbnail_data_len)
+            size = sum(map(len, thumbnail_data_dict.values()))
+            span.set_attribute("bytes", size)
+        metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "get_thumbnail_list")
+        metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "get_thumbnail_list", size)
         return thumbnail_data_dict
 
     def get_thumbnail(self, content_id_list=[], as_dict=False):
@@ -329,16 +394,25 @@ class SamsungTVArt(SamsungTVWSConnection):
             assert data
             conn_info = json.loads(data["conn_info"])
 
-            art_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            art_socket.connect((conn_info["ip"], int(conn_info["port"])))
-            header_len = int.from_bytes(art_socket.recv(4), "big")
-            header = json.loads(art_socket.recv(header_len))
-
-            thumbnail_data_len = int(header["fileLength"])
-            thumbnail_data = bytearray()
-            while len(thumbnail_data) < thumbnail_data_len:
-                packet = art_socket.recv(thumbnail_data_len - len(thumbnail_data))
-                thumbnail_data.extend(packet)
+            started = metrics.start()
+            with tracing.span(tracing.D2D_CONNECT, host=self.host, request="get_thumbnail", content_id=content_id):
+                art_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                art_socket.connect((conn_info["ip"], int(conn_info["port"])))
+            with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="get_thumbnail", content_id=content_id) as span:
+                header_len = int.from_bytes(art_socket.recv(4), "big")
+                raw_header = art_socket.recv(header_len)
+                header = json.loads(raw_header)
+
+                thumbnail_data_len = int(header["fileLength"])
+                thumbnail_data = bytearray()
+                while len(thumbnail_data) < thumbnail_data_len:
+                    packet = art_socket.recv(thumbnail_data_len - len(thumbnail_data))
+                    thumbnail_data.extend(packet)
+                if self.recorder is not None:
+                    self.recorder.record_transfer(recorder.D2D_INBOUND, "{}:{}".format(conn_info["ip"], conn_info["port"]), raw_header.decode(), thumbnail_data_len)
+                span.set_attribute("bytes", thumbnail_data_len)
+            metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "get_thumbnail")
+            metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "get_thumbnail", len(thumbnail_data))
             filename = "{}.{}".format(header["fileID"], header["fileType"])
             thumbnail_data_dict[filename] = thumbnail_data
 
@@ -391,12 +465,19 @@ class SamsungTVArt(SamsungTVWSConnection):
             }
         )
 
-        art_socket_raw = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        art_socket = get_ssl_context().wrap_socket(art_socket_raw) if conn_info.get('secured', False) else art_socket_raw  
-        art_socket.connect((conn_info["ip"], int(conn_info["port"])))
-        art_socket.send(len(header).to_bytes(4, "big"))
-        art_socket.send(header.encode("ascii"))
-        art_socket.send(file)
+        started = metrics.start()
+        with tracing.span(tracing.D2D_CONNECT, host=self.host, request="upload"):
+            art_socket_raw = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            art_socket = get_ssl_context().wrap_socket(art_socket_raw) if conn_info.get('secured', False) else art_socket_raw  
+            art_socket.connect((conn_info["ip"], int(conn_info["port"])))
+        with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="upload", bytes=file_size):
+            art_socket.send(len(header).to_bytes(4, "big"))
+            art_socket.send(header.encode("ascii"))
+            art_socket.send(file)
+        if self.recorder is not None:
+            self.recorder.record_transfer(recorder.D2D_OUTBOUND, "{}:{}".format(conn_info["ip"], conn_info["port"]), header, file_size)
+        metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "upload")
+        metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "upload", file_size)
         #_LOGGING.info('sending: header length: {}, header: {}'.format(len(header).to_bytes(4, "big").hex(), header.encode("ascii")))
 
         data = self.wait_for_response("image_added")
@@ -450,12 +531,13 @@ class SamsungTVArt(SamsungTVWSConnection):
         assert data
         return data.get("current_rotation_status",0)
 
-    def get_photo_filter_list(self):
+    def get_photo_filter_list(self, as_records=False):
         data = self._send_art_request(
             {"request": "get_photo_filter_list"}
         )
         assert data
-        return json.loads(data["filter_list"])
+        filters = json.loads(data["filter_list"])
+        return [PhotoFilter.from_dict(f) for f in filters] if as_records else filters
 
     def set_photo_filter(self, content_id, filter_id):
         self._send_art_request(
@@ -466,12 +548,18 @@ class SamsungTVArt(SamsungTVWSConnection):
             }
         )
 
-    def get_matte_list(self, include_colour=False):
+    def get_matte_list(self, include_colour=False, as_records=False):
         data = self._send_art_request(
             {"request": "get_matte_list"}
         )
         assert data
-        return (json.loads(data["matte_type_list"]), json.loads(data.get("matte_color_list"))) if include_colour else json.loads(data["matte_type_list"])
+        mattes = json.loads(data["matte_type_list"])
+        if as_records:
+            mattes = [Matte.from_dict(m) for m in mattes]
+        if not include_colour:
+            return mattes
+        colours = json.loads(data.get("matte_color_list"))
+        return (mattes, [MatteColor.from_dict(c) for c in colours] if as_records else colours)
 
     def change_matte(self, content_id, matte_id=None, portrait_matte=None):
         '''
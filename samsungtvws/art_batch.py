@@ -0,0 +1,166 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import json
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import uuid
+
+from . import exceptions
+from .event import D2D_SERVICE_MESSAGE_EVENT
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+DELETE_REQUEST = "delete_image_list"
+FAVORITE_CHANGED_EVENT = "favorite_changed"
+
+Outcome = Union[Dict[str, Any], Exception]
+
+
+class ArtOperation(NamedTuple):
+    """One art request in a batch, see ``SamsungTVAsyncArt.run_batch()``.
+
+    params are extra request fields. event is the art event that answers
+    the request, if the TV does not answer it by request id.
+    """
+
+    request: str
+    content_id: str
+    params: Optional[Dict[str, Any]] = None
+    event: Optional[str] = None
+
+    @classmethod
+    def change_matte(
+        cls,
+        content_id: str,
+        matte_id: Optional[str] = None,
+        portrait_matte: Optional[str] = None,
+    ) -> "ArtOperation":
+        params = {"matte_id": matte_id or "none"}
+        if portrait_matte:
+            params["portrait_matte_id"] = portrait_matte
+        return cls("change_matte", content_id, params)
+
+    @classmethod
+    def set_favourite(cls, content_id: str, status: str = "on") -> "ArtOperation":
+        return cls(
+            "change_favorite", content_id, {"status": status}, FAVORITE_CHANGED_EVENT
+        )
+
+    @classmethod
+    def set_photo_filter(cls, content_id: str, filter_id: str) -> "ArtOperation":
+        return cls("set_photo_filter", content_id, {"filter_id": filter_id})
+
+    @classmethod
+    def delete(cls, content_id: str) -> "ArtOperation":
+        return cls(DELETE_REQUEST, content_id)
+
+
+async def run_batch(
+    tv: "SamsungTVAsyncArt",
+    operations: Sequence[ArtOperation],
+    concurrency: int = 8,
+    delete_chunk_size: int = 50,
+    timeout: float = 5,
+) -> List[Outcome]:
+    """Send operations to the TV with up to concurrency requests in flight.
+
+    Deletes are merged into delete_image_list requests of at most
+    delete_chunk_size content ids. Returns one outcome per operation, in
+    order: the TV's response or the exception the request raised, a
+    ``TimeoutError`` if the TV sent no response. A failure does not abort
+    the batch.
+    """
+    outcomes: Dict[int, Outcome] = {}
+    requests: List[Tuple[List[int], Dict[str, Any], Optional[ArtOperation]]] = []
+    deletes = [i for i, op in enumerate(operations) if op.request == DELETE_REQUEST]
+    size = max(1, delete_chunk_size)
+    for start in range(0, len(deletes), size):
+        chunk = deletes[start : start + size]
+        content_id_list = [{"content_id": operations[i].content_id} for i in chunk]
+        requests.append(
+            (chunk, {"request": DELETE_REQUEST, "content_id_list": content_id_list}, None)
+        )
+    for i, op in enumerate(operations):
+        if op.request != DELETE_REQUEST:
+            request_data = dict(
+                op.params or {}, request=op.request, content_id=op.content_id
+            )
+            requests.append(([i], request_data, op))
+
+    # requests answered by an event are matched to it by content_id, so
+    # those for the same event and content_id are sent one at a time
+    waiting: Dict[Tuple[str, str], str] = {}
+    event_locks = {
+        (op.event, op.content_id): asyncio.Lock() for op in operations if op.event
+    }
+
+    def on_event(event: str, response: Dict[str, Any]) -> None:
+        if event != D2D_SERVICE_MESSAGE_EVENT:
+            return
+        data = json.loads(response["data"])
+        request_id = waiting.pop((data.get("event"), data.get("content_id")), None)
+        future = tv.pending_requests.get(request_id) if request_id else None
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    events = {op.event for op in operations if op.event}
+    for event in events:
+        tv.add_listener(event, on_event)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def send(
+        indexes: List[int], request_data: Dict[str, Any], op: Optional[ArtOperation]
+    ) -> None:
+        if op and op.event:
+            async with event_locks[(op.event, op.content_id)]:
+                await send_request(indexes, request_data, op)
+        else:
+            await send_request(indexes, request_data, op)
+
+    async def send_request(
+        indexes: List[int], request_data: Dict[str, Any], op: Optional[ArtOperation]
+    ) -> None:
+        request_data["id"] = str(uuid.uuid4())
+        outcome: Outcome
+        async with semaphore:
+            if op and op.event:
+                waiting[(op.event, op.content_id)] = request_data["id"]
+            try:
+                response = await tv._send_art_request(request_data, timeout=timeout)
+                if response is None:
+                    raise exceptions.TimeoutError(
+                        "{} request timed out".format(request_data["request"])
+                    )
+                outcome = response
+            except Exception as e:
+                _LOGGING.debug("%s request failed: %s", request_data["request"], e)
+                outcome = e
+        for i in indexes:
+            outcomes[i] = outcome
+
+    try:
+        await asyncio.gather(*(send(*request) for request in requests))
+    finally:
+        for event in events:
+            tv.remove_listener(event, on_event)
+    return [outcomes[i] for i in range(len(operations))]
@@ -0,0 +1,428 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
+
+from .event import D2D_SERVICE_MESSAGE_EVENT, parse_art_content_ids
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+MY_PHOTOS_CATEGORY = "MY-C0002"
+FAVOURITES_CATEGORY = "MY-C0004"
+
+IMAGE_ADDED_EVENT = "image_added"
+IMAGE_DELETED_EVENT = "image_deleted"
+FAVORITE_CHANGED_EVENT = "favorite_changed"
+MATTE_CHANGED_EVENT = "matte_changed"
+
+ChangeListener = Callable[[Dict[str, Any]], None]
+
+
+class ArtCatalog:
+    """Local copy of a TV's art content list, kept up to date from art events.
+
+    The catalog is loaded once with ``available()``, then updated from
+    ``image_added``, ``image_deleted``, ``favorite_changed`` and
+    ``matte_changed`` events. A background task reloads it every
+    ``reconcile_interval`` seconds to pick up anything the events missed.
+    All queries are answered locally.
+
+    With a ``snapshot_path``, the catalog, matte and photo filter lists and
+    api version are saved to disk every ``snapshot_interval`` seconds and
+    on stop. On start the snapshot is served at once, and reloaded from the
+    TV in the background. Change listeners are called with an art event
+    dict for every change, whether from a TV event or found on reload.
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(
+        self,
+        tv: "SamsungTVAsyncArt",
+        reconcile_interval: float = 600,
+        refresh_delay: float = 5,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = 300,
+    ) -> None:
+        self.tv = tv
+        self.reconcile_interval = reconcile_interval
+        self.refresh_delay = refresh_delay
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.loaded = False
+        self.mattes: Optional[List[Dict[str, Any]]] = None
+        self.matte_colours: Optional[List[Dict[str, Any]]] = None
+        self.photo_filters: Optional[List[Dict[str, Any]]] = None
+        self.api_version: Optional[str] = None
+        self._content: Dict[str, Dict[str, Any]] = {}
+        self._content_categories: Dict[str, Set[str]] = {}
+        self._categories: Dict[str, Set[str]] = {}
+        self._mattes: Dict[str, Set[str]] = {}
+        self._reconcile_task: Optional["asyncio.Task[None]"] = None
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self._snapshot_task: Optional["asyncio.Task[None]"] = None
+        self._change_listeners: List[ChangeListener] = []
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            IMAGE_ADDED_EVENT: self._on_image_added,
+            IMAGE_DELETED_EVENT: self._on_image_deleted,
+            FAVORITE_CHANGED_EVENT: self._on_favorite_changed,
+            MATTE_CHANGED_EVENT: self._on_matte_changed,
+        }
+
+    def __len__(self) -> int:
+        return len(self._content)
+
+    def __contains__(self, content_id: object) -> bool:
+        return content_id in self._content
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._content)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _emit(self, data: Dict[str, Any]) -> None:
+        for listener in list(self._change_listeners):
+            try:
+                listener(data)
+            except Exception as e:
+                _LOGGING.warning("Catalog change listener failed: %s", e)
+
+    async def start(self) -> None:
+        """Load the catalog, subscribe to art events and start reconciling.
+
+        If a snapshot is loaded, this returns without waiting for the TV.
+        """
+        for trigger in self._handlers:
+            self.tv.add_listener(trigger, self._process_event)
+        if not self.loaded and self.load_snapshot():
+            # serve the snapshot now, the TV is connected in the background
+            self._refresh_task = asyncio.ensure_future(self._warm_refresh())
+        else:
+            await self.tv.start_listening()
+            if not self.loaded:
+                await self.load()
+                if self.snapshot_path:
+                    await self.load_settings()
+                    self.save_snapshot()
+        if self.reconcile_interval > 0 and self._reconcile_task is None:
+            self._reconcile_task = asyncio.ensure_future(self._reconcile_loop())
+        if (
+            self.snapshot_path
+            and self.snapshot_interval > 0
+            and self._snapshot_task is None
+        ):
+            self._snapshot_task = asyncio.ensure_future(self._snapshot_loop())
+
+    async def stop(self) -> None:
+        for trigger in self._handlers:
+            self.tv.remove_listener(trigger, self._process_event)
+        for task in (self._reconcile_task, self._refresh_task, self._snapshot_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._reconcile_task = self._refresh_task = self._snapshot_task = None
+        if self.loaded:
+            self.save_snapshot()
+
+    async def load(self, timeout: float = 10) -> None:
+        """Replace the catalog with a full content list from the TV."""
+        self.replace(await self.tv.available(timeout=timeout))
+
+    async def load_settings(self) -> None:
+        """Load the matte and photo filter lists and api version from the TV."""
+        self.mattes, self.matte_colours = await self.tv.get_matte_list(
+            include_colour=True
+        )
+        self.photo_filters = await self.tv.get_photo_filter_list()
+        self.api_version = await self.tv.get_api_version()
+
+    def get_matte_list(self, include_colour: bool = False) -> Any:
+        """Return the matte list as ``SamsungTVAsyncArt.get_matte_list()``, None if not loaded."""
+        if include_colour:
+            return (self.mattes, self.matte_colours) if self.mattes is not None else None
+        return self.mattes
+
+    def save_snapshot(self) -> None:
+        """Write the catalog and settings to snapshot_path."""
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "host": self.tv.host,
+            "content": self.available(),
+            "mattes": self.mattes,
+            "matte_colours": self.matte_colours,
+            "photo_filters": self.photo_filters,
+            "api_version": self.api_version,
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            _LOGGING.warning("Unable to save catalog snapshot: %s", e)
+
+    def load_snapshot(self) -> bool:
+        """Serve the catalog and settings from snapshot_path, if it is usable."""
+        if not self.snapshot_path:
+            return False
+        try:
+            with open(self.snapshot_path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            if (
+                snapshot.get("version") != self.SNAPSHOT_VERSION
+                or snapshot.get("host") != self.tv.host
+            ):
+                return False
+            self.replace(snapshot["content"], emit=False)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            _LOGGING.debug("Ignoring catalog snapshot: %s", e)
+            return False
+        self.mattes = snapshot.get("mattes")
+        self.matte_colours = snapshot.get("matte_colours")
+        self.photo_filters = snapshot.get("photo_filters")
+        self.api_version = snapshot.get("api_version")
+        if self.api_version and getattr(self.tv, "api_generation", None) is None:
+            self.tv.api_generation = (
+                0 if int(self.api_version.replace(".", "")) < 4000 else 1
+            )
+        return True
+
+    async def _warm_refresh(self) -> None:
+        """Bring a catalog served from a snapshot up to date."""
+        try:
+            await self.tv.start_listening()
+            await self.load()
+            await self.load_settings()
+        except Exception as e:
+            _LOGGING.debug("Catalog refresh failed: %s", e)
+            return
+        self.save_snapshot()
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self.save_snapshot()
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.load()
+            except Exception as e:
+                _LOGGING.debug("Catalog reconciliation failed: %s", e)
+
+    def _schedule_refresh(self) -> None:
+        """Reload soon, to fill in details of newly added art."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._delayed_refresh())
+
+    async def _delayed_refresh(self) -> None:
+        await asyncio.sleep(self.refresh_delay)
+        try:
+            await self.load()
+        except Exception as e:
+            _LOGGING.debug("Catalog refresh failed: %s", e)
+
+    def replace(self, content_list: Iterable[Dict[str, Any]], emit: bool = True) -> None:
+        """Rebuild the catalog and its indexes from a content list.
+
+        Differences with the previous contents are sent to change listeners.
+        """
+        previous = (self._content, self._categories.get(FAVOURITES_CATEGORY, set()))
+        self._content = {}
+        self._content_categories = {}
+        self._categories = {}
+        self._mattes = {}
+        for entry in content_list:
+            self._add(entry)
+        if self.loaded and emit and self._change_listeners:
+            for data in self._drift(*previous):
+                self._emit(data)
+        self.loaded = True
+
+    def _drift(
+        self, content: Dict[str, Dict[str, Any]], favourites: Set[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield art events that turn the previous contents into the current ones."""
+        removed = [content_id for content_id in content if content_id not in self]
+        if removed:
+            yield {
+                "event": IMAGE_DELETED_EVENT,
+                "content_id_list": [{"content_id": c} for c in removed],
+            }
+        for content_id, entry in self._content.items():
+            old = content.get(content_id)
+            if old is None:
+                yield {
+                    "event": IMAGE_ADDED_EVENT,
+                    "content_id": content_id,
+                    "category_id": min(self._content_categories[content_id], default=None),
+                }
+                continue
+            if (content_id in favourites) != self.is_favourite(content_id):
+                yield {
+                    "event": FAVORITE_CHANGED_EVENT,
+                    "content_id": content_id,
+                    "status": "on" if self.is_favourite(content_id) else "off",
+                }
+            if self._matte_changed(old, entry):
+                yield {
+                    "event": MATTE_CHANGED_EVENT,
+                    "content_id": content_id,
+                    "matte_id": entry.get("matte_id"),
+                    "portrait_matte_id": entry.get("portrait_matte_id"),
+                }
+
+    @staticmethod
+    def _matte_changed(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+        # image_added entries carry no mattes, only compare keys both sides have
+        return any(
+            old[key] != new[key]
+            for key in ("matte_id", "portrait_matte_id")
+            if key in old and key in new
+        )
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        content_id = entry["content_id"]
+        category_id = entry.get("category_id")
+        existing = self._content.get(content_id)
+        if existing is None:
+            self._content[content_id] = entry = dict(entry)
+            self._content_categories[content_id] = set()
+            self._index_matte(content_id, entry.get("matte_id"))
+        if category_id:
+            self._content_categories[content_id].add(category_id)
+            self._categories.setdefault(category_id, set()).add(content_id)
+
+    def _remove(self, content_id: str) -> None:
+        entry = self._content.pop(content_id, None)
+        if entry is None:
+            return
+        for category_id in self._content_categories.pop(content_id):
+            self._discard(self._categories, category_id, content_id)
+        self._discard(self._mattes, entry.get("matte_id"), content_id)
+
+    def _index_matte(self, content_id: str, matte_id: Optional[str]) -> None:
+        if matte_id:
+            self._mattes.setdefault(matte_id, set()).add(content_id)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: Optional[str], content_id: str) -> None:
+        if key in index:
+            index[key].discard(content_id)
+            if not index[key]:
+                del index[key]
+
+    def _process_event(self, event: str, response: Dict[str, Any]) -> None:
+        if event != D2D_SERVICE_MESSAGE_EVENT:
+            return
+        self.apply_event(json.loads(response["data"]))
+
+    def apply_event(self, data: Dict[str, Any]) -> None:
+        """Apply a decoded art app sub event to the catalog."""
+        handler = self._handlers.get(data.get("event", "*"))
+        if handler:
+            handler(data)
+            self._emit(data)
+
+    def _on_image_added(self, data: Dict[str, Any]) -> None:
+        if data.get("content_id"):
+            self._add(
+                {
+                    "content_id": data["content_id"],
+                    "category_id": data.get("category_id", MY_PHOTOS_CATEGORY),
+                }
+            )
+        self._schedule_refresh()
+
+    def _on_image_deleted(self, data: Dict[str, Any]) -> None:
+        for content_id in parse_art_content_ids(data):
+            self._remove(content_id)
+
+    def _on_favorite_changed(self, data: Dict[str, Any]) -> None:
+        content_id = data.get("content_id")
+        if content_id not in self._content:
+            return
+        if str(data.get("status", data.get("is_favorite"))).lower() in ("on", "true"):
+            self._content_categories[content_id].add(FAVOURITES_CATEGORY)
+            self._categories.setdefault(FAVOURITES_CATEGORY, set()).add(content_id)
+        else:
+            self._content_categories[content_id].discard(FAVOURITES_CATEGORY)
+            self._discard(self._categories, FAVOURITES_CATEGORY, content_id)
+
+    def _on_matte_changed(self, data: Dict[str, Any]) -> None:
+        content_id = data.get("content_id")
+        entry = self._content.get(content_id or "")
+        if entry is None or content_id is None:
+            return
+        if "matte_id" in data:
+            self._discard(self._mattes, entry.get("matte_id"), content_id)
+            entry["matte_id"] = data["matte_id"]
+            self._index_matte(content_id, data["matte_id"])
+        if "portrait_matte_id" in data:
+            entry["portrait_matte_id"] = data["portrait_matte_id"]
+
+    def get(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """Return the catalog entry for content_id, or None."""
+        return self._content.get(content_id)
+
+    def categories(self, content_id: str) -> Set[str]:
+        return set(self._content_categories.get(content_id, ()))
+
+    def content_ids(self, category: Optional[str] = None) -> Set[str]:
+        if category is None:
+            return set(self._content)
+        return set(self._categories.get(category, ()))
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        return [self._content[c] for c in self._categories.get(category, ())]
+
+    def by_matte(self, matte_id: str) -> List[Dict[str, Any]]:
+        return [self._content[c] for c in self._mattes.get(matte_id, ())]
+
+    def favourites(self) -> List[Dict[str, Any]]:
+        return self.by_category(FAVOURITES_CATEGORY)
+
+    def is_favourite(self, content_id: str) -> bool:
+        return content_id in self._categories.get(FAVOURITES_CATEGORY, ())
+
+    def available(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return entries in the same form as ``SamsungTVAsyncArt.available()``."""
+        return [
+            dict(self._content[content_id], category_id=category_id)
+            for content_id, category_ids in self._content_categories.items()
+            for category_id in sorted(category_ids)
+            if category is None or category_id == category
+        ]
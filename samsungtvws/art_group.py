@@ -0,0 +1,267 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import json
+import logging
+import time
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+import uuid
+
+from . import exceptions, recorder
+from .async_art import ArtChannelEmitCommand, SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    _ResponseFuture = asyncio.Future[Dict[str, Any]]
+else:
+    _ResponseFuture = asyncio.Future
+
+
+class MemberTiming(NamedTuple):
+    """When one TV of a group was sent its request and answered it.
+
+    Offsets are in seconds after the deadline. ack_offset is None if the
+    TV did not answer within the timeout, error is the exception if the
+    send or the request failed.
+    """
+
+    host: str
+    port: int
+    send_offset: Optional[float]
+    ack_offset: Optional[float]
+    error: Optional[Exception] = None
+
+
+class GroupReport(NamedTuple):
+    """The timings of one synchronized request, in member order."""
+
+    deadline: float
+    members: List[MemberTiming]
+
+    @property
+    def ok(self) -> bool:
+        return all(m.error is None and m.ack_offset is not None for m in self.members)
+
+    @property
+    def send_skew(self) -> Optional[float]:
+        """Seconds between the first and the last send."""
+        offsets = [m.send_offset for m in self.members if m.send_offset is not None]
+        return max(offsets) - min(offsets) if offsets else None
+
+    @property
+    def ack_skew(self) -> Optional[float]:
+        """Seconds between the first and the last answer."""
+        offsets = [m.ack_offset for m in self.members if m.ack_offset is not None]
+        return max(offsets) - min(offsets) if offsets else None
+
+
+class _AckFuture(_ResponseFuture):
+    """Future stamped with the time process_event resolves it with the answer."""
+
+    acked: Optional[float] = None
+
+    def set_result(self, result: Dict[str, Any]) -> None:
+        if not self.done():
+            self.acked = time.monotonic()
+        super().set_result(result)
+
+
+class _Staged:
+    __slots__ = ("member", "request_id", "payload", "future", "sent", "error")
+
+    def __init__(self, member: SamsungTVAsyncArt, request_data: Dict[str, Any]) -> None:
+        self.member = member
+        self.request_id = str(uuid.uuid4())
+        request_data = dict(request_data, id=self.request_id, request_id=self.request_id)
+        self.payload = ArtChannelEmitCommand.art_app_request(request_data).get_payload()
+        self.future = _AckFuture(loop=asyncio.get_running_loop())
+        self.sent: Optional[float] = None
+        self.error: Optional[Exception] = None
+
+
+class SamsungTVArtGroup:
+    """Art requests released on several TVs at the same moment, for video walls.
+
+    open() connects the art channel of every member ahead of time. A
+    request is then built and registered for each member before a common
+    time.monotonic() deadline, the group sleeps until spin seconds before
+    it and busy waits the rest, and then writes every request to its
+    already open websocket, one after the other without yielding to the
+    event loop. The event loop is blocked for up to spin seconds.
+
+    Each request returns a GroupReport with the time every member was
+    sent its request and answered it, relative to the deadline, to
+    measure the skew between panels. Members are SamsungTVAsyncArt
+    channels, e.g. ``tv.art`` of the TVs of a SamsungTVFleet. open() takes
+    a reference to each channel and close() only drops it, so a channel
+    still used by a fleet or remote stays open.
+    """
+
+    def __init__(
+        self,
+        members: Iterable[SamsungTVAsyncArt],
+        lead_time: float = 0.05,
+        spin: float = 0.002,
+    ) -> None:
+        self.members = list(members)
+        self.lead_time = lead_time
+        self.spin = spin
+
+    async def __aenter__(self) -> "SamsungTVArtGroup":
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Connect and start listening on every member's art channel."""
+        for member in self.members:
+            member.acquire()
+        try:
+            await asyncio.gather(
+                *(member.start_listening() for member in self.members)
+            )
+        except Exception:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(member.close() for member in self.members), return_exceptions=True
+        )
+
+    async def select_image(
+        self,
+        content_id: Union[str, Sequence[str]],
+        category: Optional[str] = None,
+        show: bool = True,
+        at: Optional[float] = None,
+        timeout: float = 2,
+    ) -> GroupReport:
+        """Select an image on every member, content_id can be a list with one per member."""
+        content_ids = (
+            [content_id] * len(self.members)
+            if isinstance(content_id, str)
+            else list(content_id)
+        )
+        if len(content_ids) != len(self.members):
+            raise ValueError("content_id needs one entry per member")
+        return await self.send(
+            [
+                {
+                    "request": "select_image",
+                    "category_id": category,
+                    "content_id": content_id,
+                    "show": show,
+                }
+                for content_id in content_ids
+            ],
+            at=at,
+            timeout=timeout,
+        )
+
+    async def set_artmode(
+        self, mode: str, at: Optional[float] = None, timeout: float = 2
+    ) -> GroupReport:
+        return await self.send(
+            [{"request": "set_artmode_status", "value": mode}] * len(self.members),
+            at=at,
+            timeout=timeout,
+        )
+
+    async def send(
+        self,
+        requests: Sequence[Dict[str, Any]],
+        at: Optional[float] = None,
+        timeout: float = 2,
+    ) -> GroupReport:
+        """Send one art request per member at time.monotonic() at, or lead_time from now."""
+        if len(requests) != len(self.members):
+            raise ValueError("requests needs one entry per member")
+        await asyncio.gather(
+            *(m.start_listening() for m in self.members if not m.is_alive())
+        )
+        staged = [
+            _Staged(member, requests[index])
+            for index, member in enumerate(self.members)
+        ]
+        for item in staged:
+            item.member.pending_requests[item.request_id] = item.future
+        deadline = time.monotonic() + self.lead_time if at is None else at
+        try:
+            await self._release(staged, deadline)
+            pending = [item.future for item in staged if item.error is None]
+            if pending:
+                await asyncio.wait(pending, timeout=timeout)
+        finally:
+            for item in staged:
+                item.member.pending_requests.pop(item.request_id, None)
+                item.future.cancel()
+
+        members = []
+        for item in staged:
+            acked = item.future.acked
+            if item.error is None and item.future.done() and not item.future.cancelled():
+                data = json.loads(item.future.result()["data"])
+                if data.get("event", "*") == "error":
+                    item.error = exceptions.ResponseError(
+                        f"{json.loads(data['request_data'])['request']} request failed "
+                        f"with error number {data['error_code']}"
+                    )
+            members.append(
+                MemberTiming(
+                    item.member.host,
+                    item.member.port,
+                    None if item.sent is None else item.sent - deadline,
+                    None if acked is None else acked - deadline,
+                    item.error,
+                )
+            )
+        return GroupReport(deadline, members)
+
+    async def _release(self, staged: List[_Staged], deadline: float) -> None:
+        remaining = deadline - self.spin - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        elif deadline < time.monotonic():
+            _LOGGING.debug("Deadline passed %.4fs before release", time.monotonic() - deadline)
+        while time.monotonic() < deadline:
+            pass
+        for item in staged:
+            connection = item.member.connection
+            try:
+                assert connection is not None
+                # an open websocket writes the frame without yielding
+                await connection.send(item.payload)
+            except Exception as e:
+                _LOGGING.debug("Send to %s failed: %s", item.member.host, e)
+                item.error = e
+                continue
+            item.sent = time.monotonic()
+        for item in staged:
+            if item.sent is not None and item.member.recorder is not None:
+                item.member.recorder.record(recorder.OUTBOUND, item.payload)
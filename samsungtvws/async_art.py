@@ -15,16 +15,19 @@ import logging
 import random
 import asyncio
 import aiohttp
-from typing import Any, Dict, List, Optional, Union, Callable, Awaitable
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, Callable, Awaitable
 import uuid
 
-from . import exceptions, helper
+from . import exceptions, helper, metrics, recorder, tracing
 from .command import SamsungTVCommand
 from .async_connection import SamsungTVWSAsyncConnection
 from .remote import SamsungTVWS
 from .event import D2D_SERVICE_MESSAGE_EVENT, MS_CHANNEL_READY_EVENT
 from .async_rest import SamsungTVAsyncRest
+from .art_batch import ArtOperation, Outcome, run_batch
+from .art_catalog import ArtCatalog
 from .helper import get_ssl_context
+from .models import ArtContent, Matte, MatteColor, PhotoFilter
 
 _LOGGING = logging.getLogger(__name__)
 
@@ -49,14 +52,16 @@ class ArtChannelEmitCommand(SamsungTVCommand):
 class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
     def __init__(
         self,
-        host,
-        token=None,
-        token_file=None,
-        port=8001,
-        timeout=None,
-        key_press_delay=1,
-        name="SamsungTvRemote",
-    ):
+        host: str,
+        token: Optional[str] = None,
+        token_file: Optional[str] = None,
+        port: int = 8001,
+        timeout: Optional[float] = None,
+        key_press_delay: float = 1,
+        name: str = "SamsungTvRemote",
+        session: Optional[aiohttp.ClientSession] = None,
+        check_token: bool = True,
+    ) -> None:
         super().__init__(
             host,
             endpoint=ART_ENDPOINT,
@@ -69,14 +74,21 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         )
         self.art_uuid = str(uuid.uuid4())
         self._rest_api: Optional[SamsungTVAsyncRest] = None
-        self.art_mode = None
-        self.session = None
+        self.art_mode: Optional[bool] = None
+        self.session = session
+        self._own_session = session is None
         self.lock = asyncio.Lock()
-        self.pending_requests = {}
-        self.callbacks = {}
-        self.get_token()
+        self.pending_requests: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._request_spans: Dict[str, Any] = {}
+        self.callbacks: Dict[str, Callable[..., Any]] = {}
+        self.listeners: Dict[str, List[Callable[..., Any]]] = {}
+        self.api_generation: Optional[int] = None
+        self.catalog: Optional[ArtCatalog] = None
+        self._refs = 0
+        if check_token:
+            self.get_token()
             
-    def get_token(self):
+    def get_token(self) -> None:
         '''
         Open and close remote control websocket to get/check token
         '''
@@ -88,7 +100,7 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         # Override base class to wait for MS_CHANNEL_READY_EVENT
         assert self.connection
         data = await self.connection.recv()
-        response = helper.process_api_response(data)
+        response = helper.process_api_response(data, self.recorder)
         event = response.get("event", "*")
         self._websocket_event(event, response)
 
@@ -98,8 +110,28 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
 
         return self.connection
 
-    async def close(self):
-        if self.session:
+    def acquire(self) -> "SamsungTVAsyncArt":
+        '''
+        take a reference to a shared channel, see SamsungTVWSAsyncRemote.art()
+        a dropped connection is discarded, so the next request opens a new one
+        '''
+        if self.connection is not None and not self.is_alive():
+            _LOGGING.debug('art channel connection lost, reconnecting on next request')
+            self.connection = None
+        self._refs += 1
+        return self
+
+    async def close(self, force: bool = False) -> None:
+        '''
+        the connection is only closed when the last reference to a shared channel is closed, or if force is set
+        '''
+        if self._refs > 1 and not force:
+            self._refs -= 1
+            return
+        self._refs = 0
+        if self.catalog:
+            await self.catalog.stop()
+        if self.session and self._own_session:
             await self.session.close()
         await super().close()
    
@@ -113,21 +145,29 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
             except AssertionError:
                 pass
             
-    def get_uuid(self):
+    def get_uuid(self) -> str:
         self.art_uuid = str(uuid.uuid4())
         return self.art_uuid
         
-    async def wait_for_response(self, request_uuid, timeout=2):
+    async def wait_for_response(
+        self, request_uuid: str, timeout: float = 2
+    ) -> Optional[Dict[str, Any]]:
         data = None
         try:
             if request_uuid not in self.pending_requests.keys():
                 self.pending_requests[request_uuid] = asyncio.Future()
-            response = await asyncio.wait_for(self.pending_requests[request_uuid], timeout)
+            with tracing.span(tracing.WAIT_FOR_RESPONSE, host=self.host, request_id=request_uuid):
+                response = await asyncio.wait_for(self.pending_requests[request_uuid], timeout)
             data = json.loads(response["data"])
         except asyncio.exceptions.TimeoutError:
             pass
         self.pending_requests.pop(request_uuid, None)
-        if data and data.get("event", "*") == "error":
+        if data is None:
+            if self.recorder is not None:
+                self.recorder.dump_to_log("Art request timed out")
+        elif data.get("event", "*") == "error":
+            if self.recorder is not None:
+                self.recorder.dump_to_log("Art request failed")
             raise exceptions.ResponseError(
                 f"{json.loads(data['request_data'])['request']} request failed "
                 f"with error number {data['error_code']}"
@@ -138,15 +178,33 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         self,
         request_data: Dict[str, Any],
         wait_for_event: Optional[str] = None,
-        timeout: int = 2
+        timeout: float = 2
     ) -> Optional[Dict[str, Any]]:
         if not request_data.get("id"):
             request_data["id"] = self.get_uuid()            #old api
         request_data["request_id"] = request_data["id"]     #new api
         self.pending_requests[wait_for_event or request_data["id"]] = asyncio.Future()
-        await self.start_listening()
-        await self.send_command(ArtChannelEmitCommand.art_app_request(request_data))
-        return await self.wait_for_response(wait_for_event or request_data["id"], timeout)
+        with tracing.span(
+            tracing.ART_REQUEST,
+            host=self.host,
+            request=request_data.get("request"),
+            request_id=request_data["id"],
+            content_id=request_data.get("content_id"),
+        ) as span:
+            # handling of the response is linked to this span, see process_event
+            self._request_spans[wait_for_event or request_data["id"]] = span
+            try:
+                await self.start_listening()
+                started = metrics.start()
+                await self.send_command(ArtChannelEmitCommand.art_app_request(request_data))
+                data = await self.wait_for_response(wait_for_event or request_data["id"], timeout)
+            finally:
+                self._request_spans.pop(wait_for_event or request_data["id"], None)
+        if data is None:
+            metrics.increment(metrics.ART_REQUEST_TIMEOUTS, self.host, ART_ENDPOINT, request_data.get("request", ""))
+        else:
+            metrics.observe(metrics.ART_REQUEST_SECONDS, started, self.host, ART_ENDPOINT, request_data.get("request", ""))
+        return data
         
     async def process_event(self, event=None, response=None):
         if event == D2D_SERVICE_MESSAGE_EVENT:
@@ -161,29 +219,58 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
             elif 'wakeup' in sub_event:
                 asyncio.create_task(self.get_artmode())
                 
-            if sub_event in self.callbacks.keys():
-                awaitable = self.callbacks[sub_event](event, response)
-                if awaitable:
-                    asyncio.create_task(awaitable)
-                
             request_id = data.get('request_id', data.get('id'))
-            try:
-                if request_id in self.pending_requests.keys():
-                    self.pending_requests[request_id].set_result(response)
-                elif sub_event in self.pending_requests.keys():
-                    self.pending_requests[sub_event].set_result(response)
-            except asyncio.exceptions.InvalidStateError:    #already completed
-                pass
+            request_span = self._request_spans.get(request_id) or self._request_spans.get(sub_event)
+            with tracing.span(
+                tracing.ART_EVENT,
+                links=[request_span] if request_span else [],
+                host=self.host,
+                sub_event=sub_event,
+                request_id=request_id,
+                content_id=data.get('content_id'),
+            ):
+                if sub_event in self.callbacks.keys():
+                    awaitable = self.callbacks[sub_event](event, response)
+                    if awaitable:
+                        asyncio.create_task(awaitable)
+
+                for listener in self.listeners.get(sub_event, []) + self.listeners.get('*', []):
+                    awaitable = listener(event, response)
+                    if awaitable:
+                        asyncio.create_task(awaitable)
+                
+                try:
+                    if request_id in self.pending_requests.keys():
+                        self.pending_requests[request_id].set_result(response)
+                    elif sub_event in self.pending_requests.keys():
+                        self.pending_requests[sub_event].set_result(response)
+                except asyncio.exceptions.InvalidStateError:    #already completed
+                    pass
                 
     def set_callback(self, trigger, callback=None):
         if not callback:
             self.callbacks.pop(trigger, None)
         else:
             self.callbacks[trigger] = callback
+
+    def add_listener(self, trigger: str, listener: Callable[..., Any]) -> None:
+        '''
+        like set_callback, but any number of listeners can be added for the same trigger
+        used by library components (caches, catalogs) so they don't replace user callbacks
+        a listener for '*' is called for every sub event
+        '''
+        self.listeners.setdefault(trigger, [])
+        if listener not in self.listeners[trigger]:
+            self.listeners[trigger].append(listener)
+
+    def remove_listener(self, trigger: str, listener: Callable[..., Any]) -> None:
+        if listener in self.listeners.get(trigger, []):
+            self.listeners[trigger].remove(listener)
             
     def get_session(self):
         if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession()
+            self._own_session = True
             self._rest_api = None
         return self.session
 
@@ -216,7 +303,7 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
     async def in_artmode(self) -> bool:
         return await self.on() and await self.get_artmode() == 'on'
         
-    async def get_api_version(self):
+    async def get_api_version(self) -> str:
         data = await self._send_art_request(
             {"request": "get_api_version"}
         )
@@ -225,7 +312,17 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
                 {"request": "api_version"}
             )
         assert data
-        return data["version"]
+        return str(data["version"])
+
+    async def get_api_generation(self) -> int:
+        '''
+        returns 0 for old (<2021) api tv's, 1 for new api tv's
+        the result is cached, as it can't change for a connected tv
+        '''
+        if self.api_generation is None:
+            api_version = await self.get_api_version()
+            self.api_generation = 0 if int(api_version.replace('.','')) < 4000 else 1
+        return self.api_generation
 
     async def get_device_info(self):
         data = await self._send_art_request(
@@ -234,23 +331,64 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         assert data
         return data
 
-    async def available(self, category=None, timeout=4):
+    async def available(
+        self,
+        category: Optional[str] = None,
+        timeout: float = 4,
+        fields: Optional[Sequence[str]] = None,
+        as_records: bool = False,
+    ) -> List[Any]:
         '''
         category is 'MY-C0004' or 'MY-C0002' where 4 is favourites, 2 is my pictures, and 8 is store
+        fields is an optional list of keys to keep in each entry, eg ['content_id', 'matte_id']
+        as_records returns compact ArtContent records instead of dicts
+        '''
+        entries = await self.iter_available(category, timeout, fields)
+        return [ArtContent.from_dict(v) for v in entries] if as_records else list(entries)
+
+    async def iter_available(
+        self,
+        category: Optional[str] = None,
+        timeout: float = 4,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        '''
+        as available(), but returns a generator that parses entries one at a time
+        entries not in category are skipped without being decoded
+        eg: for entry in await tv.iter_available('MY-C0002'):
         '''
         data = await self._send_art_request(
             {"request": "get_content_list", "category": category},
             timeout=timeout
         )
         assert data
-        return [ v for v in json.loads(data["content_list"]) if v['category_id'] == category] if category else json.loads(data["content_list"])
+        return helper.iter_content_list(data["content_list"], category, fields)
+
+    async def enable_catalog(self, reconcile_interval=600, snapshot_path=None, snapshot_interval=300):
+        '''
+        load a local ArtCatalog of the tv's art, kept up to date from art events
+        queries on the catalog need no websocket round trip
+        reconcile_interval is how often (seconds) to reload the full content list, 0 for never
+        if snapshot_path is given, the catalog, mattes, filters and api version are saved there every
+        snapshot_interval seconds and on close, and the next start is served from the snapshot
+        while the catalog is reloaded in the background
+        '''
+        if self.catalog is None:
+            self.catalog = ArtCatalog(
+                self,
+                reconcile_interval=reconcile_interval,
+                snapshot_path=snapshot_path,
+                snapshot_interval=snapshot_interval,
+            )
+        await self.catalog.start()
+        return self.catalog
 
-    async def get_current(self):
+    async def get_current(self, as_records=False):
         data = await self._send_art_request(
             {"request": "get_current_artwork"}
         )
         assert data
-        return data
+        return ArtContent.from_dict(data) if as_records else data
         
     async def set_favourite(self, content_id, status='on'):
         data = await self._send_art_request(
@@ -297,14 +435,16 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         assert data
         return data
 
-    async def get_slideshow_status(self):
+    async def get_slideshow_status(self) -> Dict[str, Any]:
         data = await self._send_art_request(
             {"request": "get_slideshow_status"}
         )
         assert data
         return data
 
-    async def set_slideshow_status(self, duration=0, type=True, category=2):
+    async def set_slideshow_status(
+        self, duration: int = 0, type: bool = True, category: int = 2
+    ) -> Dict[str, Any]:
         '''
         duration is "off" or "number" where number is duration in minutes. set 0 for 'off'
         slide show type can be "slideshow" or "shuffleslideshow", set True for shuffleslideshow
@@ -352,14 +492,17 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         assert data
         return data
  
-    async def get_thumbnail_list(self, content_id_list=[]):
-        if isinstance(content_id_list, str):
+    async def get_thumbnail_list(
+        self, content_id_list: Optional[Union[str, List[str]]] = None
+    ) -> Dict[str, bytes]:
+        if content_id_list is None:
+            content_id_list = []
+        elif isinstance(content_id_list, str):
             content_id_list=[content_id_list]
-        content_id_list=[{"content_id": id} for id in content_id_list]
         data = await self._send_art_request(
             {
                 "request": "get_thumbnail_list",
-                "content_id_list": content_id_list,
+                "content_id_list": [{"content_id": id} for id in content_id_list],
                 "conn_info": {
                     "d2d_mode": "socket",
                     "connection_id": random.randrange(4 * 1024 * 1024 * 1024),
@@ -370,23 +513,39 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         assert data
         conn_info = json.loads(data["conn_info"])
         ssl_context = get_ssl_context() if conn_info.get('secured', False) else None
-        reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']), ssl=ssl_context)
-        total_num_thumbnails = 1
-        current_thumb = -1
-        thumbnail_data_dict = {}
-        while current_thumb+1 < total_num_thumbnails:
-            header_len = int.from_bytes(await reader.readexactly(4), "big")
-            header = json.loads(await reader.readexactly(header_len))
-            thumbnail_data_len = int(header["fileLength"])
-            current_thumb = int(header["num"])
-            total_num_thumbnails = int(header["total"])
-            filename = "{}.{}".format(header["fileID"], header["fileType"])
-            thumbnail_data_dict[filename] = await reader.readexactly(thumbnail_data_len)
-        writer.close()
+        started = metrics.start()
+        with tracing.span(tracing.D2D_CONNECT, host=self.host, request="get_thumbnail_list"):
+            reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']), ssl=ssl_context)
+        with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="get_thumbnail_list") as span:
+            total_num_thumbnails = 1
+            current_thumb = -1
+            thumbnail_data_dict = {}
+            while current_thumb+1 < total_num_thumbnails:
+                header_len = int.from_bytes(await reader.readexactly(4), "big")
+                raw_header = await reader.readexactly(header_len)
+                header = json.loads(raw_header)
+                thumbnail_data_len = int(header["fileLength"])
+                current_thumb = int(header["num"])
+                total_num_thumbnails = int(header["total"])
+                filename = "{}.{}".format(header["fileID"], header["fileType"])
+                thumbnail_data_dict[filename] = await reader.readexactly(thumbnail_data_len)
+                if self.recorder is not None:
+                    self.recorder.record_transfer(recorder.D2D_INBOUND, "{}:{}".format(conn_info['ip'], conn_info['port']), raw_header.decode(), thumbnail_data_len)
+            writer.close()
+            size = sum(map(len, thumbnail_data_dict.values()))
+            span.set_attribute("bytes", size)
+        metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "get_thumbnail_list")
+        metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "get_thumbnail_list", size)
         return thumbnail_data_dict
 
-    async def get_thumbnail(self, content_id_list=[], as_dict=False):
-        if isinstance(content_id_list, str):
+    async def get_thumbnail(
+        self,
+        content_id_list: Optional[Union[str, List[str]]] = None,
+        as_dict: bool = False,
+    ) -> Any:
+        if content_id_list is None:
+            content_id_list = []
+        elif isinstance(content_id_list, str):
             content_id_list=[content_id_list]
         thumbnail_data_dict = {}
         thumbnail_data = None
@@ -404,17 +563,80 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
             )
             assert data
             conn_info = json.loads(data["conn_info"])
-            reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']))
-            header_len = int.from_bytes(await reader.readexactly(4), "big")
-            header = json.loads(await reader.readexactly(header_len))
-            thumbnail_data_len = int(header["fileLength"])
-            thumbnail_data = await reader.readexactly(thumbnail_data_len)
-            writer.close()
+            ssl_context = get_ssl_context() if conn_info.get('secured', False) else None
+            started = metrics.start()
+            with tracing.span(tracing.D2D_CONNECT, host=self.host, request="get_thumbnail", content_id=content_id):
+                reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']), ssl=ssl_context)
+            with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="get_thumbnail", content_id=content_id) as span:
+                header_len = int.from_bytes(await reader.readexactly(4), "big")
+                raw_header = await reader.readexactly(header_len)
+                header = json.loads(raw_header)
+                thumbnail_data_len = int(header["fileLength"])
+                thumbnail_data = await reader.readexactly(thumbnail_data_len)
+                writer.close()
+                if self.recorder is not None:
+                    self.recorder.record_transfer(recorder.D2D_INBOUND, "{}:{}".format(conn_info['ip'], conn_info['port']), raw_header.decode(), thumbnail_data_len)
+                span.set_attribute("bytes", thumbnail_data_len)
+            metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "get_thumbnail")
+            metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "get_thumbnail", thumbnail_data_len)
             filename = "{}.{}".format(header["fileID"], header["fileType"])
             thumbnail_data_dict[filename] = thumbnail_data
         return thumbnail_data_dict if as_dict else list(thumbnail_data_dict.values()) if len(content_id_list) > 1 else thumbnail_data
 
-    async def upload(self, file, matte="shadowbox_polar", portrait_matte="shadowbox_polar", file_type="png", date=None, timeout=10):
+    async def get_thumbnails(
+        self,
+        content_id_list: Optional[Union[str, List[str]]] = None,
+        concurrency: int = 4,
+        chunk_size: int = 20,
+    ) -> Tuple[Dict[str, bytes], Dict[str, Exception]]:
+        '''
+        fetch thumbnails for content_id_list using up to concurrency parallel transfers
+        api v0 tv's get one get_thumbnail request per content_id, api v1 tv's split the list
+        into chunks of chunk_size, each fetched by get_thumbnail_list over its own D2D socket
+        returns ({content_id: thumbnail data}, {content_id: exception}), a failure does not abort the batch
+        '''
+        if content_id_list is None:
+            content_id_list = []
+        elif isinstance(content_id_list, str):
+            content_id_list=[content_id_list]
+        content_id_list = list(dict.fromkeys(content_id_list))
+        api_generation = await self.get_api_generation()
+        size = 1 if api_generation == 0 else max(1, chunk_size)
+        chunks = [content_id_list[i:i+size] for i in range(0, len(content_id_list), size)]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        thumbnails: Dict[str, bytes] = {}
+        failures: Dict[str, Exception] = {}
+
+        async def fetch(content_ids: List[str]) -> None:
+            async with semaphore:
+                try:
+                    if api_generation == 0:
+                        data = await self.get_thumbnail(content_ids, as_dict=True)
+                    else:
+                        data = await self.get_thumbnail_list(content_ids)
+                except Exception as e:
+                    _LOGGING.debug('failed to get thumbnails for {}: {}'.format(content_ids, e))
+                    failures.update(dict.fromkeys(content_ids, e))
+                    return
+            received = {os.path.splitext(filename)[0]: thumbnail for filename, thumbnail in data.items()}
+            for content_id in content_ids:
+                if content_id in received:
+                    thumbnails[content_id] = received[content_id]
+                else:
+                    failures[content_id] = exceptions.ResponseError('no thumbnail returned for {}'.format(content_id))
+
+        await asyncio.gather(*[fetch(chunk) for chunk in chunks])
+        return thumbnails, failures
+
+    async def upload(
+        self,
+        file: Union[str, bytes],
+        matte: Optional[str] = "shadowbox_polar",
+        portrait_matte: Optional[str] = "shadowbox_polar",
+        file_type: str = "png",
+        date: Optional[str] = None,
+        timeout: float = 10,
+    ) -> Optional[str]:
         '''
         NOTE: both id's and request_id have to be the same
         '''
@@ -463,19 +685,26 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         )
 
         ssl_context = get_ssl_context() if conn_info.get('secured', False) else None
-        reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']), ssl=ssl_context)  
-        writer.write(len(header).to_bytes(4, "big"))
-        writer.write(header.encode("ascii"))
-        writer.write(file)
-        await writer.drain()
-        writer.close()
+        started = metrics.start()
+        with tracing.span(tracing.D2D_CONNECT, host=self.host, request="upload"):
+            reader, writer = await asyncio.open_connection(conn_info['ip'], int(conn_info['port']), ssl=ssl_context)  
+        with tracing.span(tracing.D2D_TRANSFER, host=self.host, request="upload", bytes=file_size):
+            writer.write(len(header).to_bytes(4, "big"))
+            writer.write(header.encode("ascii"))
+            writer.write(file)
+            await writer.drain()
+            writer.close()
+        if self.recorder is not None:
+            self.recorder.record_transfer(recorder.D2D_OUTBOUND, "{}:{}".format(conn_info['ip'], conn_info['port']), header, file_size)
+        metrics.observe(metrics.D2D_TRANSFER_SECONDS, started, self.host, ART_ENDPOINT, "upload")
+        metrics.increment(metrics.D2D_BYTES, self.host, ART_ENDPOINT, "upload", file_size)
         data = await self.wait_for_response("image_added", timeout=timeout)
         return data["content_id"] if data else None
 
     async def delete(self, content_id):
         await self.delete_list([content_id])
 
-    async def delete_list(self, content_ids):
+    async def delete_list(self, content_ids: List[str]) -> None:
         content_id_list = [{"content_id": item} for item in content_ids]
         await self._send_art_request(
             {   "request": "delete_image_list",
@@ -483,7 +712,24 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
             }
         )
 
-    async def select_image(self, content_id, category=None, show=True):
+    async def run_batch(
+        self,
+        operations: Sequence[ArtOperation],
+        concurrency: int = 8,
+        delete_chunk_size: int = 50,
+        timeout: float = 5,
+    ) -> List[Outcome]:
+        '''
+        send a list of ArtOperation's (change_matte, set_favourite, set_photo_filter, delete)
+        with up to concurrency requests in flight, deletes are sent in chunks of delete_chunk_size
+        returns one outcome per operation, the response data or the exception raised (exceptions.TimeoutError
+        if the tv didn't answer), a failure does not abort the batch
+        '''
+        return await run_batch(self, operations, concurrency=concurrency, delete_chunk_size=delete_chunk_size, timeout=timeout)
+
+    async def select_image(
+        self, content_id: str, category: Optional[str] = None, show: bool = True
+    ) -> None:
         await self._send_art_request(
             {
                 "request": "select_image",
@@ -517,12 +763,13 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
         assert data
         return data.get("current_rotation_status",0)
 
-    async def get_photo_filter_list(self):
+    async def get_photo_filter_list(self, as_records: bool = False) -> List[Any]:
         data = await self._send_art_request(
             {"request": "get_photo_filter_list"}
         )
         assert data
-        return json.loads(data["filter_list"])
+        filters = json.loads(data["filter_list"])
+        return [PhotoFilter.from_dict(f) for f in filters] if as_records else filters
 
     async def set_photo_filter(self, content_id, filter_id):
         await self._send_art_request(
@@ -533,12 +780,20 @@ class SamsungTVAsyncArt(SamsungTVWSAsyncConnection):
             }
         )
 
-    async def get_matte_list(self, include_colour=False):
+    async def get_matte_list(
+        self, include_colour: bool = False, as_records: bool = False
+    ) -> Any:
         data = await self._send_art_request(
             {"request": "get_matte_list"}
         )
         assert data
-        return (json.loads(data["matte_type_list"]), json.loads(data.get("matte_color_list"))) if include_colour else json.loads(data["matte_type_list"])
+        mattes = json.loads(data["matte_type_list"])
+        if as_records:
+            mattes = [Matte.from_dict(m) for m in mattes]
+        if not include_colour:
+            return mattes
+        colours = json.loads(data.get("matte_color_list"))
+        return (mattes, [MatteColor.from_dict(c) for c in colours] if as_records else colours)
 
     async def change_matte(self, content_id, matte_id=None, portrait_matte=None):
         '''
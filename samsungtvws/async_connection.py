@@ -17,7 +17,7 @@ from websockets.client import WebSocketClientProtocol, connect
 from websockets.exceptions import ConnectionClosed
 from websockets.protocol import State
 
-from . import connection, exceptions, helper
+from . import connection, exceptions, helper, metrics, recorder, tracing
 from .command import SamsungTVCommand, SamsungTVSleepCommand
 from .event import (
     IGNORE_EVENTS_AT_STARTUP,
@@ -50,36 +50,48 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
             # someone else already created a new connection
             return self.connection
 
-        url = self._format_websocket_url(self.endpoint)
-
-        _LOGGING.debug("WS url %s", url)
-        connect_kwargs: Dict[str, Any] = {}
-        if self._is_ssl_connection():
-            connect_kwargs["ssl"] = get_ssl_context()
-        connection = await connect(url, open_timeout=self.timeout, **connect_kwargs)
+        with tracing.span(tracing.OPEN, host=self.host, endpoint=self.endpoint):
+            started = metrics.start()
+            url = self._format_websocket_url(self.endpoint)
+
+            _LOGGING.debug("WS url %s", url)
+            connect_kwargs: Dict[str, Any] = {}
+            if self._is_ssl_connection():
+                connect_kwargs["ssl"] = get_ssl_context()
+            try:
+                connection = await connect(
+                    url, open_timeout=self.timeout, **connect_kwargs
+                )
+            except Exception:
+                metrics.increment(metrics.WS_CONNECT_ERRORS, self.host, self.endpoint)
+                raise
+
+            event: Optional[str] = None
+            while event is None or event in IGNORE_EVENTS_AT_STARTUP:
+                data = await connection.recv()
+                response = helper.process_api_response(data, self.recorder)
+                event = response.get("event", "*")
+                assert event
+                self._websocket_event(event, response)
 
-        event: Optional[str] = None
-        while event is None or event in IGNORE_EVENTS_AT_STARTUP:
-            data = await connection.recv()
-            response = helper.process_api_response(data)
-            event = response.get("event", "*")
-            assert event
-            self._websocket_event(event, response)
+            if event != MS_CHANNEL_CONNECT_EVENT:
+                metrics.increment(metrics.WS_CONNECT_ERRORS, self.host, self.endpoint)
 
-        if event == MS_CHANNEL_UNAUTHORIZED:
-            await self.close()
-            raise exceptions.UnauthorizedError(response)
+            if event == MS_CHANNEL_UNAUTHORIZED:
+                await self.close()
+                raise exceptions.UnauthorizedError(response)
 
-        if event != MS_CHANNEL_CONNECT_EVENT:
-            # Unexpected event received during connection routine
-            await self.close()
-            if event == MS_CHANNEL_TIMEOUT:
-                _LOGGING.debug("connection not accepted on TV, or token missing/incorrect")
-            raise exceptions.ConnectionFailure(response)
+            if event != MS_CHANNEL_CONNECT_EVENT:
+                # Unexpected event received during connection routine
+                await self.close()
+                if event == MS_CHANNEL_TIMEOUT:
+                    _LOGGING.debug("connection not accepted on TV, or token missing/incorrect")
+                raise exceptions.ConnectionFailure(response)
 
-        self._check_for_token(response)
+            self._check_for_token(response)
 
-        self.connection = connection
+            self.connection = connection
+            metrics.connected(started, self.host, self.endpoint)
         return connection
 
     async def start_listening(
@@ -106,7 +118,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
         with contextlib.suppress(ConnectionClosed):
             while True:
                 data = await connection.recv()
-                response = helper.process_api_response(data)
+                response = helper.process_api_response(data, self.recorder)
                 event = response.get("event", "*")
                 self._websocket_event(event, response)
                 if callback:
@@ -135,8 +147,19 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
 
         delay = self.key_press_delay if key_press_delay is None else key_press_delay
 
-        for command in commands:
-            await self._send_command(self.connection, command, delay)
+        metrics.increment(
+            metrics.WS_COMMANDS, self.host, self.endpoint, value=len(commands)
+        )
+        with tracing.span(
+            tracing.SEND_COMMANDS,
+            host=self.host,
+            endpoint=self.endpoint,
+            count=len(commands),
+        ):
+            for command in commands:
+                await self._send_command(
+                    self.connection, command, delay, self.recorder
+                )
 
     async def send_command(
         self,
@@ -158,6 +181,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
         connection: WebSocketClientProtocol,
         command: Union[SamsungTVCommand, Dict[str, Any]],
         delay: float,
+        flight_recorder: Optional[recorder.FlightRecorder] = None,
     ) -> None:
         if isinstance(command, SamsungTVSleepCommand):
             await asyncio.sleep(command.delay)
@@ -169,6 +193,8 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
             payload = json.dumps(command)
         _LOGGING.debug("SamsungTVWS websocket command: %s", payload)
         await connection.send(payload)
+        if flight_recorder is not None:
+            flight_recorder.record(recorder.OUTBOUND, payload)
 
         await asyncio.sleep(delay)
 
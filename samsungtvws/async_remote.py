@@ -12,7 +12,7 @@ from typing import Any, Dict, List, Optional, Set
 
 import async_timeout
 
-from . import async_connection, remote, rest
+from . import async_art, async_connection, remote, rest
 from .event import ED_INSTALLED_APP_EVENT, parse_installed_app
 
 _LOGGING = logging.getLogger(__name__)
@@ -41,6 +41,34 @@ class SamsungTVWSAsyncRemote(async_connection.SamsungTVWSAsyncConnection):
         )
         self._rest_api: Optional[rest.SamsungTVRest] = None
         self._app_list_futures: Set[Future[Dict[str, Any]]] = set()
+        self._art: Optional[async_art.SamsungTVAsyncArt] = None
+
+    def art(self, timeout: Optional[float] = 5) -> async_art.SamsungTVAsyncArt:
+        """Return the art channel shared by this remote.
+
+        As ``SamsungTVWS.art()``, the channel connects on its first request
+        and stays open, closing it only disconnects once every caller closed
+        it, and closing the remote always disconnects it.
+        """
+        if self._art is None:
+            self._art = async_art.SamsungTVAsyncArt(
+                self.host,
+                token=self.token,
+                token_file=self.token_file,
+                port=self.port,
+                timeout=timeout,
+                key_press_delay=self.key_press_delay,
+                name=self.name,
+                check_token=False,
+            )
+        elif self._art.connection is None:
+            self._art.timeout = None if timeout == 0 else timeout
+        return self._art.acquire()
+
+    async def close(self) -> None:
+        if self._art is not None:
+            await self._art.close(force=True)
+        await super().close()
 
     async def app_list(self) -> Optional[List[Dict[str, Any]]]:
         _LOGGING.debug("Get app list (not available on all TVs)")
@@ -11,7 +11,7 @@ from typing import Any, Dict, Optional
 
 import aiohttp
 
-from . import connection, exceptions, helper
+from . import connection, exceptions, helper, metrics, tracing
 
 _LOGGING = logging.getLogger(__name__)
 
@@ -35,23 +35,31 @@ class SamsungTVAsyncRest(connection.SamsungTVWSBaseConnection):
 
     async def _rest_request(self, target: str, method: str = "GET") -> Dict[str, Any]:
         url = self._format_rest_url(target)
-        try:
-            if method == "POST":
-                future = self.session.post(url, timeout=self.timeout, verify_ssl=False)
-            elif method == "PUT":
-                future = self.session.put(url, timeout=self.timeout, verify_ssl=False)
-            elif method == "DELETE":
-                future = self.session.delete(
-                    url, timeout=self.timeout, verify_ssl=False
+        request = f"{method} /{target}"
+        with tracing.span(tracing.REST_REQUEST, host=self.host, request=request):
+            started = metrics.start()
+            try:
+                if method == "POST":
+                    future = self.session.post(url, timeout=self.timeout, verify_ssl=False)
+                elif method == "PUT":
+                    future = self.session.put(url, timeout=self.timeout, verify_ssl=False)
+                elif method == "DELETE":
+                    future = self.session.delete(
+                        url, timeout=self.timeout, verify_ssl=False
+                    )
+                else:
+                    future = self.session.get(url, timeout=self.timeout, verify_ssl=False)
+                async with future as resp:
+                    text = await resp.text()
+                metrics.observe(
+                    metrics.REST_REQUEST_SECONDS, started, self.host, "rest", request
                 )
-            else:
-                future = self.session.get(url, timeout=self.timeout, verify_ssl=False)
-            async with future as resp:
-                return helper.process_api_response(await resp.text())
-        except aiohttp.ClientConnectionError as err:
-            raise exceptions.HttpApiError(
-                "TV unreachable or feature not supported on this model."
-            ) from err
+                return helper.process_api_response(text)
+            except aiohttp.ClientConnectionError as err:
+                metrics.increment(metrics.REST_REQUEST_ERRORS, self.host, "rest", request)
+                raise exceptions.HttpApiError(
+                    "TV unreachable or feature not supported on this model."
+                ) from err
 
     async def rest_device_info(self) -> Dict[str, Any]:
         _LOGGING.debug("Get device info via rest api")
@@ -0,0 +1,149 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import logging
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from .async_art import SamsungTVAsyncArt
+from .async_remote import SamsungTVWSAsyncRemote
+from .async_rest import SamsungTVAsyncRest
+
+_LOGGING = logging.getLogger(__name__)
+
+
+class SamsungTV:
+    """The remote and art channels of one TV, opened and closed together.
+
+    Both channels use the same token, one aiohttp session for all REST
+    requests and thumbnail downloads, and one cached copy of the device
+    info. ``start()`` opens both websockets at the same time, unless the TV
+    still has to hand out a token, then the remote channel is opened first
+    so only one authorisation prompt is shown. ``remote.art()`` returns the
+    same art channel.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: Optional[str] = None,
+        token_file: Optional[str] = None,
+        port: int = 8002,
+        timeout: Optional[float] = None,
+        key_press_delay: float = 1,
+        name: str = "SamsungTvRemote",
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        self.host = host
+        self.session = session
+        self._own_session = session is None
+        self._device_info: Optional[Dict[str, Any]] = None
+        self._rest_api: Optional[SamsungTVAsyncRest] = None
+        self.remote = SamsungTVWSAsyncRemote(
+            host,
+            token=token,
+            token_file=token_file,
+            port=port,
+            timeout=timeout,
+            key_press_delay=key_press_delay,
+            name=name,
+        )
+        # the token is set up by opening the remote channel, not by the art channel
+        self.art = SamsungTVAsyncArt(
+            host,
+            token=token,
+            token_file=token_file,
+            port=port,
+            timeout=timeout,
+            key_press_delay=key_press_delay,
+            name=name,
+            session=session,
+            check_token=False,
+        )
+        self.remote._art = self.art.acquire()
+
+    async def __aenter__(self) -> "SamsungTV":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+            self._own_session = True
+            self._rest_api = None
+        if self.art.session is not self.session:
+            self.art.session = self.session
+            self.art._own_session = False
+            self.art._rest_api = None
+        return self.session
+
+    def _get_rest_api(self) -> SamsungTVAsyncRest:
+        if self._rest_api is None:
+            self._rest_api = SamsungTVAsyncRest(
+                self.host,
+                session=self.get_session(),
+                port=self.remote.port,
+                timeout=self.remote.timeout,
+            )
+        return self._rest_api
+
+    async def device_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """Return the TV's REST device info, fetched once unless refresh is set."""
+        if self._device_info is None or refresh:
+            self._device_info = await self._get_rest_api().rest_device_info()
+        return self._device_info
+
+    async def supported(self) -> bool:
+        data = await self.device_info()
+        return bool(data.get("device", {}).get("FrameTVSupport") == "true")
+
+    async def model_year(self) -> int:
+        model = (await self.device_info()).get("device", {}).get("model", "0_0")
+        return int(model.split("_")[0])
+
+    async def on(self) -> bool:
+        """Return True if the TV is on, the power state is never cached."""
+        data = await self.device_info(refresh=True)
+        return bool(data.get("device", {}).get("PowerState", "off") == "on")
+
+    async def start(
+        self, callback: Optional[Callable[[str, Any], Optional[Awaitable[None]]]] = None
+    ) -> None:
+        """Open the remote and art channels and start listening on both.
+
+        callback is called with every event on the remote channel, art events
+        are delivered to the art channel's callbacks and listeners.
+        """
+        self.get_session()
+        if not self.remote._get_token():
+            await self.remote.start_listening(callback)
+            if self.remote.token_file is None:
+                self.art.token = self.remote.token
+            await self.art.start_listening()
+        else:
+            await asyncio.gather(
+                self.remote.start_listening(callback), self.art.start_listening()
+            )
+
+    async def close(self) -> None:
+        """Close both channels, and the session unless it was passed in."""
+        # closing the remote also closes the art channel
+        await self.remote.close()
+        if self.session is not None and self._own_session:
+            await self.session.close()
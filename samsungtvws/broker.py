@@ -0,0 +1,390 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from .async_tv import SamsungTV
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, install samsungtvws[broker]
+    msgpack = None
+
+_LOGGING = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+FORMATS = ("json", "msgpack")
+
+
+def encode_event(message: Dict[str, Any], format: str = "json") -> bytes:
+    """Encode one event for a subscriber, json messages end with a newline."""
+    if format == "msgpack":
+        if msgpack is None:
+            raise ImportError("msgpack format needs msgpack, install samsungtvws[broker]")
+        data: bytes = msgpack.packb(message)
+        return data
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class _Subscriber:
+    """One connected consumer, with its filters and a bounded queue."""
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        format: str = "json",
+        tvs: Optional[Collection[str]] = None,
+        events: Optional[Collection[str]] = None,
+        sub_events: Optional[Collection[str]] = None,
+        queue_size: int = 1000,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format}")
+        self.writer = writer
+        self.format = format
+        self.tvs = set(tvs) if tvs else None
+        self.events = set(events) if events else None
+        self.sub_events = set(sub_events) if sub_events else None
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(max(1, queue_size))
+        self.dropped = 0
+
+    def wants(self, message: Dict[str, Any]) -> bool:
+        return (
+            (self.tvs is None or message["tv"] in self.tvs)
+            and (self.events is None or message["event"] in self.events)
+            and (self.sub_events is None or message["sub_event"] in self.sub_events)
+        )
+
+    def put(self, data: bytes) -> None:
+        """Queue data, dropping the oldest message if the subscriber falls behind."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(data)
+
+    async def run(self) -> None:
+        while True:
+            data = await self.queue.get()
+            self.writer.write(data)
+            await self.writer.drain()
+
+
+class EventBroker:
+    """Republish the events of many TVs to local subscribers.
+
+    The broker holds one remote and one art connection per TV, and sends
+    every event to the processes subscribed to it over a Unix socket (if
+    path is set) or a local TCP port. Subscribers connect and send one json
+    line with optional ``tvs``, ``events`` and ``sub_events`` lists to
+    filter on, and a ``format`` of ``json`` (newline delimited, the default)
+    or ``msgpack``. Each message is a dict with ``tv``, ``channel``
+    (``remote`` or ``art``), ``event``, ``sub_event`` (for art app events,
+    else None) and the decoded ``data``.
+
+    A subscriber that reads too slowly loses its oldest queued messages,
+    it never holds up the TV connections or other subscribers. A TV whose
+    connection drops is reconnected at once, then every retry_interval
+    seconds while that fails.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str] = (),
+        token_dir: Optional[str] = None,
+        port: int = 8002,
+        path: Optional[str] = None,
+        listen_host: str = DEFAULT_HOST,
+        listen_port: int = DEFAULT_PORT,
+        queue_size: int = 1000,
+        retry_interval: float = 30,
+        name: str = "SamsungTvRemote",
+    ) -> None:
+        self.token_dir = token_dir
+        self.port = port
+        self.path = path
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.queue_size = queue_size
+        self.retry_interval = retry_interval
+        self.name = name
+        self.tvs: Dict[str, SamsungTV] = {}
+        self._hosts = list(hosts)
+        self._subscribers: Set[_Subscriber] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+    async def __aenter__(self) -> "EventBroker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, message: Dict[str, Any]) -> None:
+        """Send message to every subscriber whose filters match."""
+        encoded: Dict[str, bytes] = {}
+        for subscriber in self._subscribers:
+            if subscriber.wants(message):
+                if subscriber.format not in encoded:
+                    encoded[subscriber.format] = encode_event(
+                        message, subscriber.format
+                    )
+                subscriber.put(encoded[subscriber.format])
+
+    def add(self, host: str) -> SamsungTV:
+        """Add a TV and keep its connections open until the broker closes."""
+        tv = self.tvs.get(host)
+        if tv is None:
+            token_file = None
+            if self.token_dir:
+                token_file = os.path.join(self.token_dir, f"{host}.token")
+            tv = SamsungTV(host, token_file=token_file, port=self.port, name=self.name)
+
+            def art_event(event: str, response: Dict[str, Any]) -> None:
+                data = json.loads(response["data"])
+                self.publish(
+                    {
+                        "tv": host,
+                        "channel": "art",
+                        "event": event,
+                        "sub_event": data.get("event"),
+                        "data": data,
+                    }
+                )
+
+            tv.art.add_listener("*", art_event)
+            self.tvs[host] = tv
+            if self._server is not None:
+                self._tasks[host] = asyncio.create_task(self._keep_connected(tv))
+        return tv
+
+    async def _keep_connected(self, tv: SamsungTV) -> None:
+        def remote_event(event: str, response: Dict[str, Any]) -> None:
+            self.publish(
+                {
+                    "tv": tv.host,
+                    "channel": "remote",
+                    "event": event,
+                    "sub_event": None,
+                    "data": response.get("data"),
+                }
+            )
+
+        while True:
+            if not (tv.remote.is_alive() and tv.art.is_alive()):
+                try:
+                    if tv.remote.connection or tv.art.connection:
+                        await tv.close()
+                    await tv.start(remote_event)
+                    _LOGGING.debug("Connected to %s", tv.host)
+                except Exception as e:
+                    _LOGGING.debug("Connecting to %s failed: %s", tv.host, e)
+            if tv.remote.is_alive() and tv.art.is_alive():
+                # reconnect as soon as either channel drops
+                await self._wait_closed(tv)
+            else:
+                await asyncio.sleep(self.retry_interval)
+
+    @staticmethod
+    async def _wait_closed(tv: SamsungTV) -> None:
+        closed = [
+            asyncio.ensure_future(connection.wait_closed())
+            for connection in (tv.remote.connection, tv.art.connection)
+            if connection is not None
+        ]
+        try:
+            await asyncio.wait(closed, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for future in closed:
+                future.cancel()
+
+    async def start(self) -> None:
+        if self.path:
+            self._server = await asyncio.start_unix_server(
+                self._handle_subscriber, self.path
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_subscriber, self.listen_host, self.listen_port
+            )
+        for host in self._hosts:
+            self.add(host)
+        for host, tv in self.tvs.items():
+            if host not in self._tasks:
+                self._tasks[host] = asyncio.create_task(self._keep_connected(tv))
+
+    async def _handle_subscriber(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            options = json.loads(await reader.readline() or b"{}")
+            subscriber = _Subscriber(
+                writer,
+                format=options.get("format", "json"),
+                tvs=options.get("tvs"),
+                events=options.get("events"),
+                sub_events=options.get("sub_events"),
+                queue_size=self.queue_size,
+            )
+        except (ValueError, AttributeError) as e:
+            _LOGGING.debug("Bad subscription: %s", e)
+            writer.close()
+            return
+        self._subscribers.add(subscriber)
+        sender = asyncio.create_task(subscriber.run())
+        try:
+            # the subscriber sends nothing more, reading only notices it leaving
+            await reader.read()
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await sender
+            if subscriber.dropped:
+                _LOGGING.debug("Subscriber dropped %d messages", subscriber.dropped)
+            writer.close()
+
+    async def close(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        if self._server is not None:
+            self._server.close()
+            for subscriber in list(self._subscribers):
+                subscriber.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        await asyncio.gather(
+            *(tv.close() for tv in self.tvs.values()), return_exceptions=True
+        )
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+
+async def subscribe(
+    path: Optional[str] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    tvs: Optional[List[str]] = None,
+    events: Optional[List[str]] = None,
+    sub_events: Optional[List[str]] = None,
+    format: str = "json",
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the events an EventBroker sends, until the broker closes."""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    options = {"tvs": tvs, "events": events, "sub_events": sub_events, "format": format}
+    writer.write(json.dumps(options).encode() + b"\n")
+    try:
+        if format == "msgpack":
+            if msgpack is None:
+                raise ImportError("msgpack format needs msgpack, install samsungtvws[broker]")
+            unpacker = msgpack.Unpacker()
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                unpacker.feed(data)
+                for message in unpacker:
+                    yield message
+        else:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                yield json.loads(line)
+    finally:
+        writer.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="samsungtvws-broker",
+        description="Share the events of TVs with local subscribers",
+    )
+    parser.add_argument("--socket", help="Unix socket path of the broker")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the broker")
+    serve.add_argument("tvs", nargs="+")
+    serve.add_argument("--token-dir", help="directory holding a token file per TV")
+    serve.add_argument("--tv-port", type=int, default=8002)
+    serve.add_argument("--queue-size", type=int, default=1000)
+    serve.add_argument("-v", "--verbose", action="store_true")
+
+    listen = commands.add_parser("subscribe", help="print events as json lines")
+    listen.add_argument("--tv", action="append", dest="tvs")
+    listen.add_argument("--event", action="append", dest="events")
+    listen.add_argument("--sub-event", action="append", dest="sub_events")
+
+    args = parser.parse_args(argv)
+
+    async def serve_broker() -> None:
+        await EventBroker(
+            args.tvs,
+            token_dir=args.token_dir,
+            port=args.tv_port,
+            path=args.socket,
+            listen_host=args.host,
+            listen_port=args.port,
+            queue_size=args.queue_size,
+        ).serve_forever()
+
+    async def print_events() -> None:
+        async for message in subscribe(
+            args.socket, args.host, args.port, args.tvs, args.events, args.sub_events
+        ):
+            print(json.dumps(message), flush=True)
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(serve_broker() if args.command == "serve" else print_events())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
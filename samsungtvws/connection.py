@@ -16,7 +16,7 @@ from typing import Any, Callable, Dict, List, Optional, Union
 
 import websocket
 
-from . import exceptions, helper
+from . import exceptions, helper, metrics, recorder, tracing
 from .command import SamsungTVCommand, SamsungTVSleepCommand
 from .event import (
     IGNORE_EVENTS_AT_STARTUP,
@@ -58,6 +58,7 @@ class SamsungTVWSBaseConnection:
         self.endpoint = endpoint
         self.connection: Optional[Any] = None
         self._recv_loop: Optional[Any] = None
+        self.recorder = recorder.create(host, endpoint)
         _LOGGING.debug('version: {}'.format(__version__))
 
     def _is_ssl_connection(self) -> bool:
@@ -145,41 +146,51 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             # someone else already created a new connection
             return self.connection
 
-        url = self._format_websocket_url(self.endpoint)
-        sslopt = {"cert_reqs": ssl.CERT_NONE} if self._is_ssl_connection() else {}
-
-        _LOGGING.debug("WS url %s", url)
-        # Only for debug use!
-        # websocket.enableTrace(True)
-        connection = websocket.create_connection(
-            url,
-            self.timeout,
-            sslopt=sslopt,
-            # Use 'connection' for fix websocket-client 0.57 bug
-            # header={'Connection': 'Upgrade'}
-            connection="Connection: Upgrade",
-        )
-
-        event: Optional[str] = None
-        while event is None or event in IGNORE_EVENTS_AT_STARTUP:
-            data = connection.recv()
-            response = helper.process_api_response(data)
-            event = response.get("event", "*")
-            assert event
-            self._websocket_event(event, response)
-
-        if event == MS_CHANNEL_UNAUTHORIZED:
-            self.close()
-            raise exceptions.UnauthorizedError(response)
-
-        if event != MS_CHANNEL_CONNECT_EVENT:
-            # Unexpected event received during connection routine
-            self.close()
-            raise exceptions.ConnectionFailure(response)
+        with tracing.span(tracing.OPEN, host=self.host, endpoint=self.endpoint):
+            started = metrics.start()
+            url = self._format_websocket_url(self.endpoint)
+            sslopt = {"cert_reqs": ssl.CERT_NONE} if self._is_ssl_connection() else {}
 
-        self._check_for_token(response)
-
-        self.connection = connection
+            _LOGGING.debug("WS url %s", url)
+            # Only for debug use!
+            # websocket.enableTrace(True)
+            try:
+                connection = websocket.create_connection(
+                    url,
+                    self.timeout,
+                    sslopt=sslopt,
+                    # Use 'connection' for fix websocket-client 0.57 bug
+                    # header={'Connection': 'Upgrade'}
+                    connection="Connection: Upgrade",
+                )
+            except Exception:
+                metrics.increment(metrics.WS_CONNECT_ERRORS, self.host, self.endpoint)
+                raise
+
+            event: Optional[str] = None
+            while event is None or event in IGNORE_EVENTS_AT_STARTUP:
+                data = connection.recv()
+                response = helper.process_api_response(data, self.recorder)
+                event = response.get("event", "*")
+                assert event
+                self._websocket_event(event, response)
+
+            if event != MS_CHANNEL_CONNECT_EVENT:
+                metrics.increment(metrics.WS_CONNECT_ERRORS, self.host, self.endpoint)
+
+            if event == MS_CHANNEL_UNAUTHORIZED:
+                self.close()
+                raise exceptions.UnauthorizedError(response)
+
+            if event != MS_CHANNEL_CONNECT_EVENT:
+                # Unexpected event received during connection routine
+                self.close()
+                raise exceptions.ConnectionFailure(response)
+
+            self._check_for_token(response)
+
+            self.connection = connection
+            metrics.connected(started, self.host, self.endpoint)
         return connection
 
     def start_listening(
@@ -206,7 +217,7 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             data = connection.recv()
             if not data:
                 return
-            response = helper.process_api_response(data)
+            response = helper.process_api_response(data, self.recorder)
             event = response.get("event", "*")
             self._websocket_event(event, response)
             if callback:
@@ -232,18 +243,25 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
 
         delay = self.key_press_delay if key_press_delay is None else key_press_delay
 
-        if isinstance(command, list):
-            for sub_command in command:
-                self._send_command(self.connection, sub_command, delay)
-            return
-
-        self._send_command(self.connection, command, delay)
+        commands = command if isinstance(command, list) else [command]
+        metrics.increment(
+            metrics.WS_COMMANDS, self.host, self.endpoint, value=len(commands)
+        )
+        with tracing.span(
+            tracing.SEND_COMMANDS,
+            host=self.host,
+            endpoint=self.endpoint,
+            count=len(commands),
+        ):
+            for sub_command in commands:
+                self._send_command(self.connection, sub_command, delay, self.recorder)
 
     @staticmethod
     def _send_command(
         connection: websocket.WebSocket,
         command: Union[SamsungTVCommand, Dict[str, Any]],
         delay: float,
+        flight_recorder: Optional[recorder.FlightRecorder] = None,
     ) -> None:
         if isinstance(command, SamsungTVSleepCommand):
             time.sleep(command.delay)
@@ -255,6 +273,8 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             payload = json.dumps(command)
         _LOGGING.debug("SamsungTVWS websocket command: %s", payload)
         connection.send(payload)
+        if flight_recorder is not None:
+            flight_recorder.record(recorder.OUTBOUND, payload)
 
         time.sleep(delay)
 
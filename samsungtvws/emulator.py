@@ -0,0 +1,702 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import json
+import logging
+import random
+import socket
+import ssl
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Sequence, Set
+import uuid
+
+from aiohttp import WSMsgType, web
+
+from .event import (
+    D2D_SERVICE_MESSAGE_EVENT,
+    ED_INSTALLED_APP_EVENT,
+    MS_CHANNEL_CONNECT_EVENT,
+    MS_CHANNEL_READY_EVENT,
+    MS_CHANNEL_UNAUTHORIZED,
+    MS_ERROR_EVENT,
+)
+
+_LOGGING = logging.getLogger(__name__)
+
+REMOTE_ENDPOINT = "samsung.remote.control"
+ART_ENDPOINT = "com.samsung.art-app"
+
+# failure modes for FakeSamsungTV.failures
+ERROR = "error"
+DROP = "drop"
+
+_CHUNK_SIZE = 64 * 1024
+_D2D_ACCEPT_TIMEOUT = 10
+
+MATTE_TYPES = ["none", "modern", "shadowbox", "flexible"]
+MATTE_COLORS = ["polar", "black", "antique", "warm", "apricot", "navy"]
+PHOTO_FILTERS = ["none", "aqua", "artdeco", "ink", "wash", "pastel", "feuve"]
+
+INSTALLED_APPS = [
+    {"appId": "111299001912", "app_type": 2, "is_lock": 0, "name": "YouTube"},
+    {"appId": "3201907018807", "app_type": 2, "is_lock": 0, "name": "Netflix"},
+]
+
+
+def make_content(
+    count: int, category: str = "MY-C0002", prefix: str = "MY_F"
+) -> List[Dict[str, Any]]:
+    """Build count content list entries like the ones the TV returns."""
+    return [
+        {
+            "content_id": "{}{:04d}".format(prefix, i),
+            "category_id": category,
+            "matte_id": "none",
+            "portrait_matte_id": "none",
+            "width": 3840,
+            "height": 2160,
+            "image_date": "2024:05:01 12:00:00",
+            "content_type": "mobile",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def _delay(seconds: float) -> None:
+    """Sleep on the loop timer, so tests that patch asyncio.sleep keep delays."""
+    if seconds <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[None]" = loop.create_future()
+    handle = loop.call_later(seconds, _wake, future)
+    try:
+        await future
+    finally:
+        handle.cancel()
+
+
+class FakeSamsungTV:
+    """Local emulator of a Samsung Frame TV, for offline tests and benchmarks.
+
+    Serves the ``/api/v2/`` REST routes and the ``samsung.remote.control``
+    and ``com.samsung.art-app`` websocket channels on one port, like the
+    TV, and opens a D2D socket for each upload and thumbnail request. The
+    real clients can be pointed at host and port unchanged. With an
+    ssl_context, websockets and D2D sockets use TLS and new tokens are
+    issued as on port 8002; the clients only use TLS on port 8002, so the
+    emulator then has to listen there.
+
+    latency delays every response and D2D transfer by that many seconds,
+    and bandwidth (bytes per second) throttles D2D transfers. failures maps
+    art request names to ERROR (answered with an error event) or DROP (not
+    answered), and error_rate and drop_rate fail that fraction of all art
+    requests, chosen by a random generator seeded with seed.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        api_version: str = "4.3.4.0",
+        content: Optional[Sequence[Dict[str, Any]]] = None,
+        token: Optional[str] = None,
+        authorize: bool = True,
+        latency: float = 0,
+        bandwidth: Optional[float] = None,
+        failures: Optional[Dict[str, str]] = None,
+        error_rate: float = 0,
+        drop_rate: float = 0,
+        seed: int = 0,
+        thumbnail_size: int = 16 * 1024,
+        name: str = "FakeSamsungTV",
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.api_version = api_version
+        self.authorize = authorize
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failures = dict(failures or {})
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.thumbnail_size = thumbnail_size
+        self.name = name
+        self.id = str(uuid.uuid4())
+        self.tokens: Set[str] = {token} if token else set()
+        self.content: Dict[str, Dict[str, Any]] = {
+            entry["content_id"]: dict(entry)
+            for entry in (make_content(10) if content is None else content)
+        }
+        self.favourites: Set[str] = set()
+        self.uploads: Dict[str, bytes] = {}
+        self.current = next(iter(self.content), "")
+        self.artmode = "on"
+        self.power = "on"
+        self.settings: Dict[str, Any] = {
+            "brightness": 5,
+            "color_temperature": 0,
+            "slideshow": {"value": "off", "type": "slideshow", "category_id": "MY-C0002"},
+        }
+        # remote keys and art requests received, in order
+        self.keys: List[str] = []
+        self.requests: List[Dict[str, Any]] = []
+        self._random = random.Random(seed)
+        self._next_content = len(self.content) + 1
+        self._art_clients: Set[web.WebSocketResponse] = set()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._d2d_servers: Set[asyncio.AbstractServer] = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "FakeSamsungTV":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    @property
+    def api_generation(self) -> int:
+        return 0 if int(self.api_version.replace(".", "")) < 4000 else 1
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/api/v2/", self._device_info),
+                web.route("*", "/api/v2/applications/{app_id}", self._application),
+                web.get("/api/v2/channels/{app}", self._channel),
+            ]
+        )
+        return app
+
+    async def start(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.SockSite(self._runner, sock, ssl_context=self.ssl_context)
+        await site.start()
+        _LOGGING.debug("Fake TV listening on %s", site.name)
+
+    async def close(self) -> None:
+        for ws in list(self._art_clients):
+            await ws.close()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # a task cancelled before it ran never closed its server
+        for server in list(self._d2d_servers):
+            server.close()
+        self._d2d_servers.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def thumbnail(self, content_id: str) -> bytes:
+        """Return the thumbnail served for content_id."""
+        seed = content_id.encode() or b"\0"
+        return (seed * (self.thumbnail_size // len(seed) + 1))[: self.thumbnail_size]
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # REST
+
+    async def _device_info(self, request: web.Request) -> web.Response:
+        await _delay(self.latency)
+        return web.json_response(
+            {
+                "id": "uuid:" + self.id,
+                "name": self.name,
+                "type": "Samsung SmartTV",
+                "isSupport": json.dumps({"remote_available": "true"}),
+                "remote": "1.0",
+                "uri": "http://{}:8001/api/v2/".format(self.host),
+                "version": "2.0.25",
+                "device": {
+                    "FrameTVSupport": "true",
+                    "PowerState": self.power,
+                    "TokenAuthSupport": "true",
+                    "model": "22_PONTUSM_FTV",
+                    "modelName": "QE55LS03BAUXXU",
+                    "name": self.name,
+                    "ip": self.host,
+                    "wifiMac": "00:00:00:00:00:00",
+                    "id": "uuid:" + self.id,
+                },
+            }
+        )
+
+    async def _application(self, request: web.Request) -> web.Response:
+        await _delay(self.latency)
+        app_id = request.match_info["app_id"]
+        return web.json_response(
+            {
+                "id": app_id,
+                "name": app_id,
+                "running": request.method in ("GET", "POST"),
+                "version": "1.0.0",
+                "visible": request.method == "POST",
+            }
+        )
+
+    # websocket channels
+
+    async def _channel(self, request: web.Request) -> web.WebSocketResponse:
+        app = request.match_info["app"]
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if app not in (REMOTE_ENDPOINT, ART_ENDPOINT):
+            await ws.send_json(
+                {"event": MS_ERROR_EVENT, "data": {"message": "unknown channel " + app}}
+            )
+            await ws.close()
+            return ws
+        if not self.authorize:
+            await ws.send_json({"event": MS_CHANNEL_UNAUTHORIZED, "data": {}})
+            await ws.close()
+            return ws
+
+        client_id = str(uuid.uuid4())
+        connect_data: Dict[str, Any] = {
+            "clients": [{"id": client_id, "isHost": False}],
+            "id": client_id,
+        }
+        token = request.query.get("token")
+        if self.ssl_context is not None:
+            if token not in self.tokens:
+                token = str(self._random.randrange(10**7, 10**8))
+                self.tokens.add(token)
+            connect_data["token"] = token
+        await ws.send_json(
+            {"event": MS_CHANNEL_CONNECT_EVENT, "data": connect_data, "from": "host"}
+        )
+        if app == ART_ENDPOINT:
+            await ws.send_json({"event": MS_CHANNEL_READY_EVENT, "data": {}})
+            self._art_clients.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                if app == ART_ENDPOINT:
+                    self._art_message(ws, client_id, message)
+                else:
+                    self._remote_message(ws, message)
+        finally:
+            self._art_clients.discard(ws)
+        return ws
+
+    def _remote_message(self, ws: web.WebSocketResponse, message: Dict[str, Any]) -> None:
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "ms.remote.control":
+            self.keys.append(params.get("DataOfCmd", ""))
+        elif method == "ms.channel.emit" and params.get("event") == ED_INSTALLED_APP_EVENT:
+            self._spawn(
+                self._send(
+                    ws,
+                    {
+                        "event": ED_INSTALLED_APP_EVENT,
+                        "data": {"data": INSTALLED_APPS},
+                        "from": "host",
+                    },
+                )
+            )
+        elif method != "ms.channel.emit":
+            self._spawn(
+                self._send(
+                    ws,
+                    {
+                        "event": MS_ERROR_EVENT,
+                        "data": {"message": "unrecognized method value : {}".format(method)},
+                    },
+                )
+            )
+
+    def _art_message(
+        self, ws: web.WebSocketResponse, client_id: str, message: Dict[str, Any]
+    ) -> None:
+        params = message.get("params", {})
+        if message.get("method") != "ms.channel.emit" or params.get("event") != "art_app_request":
+            return
+        request = json.loads(params["data"])
+        self.requests.append(request)
+        self._spawn(self._handle_art_request(ws, client_id, request))
+
+    async def _send(self, ws: web.WebSocketResponse, message: Dict[str, Any]) -> None:
+        await _delay(self.latency)
+        if not ws.closed:
+            await ws.send_str(json.dumps(message))
+
+    async def _reply(
+        self,
+        ws: Optional[web.WebSocketResponse],
+        client_id: str,
+        request: Dict[str, Any],
+        event: str,
+        **data: Any,
+    ) -> None:
+        """Send an art app sub event, to ws only, or to all art clients if ws is None."""
+        data = dict(data, event=event, target_client_id=client_id)
+        if request:
+            data.setdefault("id", request.get("id"))
+            data.setdefault("request_id", request.get("request_id", request.get("id")))
+        message = {
+            "event": D2D_SERVICE_MESSAGE_EVENT,
+            "from": self.id,
+            "data": json.dumps(data),
+        }
+        await _delay(self.latency)
+        for client in [ws] if ws is not None else list(self._art_clients):
+            if not client.closed:
+                await client.send_str(json.dumps(message))
+
+    def _failure(self, name: str) -> Optional[str]:
+        failure = self.failures.get(name)
+        if failure is None and (self.error_rate or self.drop_rate):
+            roll = self._random.random()
+            if roll < self.error_rate:
+                failure = ERROR
+            elif roll < self.error_rate + self.drop_rate:
+                failure = DROP
+        return failure
+
+    async def _handle_art_request(
+        self, ws: web.WebSocketResponse, client_id: str, request: Dict[str, Any]
+    ) -> None:
+        name = request.get("request", "")
+        failure = self._failure(name)
+        if failure == DROP:
+            return
+        handler = getattr(self, "_art_" + name, None)
+        if failure == ERROR or handler is None or (
+            name == "api_version" and self.api_generation == 0
+        ):
+            await self._reply(
+                ws,
+                client_id,
+                request,
+                "error",
+                request_data=json.dumps(request),
+                error_code="-1",
+            )
+            return
+        if name == "get_api_version" and self.api_generation == 1:
+            # new api tv's don't answer the old request
+            return
+        await handler(ws, client_id, request)
+
+    # art requests, one handler per request name
+
+    async def _art_api_version(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(ws, client_id, request, "api_version", version=self.api_version)
+
+    async def _art_get_api_version(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(ws, client_id, request, "get_api_version", version=self.api_version)
+
+    async def _art_get_device_info(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(
+            ws,
+            client_id,
+            request,
+            "get_device_info",
+            DeviceType="Frame TV",
+            FrameTVSupport="true",
+            SerialNumber="0000000000",
+        )
+
+    async def _art_get_content_list(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        category = request.get("category")
+        content_list = [
+            entry
+            for entry in self.content.values()
+            if not category or entry.get("category_id") == category
+        ]
+        if category is None or category == "MY-C0004":
+            content_list += [
+                dict(self.content[content_id], category_id="MY-C0004")
+                for content_id in sorted(self.favourites)
+                if content_id in self.content
+            ]
+        await self._reply(
+            ws, client_id, request, "content_list", content_list=json.dumps(content_list)
+        )
+
+    async def _art_get_current_artwork(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        entry = self.content.get(self.current, {"content_id": self.current})
+        await self._reply(ws, client_id, request, "current_artwork", **entry)
+
+    async def _art_select_image(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_id = request.get("content_id", "")
+        if content_id not in self.content:
+            await self._reply(
+                ws, client_id, request, "error", request_data=json.dumps(request), error_code="-11"
+            )
+            return
+        self.current = content_id
+        await self._reply(
+            None,
+            client_id,
+            request,
+            "image_selected",
+            content_id=content_id,
+            is_shown="Yes" if request.get("show", True) else "No",
+        )
+
+    async def _art_get_artmode_status(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(ws, client_id, request, "artmode_status", value=self.artmode)
+
+    async def _art_set_artmode_status(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        self.artmode = request.get("value", self.artmode)
+        await self._reply(None, client_id, request, "artmode_status", value=self.artmode)
+
+    async def _art_change_favorite(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_id = request.get("content_id", "")
+        status = request.get("status", "on")
+        if status == "on":
+            self.favourites.add(content_id)
+        else:
+            self.favourites.discard(content_id)
+        await self._reply(
+            None, client_id, request, "favorite_changed", content_id=content_id, status=status
+        )
+
+    async def _art_change_matte(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_id = request.get("content_id", "")
+        changes: Dict[str, Any] = {
+            key: request[key] for key in ("matte_id", "portrait_matte_id") if key in request
+        }
+        self.content.get(content_id, {}).update(changes)
+        await self._reply(
+            None, client_id, request, "matte_changed", content_id=content_id, **changes
+        )
+
+    async def _art_set_photo_filter(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_id = request.get("content_id", "")
+        filter_id = request.get("filter_id", "none")
+        self.content.get(content_id, {})["filter_id"] = filter_id
+        await self._reply(
+            None, client_id, request, "filter_applied", content_id=content_id, filter_id=filter_id
+        )
+
+    async def _art_delete_image_list(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_id_list = request.get("content_id_list", [])
+        for item in content_id_list:
+            self.content.pop(item["content_id"], None)
+            self.favourites.discard(item["content_id"])
+            self.uploads.pop(item["content_id"], None)
+        await self._reply(
+            None,
+            client_id,
+            request,
+            "image_deleted",
+            content_id_list=json.dumps(content_id_list),
+        )
+
+    async def _art_get_matte_list(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(
+            ws,
+            client_id,
+            request,
+            "matte_list",
+            matte_type_list=json.dumps([{"matte_type": m} for m in MATTE_TYPES]),
+            matte_color_list=json.dumps([{"color": c} for c in MATTE_COLORS]),
+        )
+
+    async def _art_get_photo_filter_list(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(
+            ws,
+            client_id,
+            request,
+            "photo_filter_list",
+            filter_list=json.dumps(
+                [{"filter_id": f, "filter_name": f.upper()} for f in PHOTO_FILTERS]
+            ),
+        )
+
+    async def _art_get_current_rotation(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(ws, client_id, request, "current_rotation", current_rotation_status=1)
+
+    async def _art_get_artmode_settings(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        settings = [
+            {"item": "brightness", "value": str(self.settings["brightness"])},
+            {"item": "color_temperature", "value": str(self.settings["color_temperature"])},
+        ]
+        await self._reply(ws, client_id, request, "artmode_settings", data=json.dumps(settings))
+
+    async def _get_setting(self, ws: Any, client_id: str, request: Dict[str, Any], key: str) -> None:
+        await self._reply(ws, client_id, request, key, value=str(self.settings[key]))
+
+    async def _set_setting(self, ws: Any, client_id: str, request: Dict[str, Any], key: str) -> None:
+        self.settings[key] = request.get("value")
+        await self._reply(None, client_id, request, key + "_changed", value=str(self.settings[key]))
+
+    async def _art_get_brightness(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._get_setting(ws, client_id, request, "brightness")
+
+    async def _art_set_brightness(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._set_setting(ws, client_id, request, "brightness")
+
+    async def _art_get_color_temperature(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._get_setting(ws, client_id, request, "color_temperature")
+
+    async def _art_set_color_temperature(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._set_setting(ws, client_id, request, "color_temperature")
+
+    async def _art_get_slideshow_status(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        await self._reply(ws, client_id, request, "slideshow_status", **self.settings["slideshow"])
+
+    async def _art_set_slideshow_status(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        self.settings["slideshow"] = {
+            key: request.get(key) for key in ("value", "type", "category_id")
+        }
+        await self._reply(None, client_id, request, "slideshow_status", **self.settings["slideshow"])
+
+    _art_get_auto_rotation_status = _art_get_slideshow_status
+    _art_set_auto_rotation_status = _art_set_slideshow_status
+
+    # D2D transfers
+
+    async def _open_d2d(self, handler: Any) -> Dict[str, Any]:
+        """Listen for one D2D connection, return its conn_info."""
+        done: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+
+        async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                await _delay(self.latency)
+                await handler(reader, writer)
+            except (ConnectionError, asyncio.IncompleteReadError) as err:
+                _LOGGING.debug("D2D transfer failed: %s", err)
+            finally:
+                writer.close()
+                if not done.done():
+                    done.set_result(None)
+
+        server = await asyncio.start_server(on_connect, self.host, 0, ssl=self.ssl_context)
+        port = server.sockets[0].getsockname()[1]
+        self._d2d_servers.add(server)
+
+        async def close_when_done() -> None:
+            # close the server even when close() cancels this task
+            try:
+                await asyncio.wait_for(done, _D2D_ACCEPT_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                server.close()
+                self._d2d_servers.discard(server)
+
+        self._spawn(close_when_done())
+        conn_info = {
+            "d2d_mode": "socket",
+            "connection_id": self._random.randrange(4 * 1024 * 1024 * 1024),
+            "ip": self.host,
+            "port": str(port),
+            "key": str(uuid.uuid4()),
+            "secured": self.ssl_context is not None,
+        }
+        return conn_info
+
+    async def _throttle(self, size: int) -> None:
+        if self.bandwidth:
+            await _delay(size / self.bandwidth)
+
+    async def _write(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        for start in range(0, len(data), _CHUNK_SIZE):
+            chunk = data[start : start + _CHUNK_SIZE]
+            writer.write(chunk)
+            await writer.drain()
+            await self._throttle(len(chunk))
+
+    async def _read(self, reader: asyncio.StreamReader, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = await reader.readexactly(min(_CHUNK_SIZE, size - len(data)))
+            data.extend(chunk)
+            await self._throttle(len(chunk))
+        return bytes(data)
+
+    async def _send_thumbnails(self, writer: asyncio.StreamWriter, content_ids: List[str]) -> None:
+        for num, content_id in enumerate(content_ids):
+            data = self.thumbnail(content_id)
+            header = json.dumps(
+                {
+                    "fileID": content_id,
+                    "fileType": "jpg",
+                    "fileLength": len(data),
+                    "num": num,
+                    "total": len(content_ids),
+                }
+            ).encode("ascii")
+            writer.write(len(header).to_bytes(4, "big") + header)
+            await self._write(writer, data)
+
+    async def _art_get_thumbnail(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_ids = [request.get("content_id", "")]
+
+        async def transfer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await self._send_thumbnails(writer, content_ids)
+
+        conn_info = await self._open_d2d(transfer)
+        await self._reply(ws, client_id, request, "get_thumbnail", conn_info=json.dumps(conn_info))
+
+    async def _art_get_thumbnail_list(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        content_ids = [item["content_id"] for item in request.get("content_id_list", [])]
+
+        async def transfer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await self._send_thumbnails(writer, content_ids)
+
+        conn_info = await self._open_d2d(transfer)
+        await self._reply(
+            ws, client_id, request, "get_thumbnail_list", conn_info=json.dumps(conn_info)
+        )
+
+    async def _art_send_image(self, ws: Any, client_id: str, request: Dict[str, Any]) -> None:
+        async def transfer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            header_len = int.from_bytes(await reader.readexactly(4), "big")
+            header = json.loads(await reader.readexactly(header_len))
+            data = await self._read(reader, int(header["fileLength"]))
+            content_id = "MY_F{:04d}".format(self._next_content)
+            self._next_content += 1
+            self.uploads[content_id] = data
+            self.content[content_id] = {
+                "content_id": content_id,
+                "category_id": "MY-C0002",
+                "matte_id": request.get("matte_id", "none"),
+                "portrait_matte_id": request.get("portrait_matte_id", "none"),
+                "image_date": request.get("image_date", ""),
+                "file_type": header.get("fileType", request.get("file_type")),
+                "content_type": "mobile",
+            }
+            # image_added carries no request id, the clients wait for the event name
+            await self._reply(
+                None, client_id, {}, "image_added", content_id=content_id, category_id="MY-C0002"
+            )
+
+        conn_info = await self._open_d2d(transfer)
+        await self._reply(ws, client_id, request, "ready_to_use", conn_info=json.dumps(conn_info))
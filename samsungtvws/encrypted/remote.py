@@ -12,6 +12,7 @@ from websockets.client import WebSocketClientProtocol, connect
 from websockets.exceptions import ConnectionClosed
 from websockets.protocol import State
 
+from .. import metrics, recorder, tracing
 from ..exceptions import ConnectionFailure
 from .command import SamsungTVEncryptedCommand
 from .session import SamsungTVEncryptedSession
@@ -65,6 +66,7 @@ class SamsungTVEncryptedWSAsyncRemote:
         self._web_session = web_session
         self._connection = None
         self._recv_loop = None
+        self.recorder = recorder.create(host, "encrypted")
 
     async def __aenter__(self) -> "SamsungTVEncryptedWSAsyncRemote":
         return self
@@ -100,21 +102,28 @@ class SamsungTVEncryptedWSAsyncRemote:
             # someone else already created a new connection
             return
 
-        millis = int(round(time.time() * 1000))
-        step4_url = self._format_rest_url(f"socket.io/1/?t={millis}")
-        LOGGER.debug("Tx: GET %s", step4_url)
+        with tracing.span(tracing.OPEN, host=self._host, endpoint="encrypted"):
+            started = metrics.start()
+            millis = int(round(time.time() * 1000))
+            step4_url = self._format_rest_url(f"socket.io/1/?t={millis}")
+            LOGGER.debug("Tx: GET %s", step4_url)
 
-        async with self._web_session.get(step4_url, timeout=self._timeout) as response:
-            LOGGER.debug("Rx: %s", await response.text())
-            step4_response = await response.text()
+            async with self._web_session.get(step4_url, timeout=self._timeout) as response:
+                LOGGER.debug("Rx: %s", await response.text())
+                step4_response = await response.text()
 
-        url = self._format_websocket_url(step4_response.split(":")[0])
-        LOGGER.debug("WS url %s", url)
+            url = self._format_websocket_url(step4_response.split(":")[0])
+            LOGGER.debug("WS url %s", url)
 
-        connection = await connect(url, open_timeout=self._timeout)
-        await connection.send("1::/com.samsung.companion")
+            try:
+                connection = await connect(url, open_timeout=self._timeout)
+            except Exception:
+                metrics.increment(metrics.WS_CONNECT_ERRORS, self._host, "encrypted")
+                raise
+            await connection.send("1::/com.samsung.companion")
 
-        self._connection = connection
+            self._connection = connection
+            metrics.connected(started, self._host, "encrypted")
 
     async def start_listening(self) -> None:
         """Open, and start listening."""
@@ -125,17 +134,20 @@ class SamsungTVEncryptedWSAsyncRemote:
         assert self._connection
 
         self._recv_loop = asyncio.ensure_future(
-            self._do_start_listening(self._connection)
+            self._do_start_listening(self._connection, self.recorder)
         )
 
     @staticmethod
     async def _do_start_listening(
         connection: WebSocketClientProtocol,
+        flight_recorder: Optional[recorder.FlightRecorder] = None,
     ) -> None:
         """Do start listening."""
         with contextlib.suppress(ConnectionClosed):
             while True:
                 data = await connection.recv()
+                if flight_recorder is not None:
+                    flight_recorder.record(recorder.INBOUND, data)
                 LOGGER.debug("SamsungTVEncryptedWS websocket event: %s", data)
 
     async def send_command(
@@ -156,8 +168,19 @@ class SamsungTVEncryptedWSAsyncRemote:
             assert self._connection
 
         delay = self._key_press_delay if key_press_delay is None else key_press_delay
-        for command in commands:
-            await self._send_command(self._connection, command, self._session, delay)
+        metrics.increment(
+            metrics.WS_COMMANDS, self._host, "encrypted", value=len(commands)
+        )
+        with tracing.span(
+            tracing.SEND_COMMANDS,
+            host=self._host,
+            endpoint="encrypted",
+            count=len(commands),
+        ):
+            for command in commands:
+                await self._send_command(
+                    self._connection, command, self._session, delay, self.recorder
+                )
 
     @staticmethod
     async def _send_command(
@@ -165,12 +188,15 @@ class SamsungTVEncryptedWSAsyncRemote:
         command: SamsungTVEncryptedCommand,
         session: SamsungTVEncryptedSession,
         delay: float,
+        flight_recorder: Optional[recorder.FlightRecorder] = None,
     ) -> None:
         LOGGER.debug("SamsungTVEncryptedWS websocket command: %s", command.as_dict())
         payload = session.encrypt_command(command)
 
         LOGGER.debug("SamsungTVEncryptedWS websocket command (encrypted): %s", payload)
         await connection.send(payload)
+        if flight_recorder is not None:
+            flight_recorder.record(recorder.OUTBOUND, payload)
 
         await asyncio.sleep(delay)
 
@@ -6,6 +6,7 @@ Copyright (C) 2019 DSR! <xchwarze@gmail.com>
 SPDX-License-Identifier: LGPL-3.0
 """
 
+import json
 from typing import Any, Dict, List
 
 from .exceptions import MessageError
@@ -34,3 +35,17 @@ def parse_installed_app(event: Dict[str, Any]) -> List[Dict[str, Any]]:
 def parse_ms_error(event: Dict[str, Any]) -> MessageError:
     assert event["event"] == MS_ERROR_EVENT
     return MessageError(event["data"]["message"])
+
+
+def parse_art_content_ids(data: Dict[str, Any]) -> List[str]:
+    """Return the content ids referenced by a decoded art app sub event."""
+    content_id_list = data.get("content_id_list", [])
+    if isinstance(content_id_list, str):
+        content_id_list = json.loads(content_id_list)
+    content_ids = [
+        item["content_id"] if isinstance(item, dict) else item
+        for item in content_id_list
+    ]
+    if data.get("content_id") and data["content_id"] not in content_ids:
+        content_ids.append(data["content_id"])
+    return content_ids
@@ -0,0 +1,257 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import logging
+import os
+import time
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import aiohttp
+
+from .async_tv import SamsungTV
+from .helper import get_ssl_context
+from .remote import SendRemoteKey
+
+_LOGGING = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SamsungTVFleet:
+    """Many TVs managed from one event loop.
+
+    TVs are keyed by host and only connected when first used, a TV that
+    was not used for idle_timeout seconds is disconnected, and reconnected
+    on its next use. At most max_concurrency operations run at a time
+    across the fleet, and per_host_concurrency per TV. All TVs share one
+    aiohttp session, whose connector uses the library's SSL context.
+
+    With a token_dir, each TV keeps its token in ``<token_dir>/<host>.token``.
+    """
+
+    def __init__(
+        self,
+        token_dir: Optional[str] = None,
+        port: int = 8002,
+        timeout: Optional[float] = None,
+        max_concurrency: int = 64,
+        per_host_concurrency: int = 2,
+        idle_timeout: float = 300,
+        name: str = "SamsungTvRemote",
+    ) -> None:
+        self.token_dir = token_dir
+        self.port = port
+        self.timeout = timeout
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.idle_timeout = idle_timeout
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+        # the semaphore and event are created in the running loop, on
+        # Python < 3.10 they bind to the loop current when they are made
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tvs: Dict[str, SamsungTV] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._open_locks: Dict[str, asyncio.Lock] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_use: Dict[str, int] = {}
+        self._idle_task: Optional["asyncio.Task[None]"] = None
+        self._closing: Optional[asyncio.Event] = None
+
+    async def __aenter__(self) -> "SamsungTVFleet":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    @property
+    def hosts(self) -> Tuple[str, ...]:
+        return tuple(self._tvs)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl=get_ssl_context(),
+                    limit_per_host=self.per_host_concurrency,
+                )
+            )
+        return self.session
+
+    def add(
+        self, host: str, token: Optional[str] = None, port: Optional[int] = None
+    ) -> SamsungTV:
+        """Add a TV to the fleet, without connecting to it.
+
+        Must be called with the event loop running, as the first TV added
+        creates the shared session.
+        """
+        tv = self._tvs.get(host)
+        if tv is None:
+            token_file = None
+            if self.token_dir:
+                token_file = os.path.join(self.token_dir, f"{host}.token")
+            tv = SamsungTV(
+                host,
+                token=token,
+                token_file=token_file,
+                port=port or self.port,
+                timeout=self.timeout,
+                name=self.name,
+                session=self.get_session(),
+            )
+            self._tvs[host] = tv
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+            self._open_locks[host] = asyncio.Lock()
+            self._in_use[host] = 0
+            self._last_used[host] = time.monotonic()
+        return tv
+
+    async def remove(self, host: str) -> None:
+        tv = self._tvs.pop(host, None)
+        if tv is not None:
+            del self._host_semaphores[host], self._open_locks[host]
+            del self._in_use[host], self._last_used[host]
+            await tv.close()
+
+    async def _open(self, host: str) -> SamsungTV:
+        tv = self._tvs[host]
+        async with self._open_locks[host]:
+            if not (tv.remote.is_alive() and tv.art.is_alive()):
+                _LOGGING.debug("Connecting to %s", host)
+                await tv.start()
+        if self._idle_task is None and self.idle_timeout > 0:
+            self._closing = asyncio.Event()
+            self._idle_task = asyncio.create_task(self._idle_loop(self._closing))
+        return tv
+
+    async def run(self, host: str, func: Callable[[SamsungTV], Awaitable[T]]) -> T:
+        """Call func with the connected TV for host, within the concurrency limits."""
+        if host not in self._tvs:
+            self.add(host)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # queue on the TV first, so waiting for a busy TV holds no fleet slot
+        async with self._host_semaphores[host], self._semaphore:
+            self._in_use[host] += 1
+            try:
+                return await func(await self._open(host))
+            finally:
+                self._in_use[host] -= 1
+                self._last_used[host] = time.monotonic()
+
+    async def broadcast(
+        self,
+        func: Callable[[SamsungTV], Awaitable[Any]],
+        hosts: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Call func for every TV concurrently, yielding (host, outcome) as each completes.
+
+        The outcome is what func returned, or the exception it raised, a
+        failing TV does not stop the others.
+        """
+
+        async def run(host: str) -> Tuple[str, Any]:
+            try:
+                return host, await self.run(host, func)
+            except Exception as e:
+                _LOGGING.debug("%s failed: %s", host, e)
+                return host, e
+
+        for result in asyncio.as_completed(
+            [run(host) for host in (self.hosts if hosts is None else hosts)]
+        ):
+            yield await result
+
+    def send_key_all(
+        self, key: str, hosts: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        return self.broadcast(
+            lambda tv: tv.remote.send_command(SendRemoteKey.click(key)), hosts
+        )
+
+    def select_image_all(
+        self,
+        content_id: Union[str, Dict[str, str]],
+        show: bool = True,
+        hosts: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Select an image on every TV, content_id can map hosts to their own image."""
+        if isinstance(content_id, dict):
+            content_ids = content_id
+            if hosts is None:
+                hosts = list(content_ids)
+            return self.broadcast(
+                lambda tv: tv.art.select_image(content_ids[tv.host], show=show), hosts
+            )
+        return self.broadcast(
+            lambda tv: tv.art.select_image(content_id, show=show), hosts
+        )
+
+    def _is_idle(self, host: str) -> bool:
+        tv = self._tvs.get(host)
+        return (
+            tv is not None
+            and self._in_use.get(host) == 0
+            and time.monotonic() - self._last_used[host] >= self.idle_timeout
+            and (tv.remote.is_alive() or tv.art.is_alive())
+        )
+
+    async def close_idle(self) -> None:
+        """Disconnect TVs that were not used for idle_timeout seconds."""
+        for host, tv in list(self._tvs.items()):
+            if not self._is_idle(host):
+                continue
+            # holding the open lock, run() can't pick up a closing TV, and
+            # checking again catches one that started in the meantime
+            async with self._open_locks[host]:
+                if self._is_idle(host):
+                    _LOGGING.debug("Disconnecting idle %s", host)
+                    await tv.close()
+
+    async def _idle_loop(self, closing: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(closing.wait(), self.idle_timeout / 2)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.close_idle()
+            except Exception as e:
+                _LOGGING.warning("Closing idle TVs failed: %s", e)
+
+    async def close(self) -> None:
+        if self._idle_task is not None and self._closing is not None:
+            self._closing.set()
+            await self._idle_task
+            self._idle_task = None
+            self._closing = None
+        await asyncio.gather(
+            *(tv.close() for tv in self._tvs.values()), return_exceptions=True
+        )
+        if self.session is not None:
+            await self.session.close()
@@ -9,13 +9,20 @@ SPDX-License-Identifier: LGPL-3.0
 import base64
 import json
 import logging
+import re
 import ssl
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
 
 from . import exceptions
+from .recorder import INBOUND, FlightRecorder
 
 _LOGGING = logging.getLogger(__name__)
 _SSL_CONTEXT: Optional[ssl.SSLContext] = None
+_JSON_DECODER = json.JSONDecoder()
+_SEPARATOR = re.compile(r"[\s,]*")
+# a json object without nested objects (content list entries), strings are
+# matched whole so braces, quotes and backslashes inside them are skipped
+_FLAT_OBJECT = re.compile(r'\{(?:[^{}"]|"(?:[^"\\]|\\.)*")*\}', re.DOTALL)
 
 
 def serialize_string(string: Union[str, bytes]) -> str:
@@ -25,16 +32,89 @@ def serialize_string(string: Union[str, bytes]) -> str:
     return base64.b64encode(string).decode("utf-8")
 
 
-def process_api_response(response: Union[str, bytes]) -> Dict[str, Any]:
+def process_api_response(
+    response: Union[str, bytes], recorder: Optional[FlightRecorder] = None
+) -> Dict[str, Any]:
+    if recorder is not None:
+        recorder.record(INBOUND, response)
     _LOGGING.debug("Processing API response: %s", response)
     try:
         return json.loads(response)  # type:ignore[no-any-return]
     except json.JSONDecodeError as err:
+        if recorder is not None:
+            recorder.dump_to_log("Failed to parse response from TV")
         raise exceptions.ResponseError(
             "Failed to parse response from TV. Maybe feature not supported on this model"
         ) from err
 
 
+def _is_flat_content_list(content_list: str) -> bool:
+    """Check every entry is one brace pair, with no braces in string values."""
+    entries = content_list.count('"content_id"')
+    return content_list.count("{") == entries == content_list.count("}")
+
+
+def _project(
+    entry: Dict[str, Any], fields: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    if fields:
+        return {key: entry[key] for key in fields if key in entry}
+    return entry
+
+
+def iter_content_list(
+    content_list: str,
+    category: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of a get_content_list response one at a time.
+
+    Entries of other categories are skipped before they are decoded, and
+    fields limits the keys of each yielded entry.
+    """
+    category_pattern = (
+        re.compile(r'"category_id"\s*:\s*"{}"'.format(re.escape(category)))
+        if category
+        else None
+    )
+    pos = content_list.find("[") + 1
+    if pos == 0:
+        raise exceptions.ResponseError("Failed to parse content list from TV.")
+    try:
+        if category_pattern and _is_flat_content_list(content_list):
+            # every brace delimits an entry, so jump straight to the matching ones
+            for match in category_pattern.finditer(content_list, pos):
+                start = content_list.rfind("{", pos, match.start())
+                end = content_list.find("}", match.end()) + 1
+                entry = json.loads(content_list[start:end])
+                if entry.get("category_id") == category:
+                    yield _project(entry, fields)
+            return
+        while True:
+            pos = _SEPARATOR.match(content_list, pos).end()  # type:ignore[union-attr]
+            if pos >= len(content_list) or content_list[pos] == "]":
+                return
+            flat_object = _FLAT_OBJECT.match(content_list, pos)
+            if flat_object:
+                end = flat_object.end()
+                if category_pattern and not category_pattern.search(
+                    content_list, pos, end
+                ):
+                    pos = end
+                    continue
+                entry = json.loads(flat_object.group())
+            else:
+                entry, end = _JSON_DECODER.raw_decode(content_list, pos)
+            pos = end
+            if category and entry.get("category_id") != category:
+                continue
+            yield _project(entry, fields)
+    except json.JSONDecodeError as err:
+        raise exceptions.ResponseError(
+            "Failed to parse content list from TV."
+        ) from err
+
+
 def get_ssl_context() -> ssl.SSLContext:
     global _SSL_CONTEXT
     if not _SSL_CONTEXT:
@@ -0,0 +1,181 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, install samsungtvws[images]
+    Image = None  # type:ignore[assignment]
+
+_LOGGING = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+DEFAULT_MAX_DISTANCE = 10
+
+
+def dhash(image: Any, size: int = 8) -> int:
+    """Return the difference hash of an image as a size * size bit int.
+
+    image can be a PIL image, a file path or the image data as bytes.
+    Images opened here are closed again, a PIL image passed in is left
+    unchanged.
+    """
+    if Image is None:
+        raise ImportError("dhash needs Pillow, install samsungtvws[images]")
+    if isinstance(image, (bytes, bytearray)):
+        image = io.BytesIO(image)
+    if isinstance(image, (str, io.BytesIO)):
+        with Image.open(image) as opened:
+            opened.draft("L", (size * 8, size * 8))  # fast jpeg downscale on decode
+            return _dhash(opened, size)
+    return _dhash(image, size)
+
+
+def _dhash(image: Any, size: int) -> int:
+    pixels = image.convert("L").resize((size + 1, size)).tobytes()
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+class BKTree(Generic[_T]):
+    """Burkhard-Keller tree of hashes for nearest neighbour search by hamming distance."""
+
+    def __init__(self) -> None:
+        self._root: Optional[Tuple[int, List[_T], Dict[int, Any]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, item: _T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = (value, [item], {})
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, _T]]:
+        """Return (distance, item) for every item within max_distance, nearest first."""
+        found: List[Tuple[int, _T]] = []
+        nodes = [self._root] if self._root else []
+        while nodes:
+            node = nodes.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                found.extend((distance, item) for item in node[1])
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    nodes.append(child)
+        found.sort(key=lambda match: match[0])
+        return found
+
+
+def match_hashes(
+    sources: Dict[str, int],
+    targets: Dict[str, int],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> Dict[str, str]:
+    """Match each source key to the nearest unclaimed target key.
+
+    eg sources are local files and targets are content ids of TV thumbnails.
+    Matches are assigned closest first, so each target is used only once.
+    """
+    tree: BKTree[str] = BKTree()
+    for key, value in targets.items():
+        tree.add(value, key)
+    candidates = sorted(
+        (distance, source, target)
+        for source, value in sources.items()
+        for distance, target in tree.search(value, max_distance)
+    )
+    matches: Dict[str, str] = {}
+    claimed = set()
+    for _, source, target in candidates:
+        if source not in matches and target not in claimed:
+            matches[source] = target
+            claimed.add(target)
+    return matches
+
+
+class HashStore:
+    """Persistent cache of image hashes, so each image is only hashed once.
+
+    Files are re-hashed when their size or mtime changes, data passed as
+    bytes is re-hashed when its content digest changes.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._hashes: Dict[str, Tuple[str, int]] = {}
+        self._dirty = False
+        try:
+            with open(self.path) as store_file:
+                data = json.load(store_file)
+            if data.get("version") == self.VERSION:
+                self._hashes = {k: (v[0], v[1]) for k, v in data["hashes"].items()}
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _lookup(self, key: str, signature: str, image: Any) -> int:
+        cached = self._hashes.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        value = dhash(image)
+        self._hashes[key] = (signature, value)
+        self._dirty = True
+        return value
+
+    def hash_file(self, path: str) -> int:
+        stat = os.stat(path)
+        return self._lookup(
+            os.path.abspath(path), f"{stat.st_size}:{stat.st_mtime_ns}", path
+        )
+
+    def hash_bytes(self, key: str, data: Union[bytes, bytearray]) -> int:
+        signature = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return self._lookup(key, signature, data)
+
+    def discard(self, key: str) -> None:
+        if self._hashes.pop(key, None):
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as store_file:
+            json.dump({"version": self.VERSION, "hashes": self._hashes}, store_file)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,262 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# metric names, histograms are in seconds, bytes are counted per D2D transfer
+WS_CONNECT_SECONDS = "ws_connect_seconds"
+WS_CONNECTS = "ws_connects_total"
+WS_RECONNECTS = "ws_reconnects_total"
+WS_CONNECT_ERRORS = "ws_connect_errors_total"
+WS_COMMANDS = "ws_commands_total"
+ART_REQUEST_SECONDS = "art_request_seconds"
+ART_REQUEST_TIMEOUTS = "art_request_timeouts_total"
+REST_REQUEST_SECONDS = "rest_request_seconds"
+REST_REQUEST_ERRORS = "rest_request_errors_total"
+D2D_TRANSFER_SECONDS = "d2d_transfer_seconds"
+D2D_BYTES = "d2d_bytes_total"
+
+PREFIX = "samsungtvws_"
+QUANTILES = (0.5, 0.9, 0.99)
+
+Labels = Tuple[str, str, str]
+
+
+class Histogram:
+    """Log-linear histogram with a fixed relative error, like an HDR histogram.
+
+    Every power of two is split into SUB_BUCKETS linear buckets, so a
+    percentile is within 1 / SUB_BUCKETS of the recorded value, whatever
+    the range of values, and memory only grows with the range in use.
+    """
+
+    SUB_BUCKETS = 32
+
+    __slots__ = ("buckets", "count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= 0:
+            return -(2**31)
+        mantissa, exponent = math.frexp(value)
+        return exponent * self.SUB_BUCKETS + int(
+            (mantissa - 0.5) * 2 * self.SUB_BUCKETS
+        )
+
+    def _upper_bound(self, index: int) -> float:
+        if index == -(2**31):
+            return 0.0
+        exponent, sub_bucket = divmod(index, self.SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub_bucket + 1) / (2 * self.SUB_BUCKETS), exponent)
+
+    def record(self, value: float) -> None:
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, quantile: float) -> float:
+        """Return the value below which quantile of the recorded values fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._upper_bound(index), self.min), self.max)
+        return self.max
+
+
+class Metrics:
+    """Counters and histograms labelled by host, endpoint and request name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._connected: Set[Labels] = set()
+
+    def increment(self, name: str, labels: Labels, value: float = 1) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.record(value)
+
+    def connected(self, labels: Labels, seconds: float) -> None:
+        self.observe(WS_CONNECT_SECONDS, labels, seconds)
+        self.increment(WS_CONNECTS, labels)
+        with self._lock:
+            reconnect = labels in self._connected
+            self._connected.add(labels)
+        if reconnect:
+            self.increment(WS_RECONNECTS, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return a copy of all counters and histogram summaries."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": _label_dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": _label_dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "min": histogram.min if histogram.count else 0.0,
+                    "max": histogram.max,
+                    "quantiles": {q: histogram.percentile(q) for q in QUANTILES},
+                }
+                for (name, labels), histogram in sorted(
+                    self._histograms.items(), key=lambda item: item[0]
+                )
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+
+def _label_dict(labels: Labels) -> Dict[str, str]:
+    host, endpoint, request = labels
+    label_dict = {"host": host, "endpoint": endpoint, "request": request}
+    return {name: value for name, value in label_dict.items() if value}
+
+
+_metrics: Optional[Metrics] = None
+
+
+def enable(metrics: Optional[Metrics] = None) -> Metrics:
+    """Start collecting metrics for all clients in this process."""
+    global _metrics
+    _metrics = metrics or _metrics or Metrics()
+    return _metrics
+
+
+def disable() -> None:
+    global _metrics
+    _metrics = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    return _metrics
+
+
+# hooks called by the clients, each is a global lookup when metrics are disabled
+
+
+def start() -> Optional[float]:
+    """Return a start time to pass to observe(), or None if disabled."""
+    return None if _metrics is None else time.perf_counter()
+
+
+def observe(
+    name: str, started: Optional[float], host: str, endpoint: str = "", request: str = ""
+) -> None:
+    if started is not None and _metrics is not None:
+        _metrics.observe(
+            name, (host, endpoint, request), time.perf_counter() - started
+        )
+
+
+def increment(
+    name: str, host: str, endpoint: str = "", request: str = "", value: float = 1
+) -> None:
+    if _metrics is not None:
+        _metrics.increment(name, (host, endpoint, request), value)
+
+
+def connected(started: Optional[float], host: str, endpoint: str) -> None:
+    if started is not None and _metrics is not None:
+        _metrics.connected((host, endpoint, ""), time.perf_counter() - started)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def format_prometheus(
+    snapshot: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> str:
+    """Format a snapshot (by default of the enabled metrics) as Prometheus text.
+
+    Histograms are exposed as summaries with 0.5, 0.9 and 0.99 quantiles.
+    """
+    if snapshot is None:
+        snapshot = _metrics.snapshot() if _metrics is not None else {}
+    lines: List[str] = []
+    typed: Set[str] = set()
+
+    def type_line(name: str, kind: str) -> None:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for counter in snapshot.get("counters", []):
+        name = PREFIX + counter["name"]
+        type_line(name, "counter")
+        lines.append(f"{name}{_format_labels(counter['labels'])} {counter['value']}")
+    for histogram in snapshot.get("histograms", []):
+        name = PREFIX + histogram["name"]
+        type_line(name, "summary")
+        for quantile, value in histogram["quantiles"].items():
+            labels = dict(histogram["labels"], quantile=quantile)
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        labels_text = _format_labels(histogram["labels"])
+        lines.append(f"{name}_sum{labels_text} {histogram['sum']}")
+        lines.append(f"{name}_count{labels_text} {histogram['count']}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def throughput(
+    snapshot: Dict[str, List[Dict[str, Any]]]
+) -> Dict[Tuple[str, str], float]:
+    """Return D2D bytes per second for each (host, request) in a snapshot."""
+    seconds = {
+        (h["labels"].get("host", ""), h["labels"].get("request", "")): h["sum"]
+        for h in snapshot.get("histograms", [])
+        if h["name"] == D2D_TRANSFER_SECONDS
+    }
+    result: Dict[Tuple[str, str], float] = {}
+    for counter in snapshot.get("counters", []):
+        if counter["name"] != D2D_BYTES:
+            continue
+        key = (counter["labels"].get("host", ""), counter["labels"].get("request", ""))
+        if seconds.get(key):
+            result[key] = counter["value"] / seconds[key]
+    return result
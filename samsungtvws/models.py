@@ -0,0 +1,158 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import sys
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type, TypeVar
+
+FAVOURITES_CATEGORY = "MY-C0004"
+
+_R = TypeVar("_R", bound="_Record")
+
+_ABSENT = object()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    """Compact record built from a decoded art app dict.
+
+    Known keys are stored in slots, anything else the TV sends is kept in
+    ``extra`` so that ``to_dict()`` gives back the original dict. Absent
+    keys read as None, known keys the TV sent as null are listed in
+    ``_nulls`` to tell the two apart.
+    """
+
+    __slots__ = ("extra", "_nulls")
+
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    _INTERNED: ClassVar[Tuple[str, ...]] = ()
+
+    extra: Optional[Dict[str, Any]]
+    _nulls: Optional[Tuple[str, ...]]
+
+    def __init__(self, **kwargs: Any) -> None:
+        nulls = []
+        for field in self._FIELDS:
+            value = kwargs.pop(field, _ABSENT)
+            if value is None:
+                nulls.append(field)
+            elif value is _ABSENT:
+                value = None
+            elif field in self._INTERNED:
+                value = _intern(value)
+            setattr(self, field, value)
+        self.extra = kwargs or None
+        self._nulls = tuple(nulls) or None
+
+    @classmethod
+    def from_dict(cls: Type[_R], data: Dict[str, Any]) -> _R:
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        nulls = self._nulls or ()
+        data = {
+            field: getattr(self, field)
+            for field in self._FIELDS
+            if getattr(self, field) is not None or field in nulls
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={getattr(self, field)!r}"
+            for field in self._FIELDS
+            if getattr(self, field) is not None
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class ArtContent(_Record):
+    """An entry of the TV's content list, or the current artwork."""
+
+    __slots__ = (
+        "content_id",
+        "category_id",
+        "matte_id",
+        "portrait_matte_id",
+        "width",
+        "height",
+        "image_date",
+        "content_type",
+        "slideshow",
+        "is_favorite",
+    )
+
+    _FIELDS = __slots__
+    _INTERNED = (
+        "category_id",
+        "matte_id",
+        "portrait_matte_id",
+        "content_type",
+        "slideshow",
+        "is_favorite",
+    )
+
+    content_id: str
+    category_id: Optional[str]
+    matte_id: Optional[str]
+    portrait_matte_id: Optional[str]
+    width: Optional[int]
+    height: Optional[int]
+    image_date: Optional[str]
+    content_type: Optional[str]
+    slideshow: Optional[str]
+    is_favorite: Optional[str]
+
+    @property
+    def favourite(self) -> bool:
+        if self.is_favorite is not None:
+            return str(self.is_favorite).lower() in ("true", "on")
+        return self.category_id == FAVOURITES_CATEGORY
+
+
+class Matte(_Record):
+    """An entry of the TV's matte type list."""
+
+    __slots__ = ("matte_type",)
+
+    _FIELDS = __slots__
+    _INTERNED = __slots__
+
+    matte_type: str
+
+
+class MatteColor(_Record):
+    """An entry of the TV's matte colour list."""
+
+    __slots__ = ("color",)
+
+    _FIELDS = __slots__
+    _INTERNED = __slots__
+
+    color: str
+
+
+class PhotoFilter(_Record):
+    """An entry of the TV's photo filter list."""
+
+    __slots__ = ("filter_id", "filter_name")
+
+    _FIELDS = __slots__
+    _INTERNED = __slots__
+
+    filter_id: str
+    filter_name: Optional[str]
@@ -0,0 +1,196 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import hashlib
+import io
+import logging
+import os
+import shutil
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .sync import file_sha256
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional, install samsungtvws[images]
+    Image = None  # type:ignore[assignment]
+    ImageOps = None  # type:ignore[assignment]
+
+_LOGGING = logging.getLogger(__name__)
+
+FRAME_RESOLUTION = (3840, 2160)
+DEFAULT_QUALITY = 90
+MIN_QUALITY = 50
+QUALITY_STEP = 10
+EXIF_ORIENTATION = 0x0112
+
+
+def prepare_image(
+    source: str,
+    output: str,
+    max_size: Tuple[int, int] = FRAME_RESOLUTION,
+    quality: int = DEFAULT_QUALITY,
+    max_bytes: Optional[int] = None,
+) -> bool:
+    """Write source as a jpeg that fits in max_size to output.
+
+    The image is rotated upright from its EXIF orientation, and fitted to
+    max_size in either orientation, so portrait images keep their detail.
+    If max_bytes is set, quality is lowered until the jpeg fits. Jpegs that
+    need no changes are copied as is. Returns True if the image was
+    re-encoded. This runs in worker processes, so it only takes picklable
+    arguments and does its own file I/O.
+    """
+    if Image is None:
+        raise ImportError("prepare_image needs Pillow, install samsungtvws[images]")
+    with Image.open(source) as source_image:
+        image: "Image.Image" = source_image
+        orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+        box = (max(max_size), min(max_size))
+        if image.width < image.height:
+            box = box[::-1]
+        if (
+            image.format == "JPEG"
+            and orientation == 1
+            and image.width <= box[0]
+            and image.height <= box[1]
+            and (max_bytes is None or os.path.getsize(source) <= max_bytes)
+        ):
+            shutil.copyfile(source, output)
+            return False
+        image.thumbnail(box)  # drafts jpegs, so only a fraction is decoded
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        while True:
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=quality, optimize=True)
+            if max_bytes is None or buffer.tell() <= max_bytes or quality <= MIN_QUALITY:
+                break
+            quality = max(MIN_QUALITY, quality - QUALITY_STEP)
+    with open(output, "wb") as output_file:
+        output_file.write(buffer.getbuffer())
+    return True
+
+
+class ImagePreprocessor:
+    """Shrink images to the TV's native resolution before upload.
+
+    Images are converted in a process pool, and the jpeg output is cached in
+    ``directory`` by source sha256 and settings, so a file is only
+    re-encoded when its content or the settings change.
+
+    ``prepare()`` returns the path of the file to upload, pass it to
+    ``SamsungTVAsyncArt.upload()``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: Tuple[int, int] = FRAME_RESOLUTION,
+        quality: int = DEFAULT_QUALITY,
+        max_bytes: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self._executor = executor
+        self._own_executor = executor is None
+        self._pending: Dict[str, "asyncio.Future[str]"] = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _output_path(self, sha256: str) -> str:
+        settings = f"{sha256}:{self.max_size}:{self.quality}:{self.max_bytes}"
+        key = hashlib.sha256(settings.encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.jpg")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    async def prepare(self, path: str, sha256: Optional[str] = None) -> str:
+        """Return the path of the preprocessed copy of path.
+
+        sha256 of the source can be passed in if it is already known.
+        """
+        loop = asyncio.get_running_loop()
+        if sha256 is None:
+            sha256 = await loop.run_in_executor(None, file_sha256, path)
+        output = self._output_path(sha256)
+        if os.path.isfile(output):
+            return output
+        pending = self._pending.get(output)
+        if pending is None:
+            pending = self._pending[output] = asyncio.ensure_future(
+                self._convert(path, output)
+            )
+            pending.add_done_callback(lambda _: self._pending.pop(output, None))
+        return await asyncio.shield(pending)
+
+    async def _convert(self, path: str, output: str) -> str:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        tmp_path = f"{output}.{os.getpid()}.tmp"
+        try:
+            converted = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                prepare_image,
+                path,
+                tmp_path,
+                self.max_size,
+                self.quality,
+                self.max_bytes,
+            )
+            os.replace(tmp_path, output)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        _LOGGING.debug(
+            "%s %s as %s", "Converted" if converted else "Copied", path, output
+        )
+        return output
+
+    async def prepare_many(
+        self, paths: Sequence[str]
+    ) -> Tuple[Dict[str, str], Dict[str, Exception]]:
+        """Preprocess paths in parallel.
+
+        Returns the output path of each source path, and the error of each
+        path that could not be converted.
+        """
+        results = await asyncio.gather(
+            *(self.prepare(path) for path in paths), return_exceptions=True
+        )
+        outputs: Dict[str, str] = {}
+        failures: Dict[str, Exception] = {}
+        # gather returns one result per path, in order
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                failures[paths[index]] = result
+            elif isinstance(result, str):
+                outputs[paths[index]] = result
+            else:
+                raise result
+        return outputs, failures
+
+    def close(self) -> None:
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self) -> "ImagePreprocessor":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,306 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import sys
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Type
+
+from aiohttp import web
+
+from . import exceptions
+from .async_art import SamsungTVAsyncArt
+from .async_tv import SamsungTV
+from .fleet import SamsungTVFleet
+from .proxy_client import DEFAULT_HOST, DEFAULT_PORT, ProxyClient
+from .remote import SendRemoteKey
+
+_LOGGING = logging.getLogger(__name__)
+
+# art methods that can be called through the proxy, their results are json
+ART_METHODS = frozenset(
+    {
+        "available",
+        "change_matte",
+        "delete",
+        "delete_list",
+        "get_api_version",
+        "get_artmode",
+        "get_artmode_settings",
+        "get_brightness",
+        "get_color_temperature",
+        "get_current",
+        "get_matte_list",
+        "get_photo_filter_list",
+        "get_slideshow_status",
+        "select_image",
+        "set_artmode",
+        "set_brightness",
+        "set_color_temperature",
+        "set_favourite",
+        "set_photo_filter",
+        "set_slideshow_status",
+        "supported",
+        "on",
+    }
+)
+
+
+def _to_json(value: Any) -> Any:
+    """json.dumps default, records from as_records=True become their dicts."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json_response(result: Any) -> web.Response:
+    return web.json_response(
+        {"result": result}, dumps=lambda data: json.dumps(data, default=_to_json)
+    )
+
+
+def _http_error(
+    error_class: Type[web.HTTPException], error: str, message: str
+) -> web.HTTPException:
+    return error_class(
+        text=json.dumps({"error": error, "message": message}),
+        content_type="application/json",
+    )
+
+
+class SamsungTVProxy:
+    """Local JSON API in front of a SamsungTVFleet.
+
+    The fleet keeps the remote and art websockets of every TV open between
+    requests, so a key press or art change only costs a local request on an
+    open connection. Listens on a Unix socket if path is set, otherwise on
+    host and port.
+
+    Routes, all answering ``{"result": ...}`` or ``{"error": ..., "message": ...}``,
+    with status 400 for bad arguments and 502 for errors from the TV:
+
+    - ``GET /tvs``
+    - ``GET /tvs/{tv}/device_info``
+    - ``POST /tvs/{tv}/key`` with ``{"key": "KEY_POWER"}``
+    - ``POST /tvs/{tv}/art/{method}`` with the method's keyword arguments
+    """
+
+    def __init__(
+        self,
+        fleet: SamsungTVFleet,
+        path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        self.fleet = fleet
+        self.path = path
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._errors])
+        app.add_routes(
+            [
+                web.get("/tvs", self._list),
+                web.get("/tvs/{tv}/device_info", self._device_info),
+                web.post("/tvs/{tv}/key", self._send_key),
+                web.post("/tvs/{tv}/art/{method}", self._art),
+            ]
+        )
+        return app
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site: web.BaseSite
+        if self.path:
+            site = web.UnixSite(self._runner, self.path)
+        else:
+            site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        _LOGGING.info("Proxy listening on %s", site.name)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        await self.fleet.close()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    @web.middleware
+    async def _errors(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        try:
+            response: web.StreamResponse = await handler(request)
+            return response
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            _LOGGING.exception("%s failed", request.path)
+            return web.json_response(
+                {"error": type(e).__name__, "message": str(e)}, status=500
+            )
+
+    @staticmethod
+    async def _arguments(request: web.Request) -> Dict[str, Any]:
+        if not request.can_read_body:
+            return {}
+        try:
+            arguments = await request.json()
+        except ValueError as e:
+            raise _http_error(web.HTTPBadRequest, "ValueError", str(e)) from e
+        if not isinstance(arguments, dict):
+            raise _http_error(
+                web.HTTPBadRequest, "ValueError", "Request body must be a json object"
+            )
+        return arguments
+
+    async def _run(
+        self, request: web.Request, func: Callable[[SamsungTV], Awaitable[Any]]
+    ) -> Any:
+        """Run func with the request's TV, errors it raises answer 502."""
+        try:
+            return await self.fleet.run(request.match_info["tv"], func)
+        except Exception as e:
+            _LOGGING.debug("%s failed: %s", request.path, e)
+            raise _http_error(web.HTTPBadGateway, type(e).__name__, str(e)) from e
+
+    async def _list(self, request: web.Request) -> web.Response:
+        return _json_response(list(self.fleet.hosts))
+
+    async def _device_info(self, request: web.Request) -> web.Response:
+        # the power state changes, so the device info is never cached
+        result = await self._run(request, lambda tv: tv.device_info(refresh=True))
+        return _json_response(result)
+
+    async def _send_key(self, request: web.Request) -> web.Response:
+        key = (await self._arguments(request)).get("key")
+        if not isinstance(key, str):
+            raise _http_error(web.HTTPBadRequest, "ValueError", "Missing key")
+        await self._run(
+            request, lambda tv: tv.remote.send_command(SendRemoteKey.click(key))
+        )
+        return _json_response(None)
+
+    async def _art(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        if method not in ART_METHODS:
+            raise _http_error(
+                web.HTTPNotFound, "NotFound", f"Unknown art method {method}"
+            )
+        arguments = await self._arguments(request)
+        try:
+            inspect.signature(getattr(SamsungTVAsyncArt, method)).bind(
+                None, **arguments
+            )
+        except TypeError as e:
+            raise _http_error(web.HTTPBadRequest, "TypeError", str(e)) from e
+        result = await self._run(
+            request, lambda tv: getattr(tv.art, method)(**arguments)
+        )
+        return _json_response(result)
+
+
+def _parse_arguments(items: Sequence[str]) -> Dict[str, Any]:
+    """Turn name=value pairs into keyword arguments, values are json if they parse."""
+    arguments: Dict[str, Any] = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected name=value, got {item}")
+        try:
+            arguments[name] = json.loads(value)
+        except ValueError:
+            arguments[name] = value
+    return arguments
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="samsungtvws-proxy",
+        description="Keep TV connections open and send commands through them",
+    )
+    parser.add_argument("--socket", help="Unix socket path of the proxy")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the proxy")
+    serve.add_argument("tvs", nargs="*", help="TVs to connect to at start")
+    serve.add_argument("--token-dir", help="directory holding a token file per TV")
+    serve.add_argument("--tv-port", type=int, default=8002)
+    serve.add_argument("--idle-timeout", type=float, default=3600)
+    serve.add_argument("-v", "--verbose", action="store_true")
+
+    key = commands.add_parser("key", help="send a remote key")
+    key.add_argument("tv")
+    key.add_argument("key")
+
+    art = commands.add_parser("art", help="call an art method")
+    art.add_argument("tv")
+    art.add_argument("method", choices=sorted(ART_METHODS))
+    art.add_argument("arguments", nargs="*", metavar="name=value")
+
+    info = commands.add_parser("device-info", help="show the TV's device info")
+    info.add_argument("tv")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+        async def serve_proxy() -> None:
+            fleet = SamsungTVFleet(
+                token_dir=args.token_dir,
+                port=args.tv_port,
+                idle_timeout=args.idle_timeout,
+            )
+            for tv in args.tvs:
+                fleet.add(tv)
+            await SamsungTVProxy(
+                fleet, path=args.socket, host=args.host, port=args.port
+            ).serve_forever()
+
+        try:
+            asyncio.run(serve_proxy())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    client = ProxyClient(path=args.socket, host=args.host, port=args.port)
+    result: Any = None
+    try:
+        if args.command == "key":
+            client.send_key(args.tv, args.key)
+        elif args.command == "art":
+            try:
+                arguments = _parse_arguments(args.arguments)
+            except argparse.ArgumentTypeError as e:
+                parser.error(str(e))
+            result = client.art(args.tv, args.method, **arguments)
+        else:
+            result = client.device_info(args.tv)
+    except (exceptions.ConnectionFailure, exceptions.HttpApiError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    if result is not None:
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import http.client
+import json
+import socket
+from typing import Any, Dict, List, Optional
+
+from . import exceptions
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class ProxyClient:
+    """Blocking client for SamsungTVProxy, for scripts that run one command and exit."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: Optional[float] = 30,
+    ) -> None:
+        self.path = path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.path:
+            return _UnixHTTPConnection(self.path, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self, method: str, url: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        connection = self._connection()
+        try:
+            body = None if arguments is None else json.dumps(arguments)
+            headers = {} if body is None else {"Content-Type": "application/json"}
+            connection.request(method, url, body=body, headers=headers)
+            response = connection.getresponse()
+            raw = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise exceptions.ConnectionFailure(e) from e
+        finally:
+            connection.close()
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = {"error": response.reason, "message": raw.decode(errors="replace")}
+        if response.status != 200:
+            raise exceptions.HttpApiError(
+                "{}: {}".format(data.get("error"), data.get("message"))
+            )
+        return data.get("result")
+
+    def tvs(self) -> List[str]:
+        result: List[str] = self.request("GET", "/tvs")
+        return result
+
+    def device_info(self, tv: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = self.request("GET", f"/tvs/{tv}/device_info")
+        return result
+
+    def send_key(self, tv: str, key: str) -> None:
+        self.request("POST", f"/tvs/{tv}/key", {"key": key})
+
+    def art(self, tv: str, method: str, **kwargs: Any) -> Any:
+        return self.request("POST", f"/tvs/{tv}/art/{method}", kwargs)
@@ -0,0 +1,231 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .art_batch import ArtOperation, Outcome
+from .art_catalog import MY_PHOTOS_CATEGORY, ArtCatalog
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+
+class ArtState(NamedTuple):
+    """Desired state of one piece of art, None means leave as is."""
+
+    matte_id: Optional[str] = None
+    portrait_matte_id: Optional[str] = None
+    favourite: Optional[bool] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ArtState":
+        return cls(
+            data.get("matte_id"), data.get("portrait_matte_id"), data.get("favourite")
+        )
+
+
+class SlideshowState(NamedTuple):
+    """Desired slideshow settings, as for ``set_slideshow_status()``.
+
+    duration is in minutes, 0 turns the slideshow off. category is 2 for
+    My Photos or 4 for favourites.
+    """
+
+    duration: int = 0
+    shuffle: bool = True
+    category: int = 2
+
+    def matches(self, status: Dict[str, Any]) -> bool:
+        value = str(self.duration) if self.duration > 0 else "off"
+        if str(status.get("value")) != value:
+            return False
+        if self.duration <= 0:
+            return True
+        return status.get("category_id") == f"MY-C000{self.category}" and status.get(
+            "type"
+        ) == ("shuffleslideshow" if self.shuffle else "slideshow")
+
+
+class DesiredState(NamedTuple):
+    """What should be on a TV.
+
+    art maps content ids to their desired state. If exclusive is set, My
+    Photos content that is not in art is deleted. slideshow is left as is
+    if None.
+    """
+
+    art: Dict[str, ArtState]
+    exclusive: bool = False
+    slideshow: Optional[SlideshowState] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DesiredState":
+        """Build the desired state from a document like
+
+        {"art": {"MY_F0001": {"matte_id": "shadowbox_polar", "favourite": true}},
+         "exclusive": true,
+         "slideshow": {"duration": 15, "shuffle": true, "category": 2}}
+        """
+        slideshow = data.get("slideshow")
+        return cls(
+            {
+                content_id: ArtState.from_dict(state or {})
+                for content_id, state in data.get("art", {}).items()
+            },
+            bool(data.get("exclusive", False)),
+            SlideshowState(**slideshow) if slideshow is not None else None,
+        )
+
+
+class Plan(NamedTuple):
+    """Minimal changes that bring a TV to the desired state.
+
+    missing are desired content ids that are not on the TV, skipped maps
+    content ids to the reason a change for them can't be made.
+    """
+
+    operations: List[ArtOperation]
+    slideshow: Optional[SlideshowState]
+    missing: List[str]
+    skipped: Dict[str, str]
+
+    def __bool__(self) -> bool:
+        return bool(self.operations or self.slideshow)
+
+
+class Reconciler:
+    """Bring the art on a TV to a desired state with as few requests as possible.
+
+    Current state is read from the TV's catalog if enabled, otherwise with
+    one ``available()`` call. The slideshow status is only read if a
+    slideshow is desired, and the matte list only once per reconciler, so a
+    re-run with nothing to change costs a single content list read.
+    """
+
+    def __init__(self, tv: "SamsungTVAsyncArt", concurrency: int = 8) -> None:
+        self.tv = tv
+        self.concurrency = concurrency
+        self._mattes: Optional[Tuple[Set[str], Set[str]]] = None
+
+    async def _current_catalog(self) -> ArtCatalog:
+        catalog: Optional[ArtCatalog] = getattr(self.tv, "catalog", None)
+        if catalog is not None and catalog.loaded:
+            return catalog
+        catalog = ArtCatalog(self.tv, reconcile_interval=0)
+        catalog.replace(await self.tv.available(timeout=10))
+        return catalog
+
+    async def _matte_names(self) -> Tuple[Set[str], Set[str]]:
+        if self._mattes is None:
+            mattes, colours = await self.tv.get_matte_list(include_colour=True)
+            self._mattes = (
+                {matte["matte_type"] for matte in mattes},
+                {colour["color"] for colour in colours},
+            )
+        return self._mattes
+
+    async def _valid_matte(self, matte_id: str) -> bool:
+        if matte_id == "none":
+            return True
+        matte_types, colours = await self._matte_names()
+        matte_type, _, colour = matte_id.partition("_")
+        return matte_type in matte_types and colour in colours
+
+    async def plan(self, desired: DesiredState) -> Plan:
+        """Compare the TV with the desired state, without changing anything."""
+        catalog = await self._current_catalog()
+        operations: List[ArtOperation] = []
+        missing: List[str] = []
+        skipped: Dict[str, str] = {}
+        for content_id, state in desired.art.items():
+            entry = catalog.get(content_id)
+            if entry is None:
+                missing.append(content_id)
+                continue
+            if (
+                state.matte_id is not None
+                and state.matte_id != entry.get("matte_id")
+            ) or (
+                state.portrait_matte_id is not None
+                and state.portrait_matte_id != entry.get("portrait_matte_id")
+            ):
+                matte_id = state.matte_id or entry.get("matte_id") or "none"
+                if await self._valid_matte(matte_id):
+                    operations.append(
+                        ArtOperation.change_matte(
+                            content_id, matte_id, state.portrait_matte_id
+                        )
+                    )
+                else:
+                    skipped[content_id] = f"unknown matte {matte_id}"
+            if (
+                state.favourite is not None
+                and state.favourite != catalog.is_favourite(content_id)
+            ):
+                operations.append(
+                    ArtOperation.set_favourite(
+                        content_id, "on" if state.favourite else "off"
+                    )
+                )
+        if desired.exclusive:
+            operations.extend(
+                ArtOperation.delete(content_id)
+                for content_id in sorted(catalog.content_ids(MY_PHOTOS_CATEGORY))
+                if content_id not in desired.art
+            )
+        slideshow = desired.slideshow
+        if slideshow is not None and slideshow.matches(
+            await self.tv.get_slideshow_status()
+        ):
+            slideshow = None
+        return Plan(operations, slideshow, sorted(missing), skipped)
+
+    async def apply(self, plan: Plan) -> List[Outcome]:
+        """Execute a plan, returning one outcome per operation."""
+
+        async def set_slideshow() -> None:
+            if plan.slideshow is not None:
+                await self.tv.set_slideshow_status(
+                    plan.slideshow.duration,
+                    plan.slideshow.shuffle,
+                    plan.slideshow.category,
+                )
+
+        outcomes: List[Outcome] = []
+        if plan.operations:
+            outcomes, _ = await asyncio.gather(
+                self.tv.run_batch(plan.operations, concurrency=self.concurrency),
+                set_slideshow(),
+            )
+        else:
+            await set_slideshow()
+        return outcomes
+
+    async def reconcile(
+        self, desired: DesiredState, dry_run: bool = False
+    ) -> Tuple[Plan, List[Outcome]]:
+        """Plan the changes needed for the desired state, and apply them unless dry_run."""
+        plan = await self.plan(desired)
+        if plan.missing:
+            _LOGGING.warning("Content not on TV: %s", plan.missing)
+        if dry_run or not plan:
+            return plan, []
+        return plan, await self.apply(plan)
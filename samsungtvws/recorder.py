@@ -0,0 +1,262 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from collections import deque
+from datetime import datetime
+import gzip
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+import zlib
+
+_LOGGING = logging.getLogger(__name__)
+
+INBOUND = "<"
+OUTBOUND = ">"
+# D2D socket transfers, recorded as their header and size
+D2D_INBOUND = "D<"
+D2D_OUTBOUND = "D>"
+
+CAPTURE_FORMAT = "samsungtvws-capture"
+
+Frame = Tuple[float, str, int, Union[str, bytes]]
+
+
+class FlightRecorder:
+    """The last frames sent and received on one connection.
+
+    Frames are kept in a ring buffer of size entries, with their time,
+    direction and size. Payloads are cut to max_payload characters, or
+    with compress set, kept whole and zlib compressed. Recording a frame is
+    a slice and a deque append, cheap enough to leave on. dump() returns
+    the frames, and the clients call dump_to_log() when a request times
+    out or the TV returns an error, unless on_dump is set, which is then
+    called with the reason and the frames instead. While a TrafficCapture
+    is running, new recorders also write every frame to it.
+    """
+
+    __slots__ = (
+        "name",
+        "max_payload",
+        "compress",
+        "on_dump",
+        "frames",
+        "capture",
+        "connection",
+    )
+
+    def __init__(
+        self,
+        size: int = 100,
+        max_payload: int = 1024,
+        compress: bool = False,
+        name: str = "",
+        on_dump: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+    ) -> None:
+        self.name = name
+        self.max_payload = max_payload
+        self.compress = compress
+        self.on_dump = on_dump
+        self.frames: Deque[Frame] = deque(maxlen=size)
+        self.capture: Optional[TrafficCapture] = None
+        self.connection = 0
+
+    def record(self, direction: str, payload: Union[str, bytes]) -> None:
+        if self.compress:
+            data = payload.encode() if isinstance(payload, str) else payload
+            self.frames.append(
+                (time.time(), direction, len(payload), zlib.compress(data, 1))
+            )
+        else:
+            self.frames.append(
+                (time.time(), direction, len(payload), payload[: self.max_payload])
+            )
+        if self.capture is not None:
+            self.capture.write(self.connection, direction, payload)
+
+    def record_transfer(
+        self, direction: str, channel: str, header: str, size: int
+    ) -> None:
+        """Record a D2D transfer of size bytes, with its header, on channel (ip:port)."""
+        self.frames.append(
+            (time.time(), direction, size, header[: self.max_payload])
+        )
+        if self.capture is not None:
+            self.capture.write_transfer(
+                self.connection, direction, channel, header, size
+            )
+
+    def clear(self) -> None:
+        self.frames.clear()
+
+    def dump(self) -> List[Dict[str, Any]]:
+        """Return the recorded frames, oldest first."""
+        frames = []
+        for timestamp, direction, size, stored in list(self.frames):
+            if self.compress:
+                payload: Union[str, bytes] = zlib.decompress(stored)  # type:ignore[arg-type]
+                try:
+                    payload = payload.decode()  # type:ignore[union-attr]
+                except UnicodeDecodeError:
+                    pass
+            else:
+                payload = stored
+            frames.append(
+                {
+                    "time": timestamp,
+                    "direction": direction,
+                    "size": size,
+                    "payload": payload,
+                    "truncated": len(payload) < size,
+                }
+            )
+        return frames
+
+    def format(self) -> str:
+        lines = []
+        for frame in self.dump():
+            payload = frame["payload"]
+            lines.append(
+                "{} {} {:>7} {}{}".format(
+                    datetime.fromtimestamp(frame["time"]).isoformat(timespec="milliseconds"),
+                    frame["direction"],
+                    frame["size"],
+                    payload if isinstance(payload, str) else payload.hex(),
+                    "..." if frame["truncated"] else "",
+                )
+            )
+        return "\n".join(lines)
+
+    def dump_to_log(self, reason: str) -> None:
+        """Hand the frames to on_dump, or log them as a warning."""
+        if not self.frames:
+            return
+        if self.on_dump is not None:
+            self.on_dump(reason, self.dump())
+            return
+        _LOGGING.warning(
+            "%s, last %d frames of %s:\n%s",
+            reason,
+            len(self.frames),
+            self.name,
+            self.format(),
+        )
+
+
+class TrafficCapture:
+    """Every frame of every connection, with its time, written to a file.
+
+    The file is gzip compressed json lines. The first line describes the
+    capture, then each line is one of
+
+    - ``[seconds, connection, "open", host, endpoint]``
+    - ``[seconds, connection, direction, payload]`` for a websocket frame
+    - ``[seconds, connection, "D<" or "D>", channel, header, size]`` for a
+      D2D transfer, whose data is not kept
+
+    seconds counts from the start of the capture. Connections are numbered
+    in the order their clients were created. See samsungtvws.replay.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = gzip.open(path, "wt")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._connections = itertools.count(1)
+        self._write_line(
+            {"format": CAPTURE_FORMAT, "version": 1, "started": time.time()}
+        )
+
+    def _write_line(self, line: Any) -> None:
+        data = json.dumps(line, separators=(",", ":"))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(data + "\n")
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._started, 6)
+
+    def open_connection(self, host: str, endpoint: str) -> int:
+        connection = next(self._connections)
+        self._write_line([self._elapsed(), connection, "open", host, endpoint])
+        return connection
+
+    def write(
+        self, connection: int, direction: str, payload: Union[str, bytes]
+    ) -> None:
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", "replace")
+        self._write_line([self._elapsed(), connection, direction, payload])
+
+    def write_transfer(
+        self, connection: int, direction: str, channel: str, header: str, size: int
+    ) -> None:
+        self._write_line(
+            [self._elapsed(), connection, direction, channel, header, size]
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_defaults: Optional[Dict[str, Any]] = None
+_capture: Optional[TrafficCapture] = None
+
+
+def enable(
+    size: int = 100,
+    max_payload: int = 1024,
+    compress: bool = False,
+    on_dump: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+) -> None:
+    """Give every connection created from now on its own FlightRecorder."""
+    global _defaults
+    _defaults = {
+        "size": size,
+        "max_payload": max_payload,
+        "compress": compress,
+        "on_dump": on_dump,
+    }
+
+
+def disable() -> None:
+    global _defaults
+    _defaults = None
+
+
+def start_capture(path: str) -> TrafficCapture:
+    """Write the traffic of every connection created from now on to path."""
+    global _capture
+    stop_capture()
+    _capture = TrafficCapture(path)
+    return _capture
+
+
+def stop_capture() -> None:
+    global _capture
+    if _capture is not None:
+        _capture.close()
+        _capture = None
+
+
+def create(host: str, endpoint: str) -> Optional[FlightRecorder]:
+    """Return a recorder for a new connection, or None if not enabled."""
+    if _defaults is None and _capture is None:
+        return None
+    flight_recorder = FlightRecorder(
+        name=f"{host} {endpoint}", **(_defaults if _defaults is not None else {"size": 0})
+    )
+    if _capture is not None:
+        flight_recorder.capture = _capture
+        flight_recorder.connection = _capture.open_connection(host, endpoint)
+    return flight_recorder
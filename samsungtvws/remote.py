@@ -239,6 +239,7 @@ class SamsungTVWS(connection.SamsungTVWSConnection):
         )
         self._rest_api: Optional[rest.SamsungTVRest] = None
         self._app_list: Optional[List[Dict[str, Any]]] = None
+        self._art: Optional[art.SamsungTVArt] = None
         year = self._get_rest_api().get_model_year()
         if not self.token:
             self.token = self._get_token()
@@ -326,7 +327,9 @@ class SamsungTVWS(connection.SamsungTVWSConnection):
                 attempts_left -= 1
         else:
             assert self.connection
-            response = helper.process_api_response(self.connection.recv())
+            response = helper.process_api_response(
+                self.connection.recv(), self.recorder
+            )
             if response.get("event") == ED_INSTALLED_APP_EVENT:
                 self._app_list = parse_installed_app(response)
             else:
@@ -361,12 +364,28 @@ class SamsungTVWS(connection.SamsungTVWSConnection):
         return shortcuts.SamsungTVShortcuts(self)
 
     def art(self, timeout=5) -> art.SamsungTVArt:
-        return art.SamsungTVArt(
-            self.host,
-            token=self.token,
-            token_file=self.token_file,
-            port=self.port,
-            timeout=timeout,
-            key_press_delay=self.key_press_delay,
-            name=self.name,
-        )
+        """Return the art channel shared by this remote.
+
+        The channel connects on its first request and stays open, so
+        repeated calls don't each pay for a new websocket handshake. It is
+        reference counted, closing it only disconnects once every caller
+        closed it. Closing the remote always disconnects it.
+        """
+        if self._art is None:
+            self._art = art.SamsungTVArt(
+                self.host,
+                token=self.token,
+                token_file=self.token_file,
+                port=self.port,
+                timeout=timeout,
+                key_press_delay=self.key_press_delay,
+                name=self.name,
+            )
+        elif self._art.connection is None:
+            self._art.timeout = None if timeout == 0 else timeout
+        return self._art.acquire()
+
+    def close(self) -> None:
+        if self._art is not None:
+            self._art.close(force=True)
+        super().close()
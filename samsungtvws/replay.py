@@ -0,0 +1,547 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import argparse
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import re
+import ssl
+import sys
+import threading
+import time
+from types import TracebackType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp import WSMsgType, web
+
+from .async_art import ART_ENDPOINT, SamsungTVAsyncArt
+from .async_remote import SamsungTVWSAsyncRemote
+from .metrics import QUANTILES, Histogram
+from .recorder import CAPTURE_FORMAT, D2D_INBOUND, D2D_OUTBOUND, INBOUND, OUTBOUND
+
+_LOGGING = logging.getLogger(__name__)
+
+REMOTE_ENDPOINT = "samsung.remote.control"
+
+# art requests whose response is matched on an event instead of the request id
+WAIT_FOR_EVENT = {"change_favorite": "favorite_changed"}
+
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_CHUNK_SIZE = 64 * 1024
+_D2D_TIMEOUT = 10
+
+
+class CapturedConnection:
+    """The frames of one client connection in a capture.
+
+    frames are ``(seconds, direction, payload)`` for websocket frames and
+    ``(seconds, direction, channel, header, size)`` for D2D transfers.
+    """
+
+    __slots__ = ("id", "host", "endpoint", "frames")
+
+    def __init__(self, id: int, host: str, endpoint: str) -> None:
+        self.id = id
+        self.host = host
+        self.endpoint = endpoint
+        self.frames: List[Tuple[Any, ...]] = []
+
+    def requests(self) -> Iterator[Tuple[float, str]]:
+        """Yield the time and payload of each frame the client sent."""
+        for frame in self.frames:
+            if frame[1] == OUTBOUND:
+                yield frame[0], frame[2]
+
+
+def load_capture(path: str) -> List[CapturedConnection]:
+    """Read a capture written by recorder.start_capture()."""
+    connections: Dict[int, CapturedConnection] = {}
+    with gzip.open(path, "rt") as file:
+        info = json.loads(file.readline())
+        if info.get("format") != CAPTURE_FORMAT:
+            raise ValueError("{} is not a traffic capture".format(path))
+        for line in file:
+            seconds, connection, direction, *rest = json.loads(line)
+            if direction == "open":
+                connections[connection] = CapturedConnection(connection, *rest)
+            elif connection in connections:
+                connections[connection].frames.append((seconds, direction, *rest))
+    return [c for c in connections.values() if c.frames]
+
+
+def _request_key(payload: str) -> Tuple[str, List[str]]:
+    """Return the name a sent frame is matched on, and the ids of the request."""
+    message = json.loads(payload)
+    params = message.get("params", {})
+    if params.get("event") == "art_app_request":
+        data = json.loads(params["data"])
+        ids = [data[key] for key in ("id", "request_id") if data.get(key)]
+        return "art:" + data.get("request", ""), ids
+    return "{}:{}".format(
+        message.get("method"), params.get("event", params.get("DataOfCmd", ""))
+    ), []
+
+
+def _art_data(payload: str) -> Dict[str, Any]:
+    """Return the decoded art sub event of a received frame, or {}."""
+    message = json.loads(payload)
+    data = message.get("data")
+    if isinstance(data, str) and data.startswith("{"):
+        return json.loads(data)  # type:ignore[no-any-return]
+    return {}
+
+
+class _Exchange:
+    """A frame the client sent, and what the TV did in answer."""
+
+    __slots__ = ("time", "payload", "items")
+
+    def __init__(self, time: float, payload: str) -> None:
+        self.time = time
+        self.payload = payload
+        self.items: List[Tuple[Any, ...]] = []
+
+
+class _Script:
+    """A captured connection split into a greeting and exchanges by request name.
+
+    Received frames belong to the request whose id they carry, or else to
+    the last request sent, and D2D transfers to the request whose response
+    opened their channel.
+    """
+
+    def __init__(self, connection: CapturedConnection) -> None:
+        self.endpoint = connection.endpoint
+        self.greeting: List[Tuple[float, str]] = []
+        self.exchanges: Dict[str, List[_Exchange]] = {}
+        by_id: Dict[str, _Exchange] = {}
+        by_channel: Dict[str, _Exchange] = {}
+        current: Optional[_Exchange] = None
+        for frame in connection.frames:
+            direction = frame[1]
+            if direction == OUTBOUND:
+                key, ids = _request_key(frame[2])
+                current = _Exchange(frame[0], frame[2])
+                self.exchanges.setdefault(key, []).append(current)
+                by_id.update(dict.fromkeys(ids, current))
+            elif direction == INBOUND:
+                data = _art_data(frame[2])
+                exchange = by_id.get(data.get("request_id", data.get("id", ""))) or current
+                if exchange is None:
+                    self.greeting.append((frame[0], frame[2]))
+                    continue
+                exchange.items.append(frame)
+                if "conn_info" in data:
+                    conn_info = json.loads(data["conn_info"])
+                    by_channel["{}:{}".format(conn_info["ip"], conn_info["port"])] = exchange
+            elif direction in (D2D_INBOUND, D2D_OUTBOUND):
+                exchange = by_channel.get(frame[2]) or current
+                if exchange is not None:
+                    exchange.items.append(frame)
+
+
+class ReplayServer:
+    """Serves captured sessions to clients, in place of the TVs they were captured from.
+
+    Each websocket connection to a channel is served the next captured
+    connection to that endpoint, in turn. Its greeting is sent first, then
+    each frame the client sends is answered with the frames the TV sent in
+    answer to the captured frame with the same request name, the next one
+    not yet used or else the last one. Request ids are rewritten to the
+    client's, and D2D transfers are served on new local sockets with
+    zero-filled data of the captured size. Delays between frames are the
+    captured ones divided by speed.
+    """
+
+    def __init__(
+        self,
+        connections: Sequence[CapturedConnection],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        speed: float = 1.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.ssl_context = ssl_context
+        scripts: Dict[str, List[_Script]] = {}
+        for connection in connections:
+            scripts.setdefault(connection.endpoint, []).append(_Script(connection))
+        self._scripts = {
+            endpoint: itertools.cycle(values) for endpoint, values in scripts.items()
+        }
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: "set[asyncio.Task[None]]" = set()
+
+    async def __aenter__(self) -> "ReplayServer":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.add_routes([web.get("/api/v2/channels/{app}", self._channel)])
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, ssl_context=self.ssl_context)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+        _LOGGING.info("Replay server listening on %s", site.name)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _sleep_until(self, deadline: float) -> None:
+        delay = deadline - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _channel(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        scripts = self._scripts.get(request.match_info["app"])
+        if scripts is None:
+            await ws.close()
+            return ws
+        script = next(scripts)
+        used: Dict[str, int] = {}
+        started = asyncio.get_running_loop().time()
+        first = script.greeting[0][0] if script.greeting else 0
+        for seconds, payload in script.greeting:
+            await self._sleep_until(started + (seconds - first) / self.speed)
+            await ws.send_str(payload)
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            key, _ = _request_key(msg.data)
+            exchanges = script.exchanges.get(key)
+            if not exchanges:
+                _LOGGING.debug("Nothing captured in answer to %s", key)
+                continue
+            index = used.get(key, 0)
+            used[key] = index + 1
+            task = asyncio.ensure_future(
+                self._play(ws, exchanges[min(index, len(exchanges) - 1)], msg.data)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return ws
+
+    async def _play(self, ws: web.WebSocketResponse, exchange: _Exchange, payload: str) -> None:
+        # captured ids map to the live request's ids in the same position,
+        # ids without a counterpart are answered unchanged
+        captured_ids = _UUID.findall(exchange.payload)
+        live_ids = _UUID.findall(payload)
+        ids = {
+            captured_id: live_ids[index]
+            for index, captured_id in enumerate(captured_ids[: len(live_ids)])
+        }
+        received = asyncio.get_running_loop().time()
+        transfers: Dict[str, "asyncio.Future[None]"] = {}
+        for frame in exchange.items:
+            await self._sleep_until(received + (frame[0] - exchange.time) / self.speed)
+            if frame[1] == INBOUND:
+                answer = _UUID.sub(lambda m: ids.get(m.group(), m.group()), frame[2])
+                answer = await self._open_transfers(exchange, answer, transfers)
+                if not ws.closed:
+                    await ws.send_str(answer)
+            elif frame[2] in transfers:
+                # later frames were sent after the transfer finished
+                try:
+                    await asyncio.wait_for(asyncio.shield(transfers[frame[2]]), _D2D_TIMEOUT)
+                except asyncio.TimeoutError:
+                    _LOGGING.debug("D2D transfer on %s not completed", frame[2])
+
+    async def _open_transfers(
+        self,
+        exchange: _Exchange,
+        payload: str,
+        transfers: Dict[str, "asyncio.Future[None]"],
+    ) -> str:
+        """Serve the D2D transfers of a response on local sockets, return it with their addresses."""
+        message = json.loads(payload)
+        data = _art_data(payload)
+        if "conn_info" not in data:
+            return payload
+        conn_info = json.loads(data["conn_info"])
+        channel = "{}:{}".format(conn_info["ip"], conn_info["port"])
+        frames = [f for f in exchange.items if f[1] != INBOUND and f[2] == channel]
+        done: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        transfers[channel] = done
+
+        async def transfer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                for _, direction, _, header, size in frames:
+                    if direction == D2D_OUTBOUND:
+                        header_len = int.from_bytes(await reader.readexactly(4), "big")
+                        await reader.readexactly(header_len)
+                        remaining = size
+                        while remaining:
+                            remaining -= len(await reader.readexactly(min(_CHUNK_SIZE, remaining)))
+                    else:
+                        raw_header = header.encode()
+                        writer.write(len(raw_header).to_bytes(4, "big") + raw_header)
+                        for start in range(0, size, _CHUNK_SIZE):
+                            writer.write(bytes(min(_CHUNK_SIZE, size - start)))
+                            await writer.drain()
+            except (ConnectionError, asyncio.IncompleteReadError) as err:
+                _LOGGING.debug("D2D transfer failed: %s", err)
+            finally:
+                writer.close()
+                server.close()
+                if not done.done():
+                    done.set_result(None)
+
+        server = await asyncio.start_server(transfer, self.host, 0, ssl=self.ssl_context)
+        conn_info.update(
+            ip=self.host,
+            port=str(server.sockets[0].getsockname()[1]),
+            secured=self.ssl_context is not None,
+        )
+        data["conn_info"] = json.dumps(conn_info)
+        message["data"] = json.dumps(data)
+        return json.dumps(message)
+
+
+class ReplayReport:
+    """Client side latency per request name, errors, and time used by a load run."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, Histogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.latencies.setdefault(name, Histogram()).record(seconds)
+
+    def error(self, name: str) -> None:
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    @property
+    def requests(self) -> int:
+        return sum(h.count for h in self.latencies.values()) + sum(self.errors.values())
+
+    def format(self) -> str:
+        lines = [
+            "{} requests in {:.3f}s, {:.3f}s client cpu, {:.1f} requests/s".format(
+                self.requests,
+                self.wall_seconds,
+                self.cpu_seconds,
+                self.requests / self.wall_seconds if self.wall_seconds else 0,
+            ),
+            "{:<28} {:>7} {:>7} ".format("request", "count", "errors")
+            + " ".join("{:>9}".format("p{:g}".format(q * 100)) for q in QUANTILES)
+            + " {:>9}".format("max"),
+        ]
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            histogram = self.latencies.get(name, Histogram())
+            lines.append(
+                "{:<28} {:>7} {:>7} ".format(name, histogram.count, self.errors.get(name, 0))
+                + " ".join(
+                    "{:>7.1f}ms".format(histogram.percentile(q) * 1000) for q in QUANTILES
+                )
+                + " {:>7.1f}ms".format(histogram.max * 1000)
+            )
+        return "\n".join(lines)
+
+
+async def _replay_request(
+    client: Any, payload: str, report: ReplayReport, timeout: float
+) -> None:
+    message = json.loads(payload)
+    params = message.get("params", {})
+    is_art = params.get("event") == "art_app_request"
+    data = json.loads(params["data"]) if is_art else {}
+    name = data.get("request", "") if is_art else _request_key(payload)[0]
+    started = time.monotonic()
+    try:
+        if not is_art:
+            await client.send_command(message)
+        elif name == "send_image":
+            content_id = await client.upload(
+                bytes(int(data.get("file_size", 0))),
+                file_type=data.get("file_type", "jpg"),
+                matte=data.get("matte_id"),
+                portrait_matte=data.get("portrait_matte_id"),
+                date=data.get("image_date"),
+                timeout=timeout,
+            )
+            if content_id is None:
+                raise asyncio.TimeoutError
+        elif name == "get_thumbnail":
+            await client.get_thumbnail(data["content_id"])
+        elif name == "get_thumbnail_list":
+            await client.get_thumbnail_list(
+                [item["content_id"] for item in data.get("content_id_list", [])]
+            )
+        else:
+            request = {k: v for k, v in data.items() if k not in ("id", "request_id")}
+            response = await client._send_art_request(
+                request, wait_for_event=WAIT_FOR_EVENT.get(name), timeout=timeout
+            )
+            if response is None:
+                raise asyncio.TimeoutError
+    except Exception as err:
+        _LOGGING.debug("Replayed %s failed: %r", name, err)
+        report.error(name)
+        return
+    report.observe(name, time.monotonic() - started)
+
+
+async def _replay_connection(
+    connection: CapturedConnection,
+    host: str,
+    port: int,
+    speed: float,
+    timeout: float,
+    report: ReplayReport,
+) -> None:
+    client: Any
+    if connection.endpoint == ART_ENDPOINT:
+        client = SamsungTVAsyncArt(
+            host, port=port, timeout=timeout, key_press_delay=0, check_token=False
+        )
+    else:
+        client = SamsungTVWSAsyncRemote(host, port=port, timeout=timeout, key_press_delay=0)
+    started = time.monotonic()
+    try:
+        await client.start_listening()
+    except Exception as err:
+        _LOGGING.debug("Replay connection failed: %r", err)
+        report.error("connect")
+        await client.close()
+        return
+    report.observe("connect", time.monotonic() - started)
+    requests = list(connection.requests())
+    first = requests[0][0] if requests else 0
+    tasks = []
+    for seconds, payload in requests:
+        delay = started + (seconds - first) / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(_replay_request(client, payload, report, timeout)))
+    await asyncio.gather(*tasks)
+    await client.close()
+
+
+async def run_load(
+    connections: Sequence[CapturedConnection],
+    host: str,
+    port: int,
+    *,
+    concurrency: int = 1,
+    speed: float = 1.0,
+    timeout: float = 5.0,
+) -> ReplayReport:
+    """Replay the client side of a capture against a ReplayServer at host and port.
+
+    Every captured remote and art connection is replayed concurrency times
+    at once, each by its own client. Requests are sent at their captured
+    times divided by speed, without waiting for earlier responses, so a
+    higher speed raises the load. Client cpu is the cpu time of this
+    thread, so run the server on another thread or process to leave it out.
+    """
+    report = ReplayReport()
+    cpu = time.thread_time()
+    started = time.monotonic()
+    await asyncio.gather(
+        *[
+            _replay_connection(connection, host, port, speed, timeout, report)
+            for _ in range(max(1, concurrency))
+            for connection in connections
+            if connection.endpoint in (ART_ENDPOINT, REMOTE_ENDPOINT)
+        ]
+    )
+    report.wall_seconds = time.monotonic() - started
+    report.cpu_seconds = time.thread_time() - cpu
+    return report
+
+
+def _serve_in_thread(
+    connections: Sequence[CapturedConnection], speed: float
+) -> Tuple[ReplayServer, asyncio.AbstractEventLoop, threading.Thread]:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = ReplayServer(connections, speed=speed)
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    return server, loop, thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay captured Samsung TV traffic, see recorder.start_capture()."
+    )
+    parser.add_argument("capture")
+    parser.add_argument("--speed", type=float, default=1.0)
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve the capture to clients")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8001)
+    load = commands.add_parser("load", help="replay the clients against a replay server")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, help="a running replay server, else one is started")
+    load.add_argument("-n", "--concurrency", type=int, default=1)
+    load.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    connections = load_capture(args.capture)
+    if args.command == "serve":
+
+        async def serve_forever() -> None:
+            async with ReplayServer(connections, args.host, args.port, speed=args.speed):
+                await asyncio.Event().wait()
+
+        try:
+            asyncio.run(serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    port = args.port
+    if port is None:
+        server, loop, thread = _serve_in_thread(connections, args.speed)
+        port = server.port
+    report = asyncio.run(
+        run_load(
+            connections,
+            args.host,
+            port,
+            concurrency=args.concurrency,
+            speed=args.speed,
+            timeout=args.timeout,
+        )
+    )
+    if args.port is None:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    print(report.format())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,7 +11,7 @@ from typing import Any, Dict, Optional
 
 import requests
 
-from . import connection, exceptions, helper
+from . import connection, exceptions, helper, metrics, tracing
 
 _LOGGING = logging.getLogger(__name__)
 
@@ -32,20 +32,27 @@ class SamsungTVRest(connection.SamsungTVWSBaseConnection):
 
     def _rest_request(self, target: str, method: str = "GET") -> Dict[str, Any]:
         url = self._format_rest_url(target)
-        try:
-            if method == "POST":
-                response = requests.post(url, timeout=self.timeout, verify=False)
-            elif method == "PUT":
-                response = requests.put(url, timeout=self.timeout, verify=False)
-            elif method == "DELETE":
-                response = requests.delete(url, timeout=self.timeout, verify=False)
-            else:
-                response = requests.get(url, timeout=self.timeout, verify=False)
-            return helper.process_api_response(response.text)
-        except requests.ConnectionError as err:
-            raise exceptions.HttpApiError(
-                "TV unreachable or feature not supported on this model."
-            ) from err
+        request = f"{method} /{target}"
+        with tracing.span(tracing.REST_REQUEST, host=self.host, request=request):
+            started = metrics.start()
+            try:
+                if method == "POST":
+                    response = requests.post(url, timeout=self.timeout, verify=False)
+                elif method == "PUT":
+                    response = requests.put(url, timeout=self.timeout, verify=False)
+                elif method == "DELETE":
+                    response = requests.delete(url, timeout=self.timeout, verify=False)
+                else:
+                    response = requests.get(url, timeout=self.timeout, verify=False)
+                metrics.observe(
+                    metrics.REST_REQUEST_SECONDS, started, self.host, "rest", request
+                )
+                return helper.process_api_response(response.text)
+            except requests.ConnectionError as err:
+                metrics.increment(metrics.REST_REQUEST_ERRORS, self.host, "rest", request)
+                raise exceptions.HttpApiError(
+                    "TV unreachable or feature not supported on this model."
+                ) from err
             
     def rest_power_state(self) -> bool:
         _LOGGING.debug("Get PowerState via rest api")
@@ -0,0 +1,311 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+    from .preprocess import ImagePreprocessor
+    from .upload_index import UploadIndex
+
+_LOGGING = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "bmp", "tif")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChangeSet(NamedTuple):
+    """Differences between a folder and its manifest.
+
+    renamed maps new file names to the old name holding the same content,
+    touched files changed their stat signature but not their content.
+    entries holds the new stat signature and hash of every changed file.
+    """
+
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+    renamed: Dict[str, str]
+    touched: List[str]
+    entries: Dict[str, Dict[str, Any]]
+
+    def __bool__(self) -> bool:
+        return any((self.added, self.removed, self.modified, self.renamed, self.touched))
+
+
+class Manifest:
+    """Persistent record of synced files.
+
+    Maps each file name to its (inode, size, mtime_ns) stat signature,
+    sha256 and the content_id it was uploaded as.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if path:
+            try:
+                with open(path) as manifest_file:
+                    data = json.load(manifest_file)
+                if data.get("version") == self.VERSION:
+                    self.files = data["files"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def content_ids(self) -> Dict[str, str]:
+        return {
+            name: entry["content_id"]
+            for name, entry in self.files.items()
+            if entry.get("content_id")
+        }
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as manifest_file:
+            json.dump({"version": self.VERSION, "files": self.files}, manifest_file)
+        os.replace(tmp_path, self.path)
+
+
+def _signature(entry: Dict[str, Any]) -> List[int]:
+    return [entry.get("inode", 0), entry.get("size", 0), entry.get("mtime_ns", 0)]
+
+
+def scan(
+    folder: str, manifest: Manifest, extensions: Sequence[str] = IMAGE_EXTENSIONS
+) -> ChangeSet:
+    """Compare folder with manifest in one os.scandir pass.
+
+    Files are only read and hashed when their stat signature changed.
+    """
+    added: List[str] = []
+    modified: List[str] = []
+    touched: List[str] = []
+    entries: Dict[str, Dict[str, Any]] = {}
+    seen = set()
+    with os.scandir(folder) as directory:
+        for dir_entry in directory:
+            extension = os.path.splitext(dir_entry.name)[1][1:].lower()
+            if extension not in extensions or not dir_entry.is_file():
+                continue
+            seen.add(dir_entry.name)
+            stat = dir_entry.stat()
+            entry: Dict[str, Any] = {
+                "inode": stat.st_ino,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            old = manifest.files.get(dir_entry.name)
+            if old and _signature(old) == _signature(entry):
+                continue
+            try:
+                entry["sha256"] = file_sha256(dir_entry.path)
+            except OSError as e:
+                _LOGGING.debug("Unable to read %s: %s", dir_entry.path, e)
+                continue
+            entries[dir_entry.name] = entry
+            if old is None:
+                added.append(dir_entry.name)
+            elif old.get("sha256") == entry["sha256"]:
+                touched.append(dir_entry.name)
+            else:
+                modified.append(dir_entry.name)
+    removed = [name for name in manifest.files if name not in seen]
+
+    # a removed file whose content reappears under a new name was renamed
+    removed_by_hash = {manifest.files[name].get("sha256"): name for name in removed}
+    renamed: Dict[str, str] = {}
+    for name in list(added):
+        old_name = removed_by_hash.pop(entries[name]["sha256"], None)
+        if old_name:
+            renamed[name] = old_name
+            added.remove(name)
+            removed.remove(old_name)
+    return ChangeSet(
+        sorted(added), sorted(removed), sorted(modified), renamed, touched, entries
+    )
+
+
+class DirectorySync:
+    """Keep the art on a TV in step with the image files in a folder.
+
+    If a preprocessor is given, files are shrunk to the TV's resolution
+    before upload, in parallel with the uploads of earlier files. If an
+    upload_index is given, files whose content is already on the TV, eg
+    copies, reuse its content_id instead of being uploaded again.
+    """
+
+    def __init__(
+        self,
+        tv: "SamsungTVAsyncArt",
+        folder: str,
+        manifest_path: Optional[str] = None,
+        matte: str = "none",
+        portrait_matte: str = "none",
+        extensions: Sequence[str] = IMAGE_EXTENSIONS,
+        preprocessor: Optional["ImagePreprocessor"] = None,
+        upload_index: Optional["UploadIndex"] = None,
+    ) -> None:
+        self.tv = tv
+        self.folder = folder
+        self.manifest = Manifest(manifest_path)
+        self.matte = matte
+        self.portrait_matte = portrait_matte
+        self.extensions = extensions
+        self.preprocessor = preprocessor
+        self.upload_index = upload_index
+
+    def scan(self) -> ChangeSet:
+        return scan(self.folder, self.manifest, self.extensions)
+
+    async def sync(self) -> ChangeSet:
+        """Scan the folder and apply any changes to the TV.
+
+        Files are hashed in the default executor, off the event loop.
+        """
+        changes = await asyncio.get_running_loop().run_in_executor(None, self.scan)
+        if changes:
+            await self.apply(changes)
+        return changes
+
+    async def watch(
+        self,
+        debounce: float = 1.0,
+        poll_interval: float = 5.0,
+        on_change: Optional[Callable[[ChangeSet], Awaitable[None]]] = None,
+    ) -> None:
+        """Sync now, then again whenever files in the folder finish changing.
+
+        Uses inotify where available and polling otherwise, see FolderWatcher.
+        Runs until cancelled.
+        """
+        from .watcher import FolderWatcher
+
+        async with FolderWatcher(
+            self.folder, self.extensions, debounce, poll_interval
+        ) as watcher:
+            await self.sync()
+            while True:
+                names = await watcher.wait()
+                _LOGGING.debug("Files changed in %s: %s", self.folder, names)
+                try:
+                    changes = await self.sync()
+                except Exception as e:
+                    _LOGGING.warning("Failed to sync %s: %s", self.folder, e)
+                    continue
+                if changes and on_change:
+                    await on_change(changes)
+
+    async def apply(self, changes: ChangeSet) -> None:
+        """Delete removed and modified art from the TV, then upload new versions."""
+        files = self.manifest.files
+        for new_name, old_name in changes.renamed.items():
+            content_id = files.pop(old_name).get("content_id")
+            files[new_name] = dict(changes.entries[new_name], content_id=content_id)
+        for name in changes.touched:
+            content_id = files[name].get("content_id")
+            files[name] = dict(changes.entries[name], content_id=content_id)
+
+        replaced = {
+            files[name]["content_id"]
+            for name in changes.removed + changes.modified
+            if files[name].get("content_id")
+        }
+        for name in changes.removed:
+            del files[name]
+        # content shared by copies stays on the TV while any copy is left
+        kept = {
+            entry.get("content_id")
+            for name, entry in files.items()
+            if name not in changes.modified
+        }
+        stale = sorted(replaced - kept)
+        if stale:
+            _LOGGING.debug("Deleting %s from TV", stale)
+            await self.tv.delete_list(stale)
+            if self.upload_index:
+                self.upload_index.discard(self.tv.host, stale)
+        self.manifest.save()
+
+        uploads = changes.added + changes.modified
+        prepared: Dict[str, "asyncio.Future[str]"] = {}
+        if self.preprocessor:
+            for name in uploads:
+                prepared[name] = asyncio.ensure_future(
+                    self.preprocessor.prepare(
+                        os.path.join(self.folder, name), changes.entries[name]["sha256"]
+                    )
+                )
+        try:
+            for name in uploads:
+                files.pop(name, None)
+                try:
+                    path = await prepared[name] if name in prepared else None
+                except Exception as e:
+                    _LOGGING.warning("Failed to preprocess %s: %s", name, e)
+                    continue
+                content_id = await self.upload(
+                    name, path, changes.entries[name]["sha256"]
+                )
+                if content_id:
+                    files[name] = dict(changes.entries[name], content_id=content_id)
+                else:
+                    _LOGGING.warning("Failed to upload %s", name)
+                self.manifest.save()
+        finally:
+            # an upload failure leaves later files unprocessed
+            for future in prepared.values():
+                future.cancel()
+            await asyncio.gather(*prepared.values(), return_exceptions=True)
+
+    async def upload(
+        self, name: str, path: Optional[str] = None, digest: Optional[str] = None
+    ) -> Optional[str]:
+        path = path or os.path.join(self.folder, name)
+        content_id: Optional[str]
+        if self.upload_index:
+            content_id = await self.upload_index.upload(
+                self.tv,
+                path,
+                digest,
+                matte=self.matte,
+                portrait_matte=self.portrait_matte,
+            )
+        else:
+            content_id = await self.tv.upload(
+                path, matte=self.matte, portrait_matte=self.portrait_matte
+            )
+        _LOGGING.debug("Uploaded %s as %s", name, content_id)
+        return content_id
@@ -0,0 +1,249 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .event import D2D_SERVICE_MESSAGE_EVENT, parse_art_content_ids
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+IMAGE_DELETED_EVENT = "image_deleted"
+
+CacheKey = Tuple[str, str]
+
+
+def guess_file_type(data: bytes) -> str:
+    """Guess the image type of thumbnail data from its magic bytes."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpg"
+    return "bin"
+
+
+class ThumbnailCache:
+    """On-disk LRU cache of art thumbnails keyed by (host, content_id).
+
+    Thumbnail data is stored content-addressed under ``objects/``, so
+    identical thumbnails on several TVs are only stored once. A small
+    ``index.json`` records the keys in least- to most-recently used order.
+
+    get_thumbnails does its file I/O in the default executor, so the
+    index is guarded by a lock.
+    """
+
+    INDEX_FILE = "index.json"
+    INDEX_VERSION = 1
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._index: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._refs: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._listeners: Dict[int, Any] = {}
+        self._lock = threading.RLock()
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_FILE)
+
+    def _object_path(self, digest: str, file_type: str) -> str:
+        return os.path.join(
+            self.directory, "objects", digest[:2], f"{digest}.{file_type}"
+        )
+
+    def _load(self) -> None:
+        try:
+            with open(self._index_path()) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        if index.get("version") != self.INDEX_VERSION:
+            _LOGGING.debug("Ignoring thumbnail cache index with unknown version")
+            return
+        for host, content_id, entry in index.get("entries", []):
+            if os.path.isfile(self._object_path(entry["digest"], entry["file_type"])):
+                self._add_entry((host, content_id), entry)
+        self._evict()
+
+    def save(self) -> None:
+        """Write the index to disk, in LRU order."""
+        with self._lock:
+            index = {
+                "version": self.INDEX_VERSION,
+                "entries": [
+                    [key[0], key[1], entry] for key, entry in self._index.items()
+                ],
+            }
+            tmp_path = self._index_path() + ".tmp"
+            with open(tmp_path, "w") as index_file:
+                json.dump(index, index_file)
+            os.replace(tmp_path, self._index_path())
+
+    def _add_entry(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        digest = entry["digest"]
+        self._index[key] = entry
+        self._refs[digest] = self._refs.get(digest, 0) + 1
+        if digest not in self._sizes:
+            self._sizes[digest] = entry["size"]
+            self.total_bytes += entry["size"]
+
+    def _remove_entry(self, key: CacheKey) -> None:
+        entry = self._index.pop(key)
+        digest = entry["digest"]
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return
+        del self._refs[digest]
+        self.total_bytes -= self._sizes.pop(digest)
+        try:
+            os.remove(self._object_path(digest, entry["file_type"]))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            _LOGGING.debug("Evicting thumbnail %s", key)
+            self._remove_entry(key)
+
+    def _put(self, host: str, content_id: str, data: bytes) -> None:
+        key = (host, content_id)
+        digest = hashlib.sha256(data).hexdigest()
+        file_type = guess_file_type(data)
+        if key in self._index:
+            if self._index[key]["digest"] == digest:
+                self._index.move_to_end(key)
+                return
+            self._remove_entry(key)
+        path = self._object_path(digest, file_type)
+        if digest not in self._refs:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as object_file:
+                object_file.write(data)
+        self._add_entry(
+            key, {"digest": digest, "file_type": file_type, "size": len(data)}
+        )
+        self._evict()
+
+    def put(self, host: str, content_id: str, data: bytes) -> None:
+        """Store a thumbnail, evicting least recently used ones if needed."""
+        self.put_many(host, {content_id: data})
+
+    def put_many(self, host: str, thumbnails: Dict[str, bytes]) -> None:
+        """Store several thumbnails of one host, saving the index once."""
+        with self._lock:
+            for content_id, data in thumbnails.items():
+                self._put(host, content_id, data)
+            self.save()
+
+    def get(self, host: str, content_id: str) -> Optional[bytes]:
+        """Return the cached thumbnail, or None if it isn't cached."""
+        key = (host, content_id)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            path = self._object_path(entry["digest"], entry["file_type"])
+            try:
+                with open(path, "rb") as object_file:
+                    data = object_file.read()
+            except OSError:
+                self._remove_entry(key)
+                return None
+            self._index.move_to_end(key)
+            return data
+
+    def lookup(
+        self, host: str, content_ids: Sequence[str]
+    ) -> Tuple[Dict[str, bytes], List[str]]:
+        """Split content_ids into cached thumbnails and missing ids."""
+        hits: Dict[str, bytes] = {}
+        missing: List[str] = []
+        for content_id in content_ids:
+            data = self.get(host, content_id)
+            if data is None:
+                missing.append(content_id)
+            else:
+                hits[content_id] = data
+        return hits, missing
+
+    def invalidate(self, host: str, content_ids: Sequence[str]) -> None:
+        """Drop cached thumbnails, eg because the art was deleted on the TV."""
+        with self._lock:
+            removed = False
+            for content_id in content_ids:
+                if (host, content_id) in self._index:
+                    self._remove_entry((host, content_id))
+                    removed = True
+            if removed:
+                self.save()
+
+    def clear(self, host: Optional[str] = None) -> None:
+        """Drop every cached thumbnail, or only those of one host."""
+        with self._lock:
+            for key in [k for k in self._index if host is None or k[0] == host]:
+                self._remove_entry(key)
+            self.save()
+
+    async def get_thumbnails(
+        self, tv: "SamsungTVAsyncArt", content_ids: Sequence[str], **kwargs: Any
+    ) -> Tuple[Dict[str, bytes], Dict[str, Exception]]:
+        """Return thumbnails for content_ids, fetching only missing ones.
+
+        Missing thumbnails are downloaded in one batched
+        ``SamsungTVAsyncArt.get_thumbnails`` call, extra keyword arguments
+        are passed on to it. Cache files are read and written in the
+        default executor, off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        thumbnails, missing = await loop.run_in_executor(
+            None, self.lookup, tv.host, list(dict.fromkeys(content_ids))
+        )
+        failures: Dict[str, Exception] = {}
+        if missing:
+            fetched, failures = await tv.get_thumbnails(missing, **kwargs)
+            fetched = {content_id: bytes(data) for content_id, data in fetched.items()}
+            await loop.run_in_executor(None, self.put_many, tv.host, fetched)
+            thumbnails.update(fetched)
+        return thumbnails, failures
+
+    def attach(self, tv: "SamsungTVAsyncArt") -> None:
+        """Invalidate cached thumbnails when the TV reports deleted images."""
+
+        def on_image_deleted(event: str, response: Dict[str, Any]) -> None:
+            if event == D2D_SERVICE_MESSAGE_EVENT:
+                data = json.loads(response["data"])
+                self.invalidate(tv.host, parse_art_content_ids(data))
+
+        self._listeners[id(tv)] = on_image_deleted
+        tv.add_listener(IMAGE_DELETED_EVENT, on_image_deleted)
+
+    def detach(self, tv: "SamsungTVAsyncArt") -> None:
+        listener = self._listeners.pop(id(tv), None)
+        if listener:
+            tv.remove_listener(IMAGE_DELETED_EVENT, listener)
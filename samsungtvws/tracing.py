@@ -0,0 +1,159 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from types import TracebackType
+from typing import Any, Dict, Optional, Sequence
+
+from .version import __version__
+
+try:
+    from opentelemetry import context as otel_context, trace as otel_trace
+except ImportError:  # opentelemetry is optional, install samsungtvws[tracing]
+    otel_context = None  # type:ignore[assignment]
+    otel_trace = None  # type:ignore[assignment]
+
+# span names
+OPEN = "samsungtvws.open"
+SEND_COMMANDS = "samsungtvws.send_commands"
+ART_REQUEST = "samsungtvws.art_request"
+WAIT_FOR_RESPONSE = "samsungtvws.wait_for_response"
+ART_EVENT = "samsungtvws.art_event"
+D2D_CONNECT = "samsungtvws.d2d_connect"
+D2D_TRANSFER = "samsungtvws.d2d_transfer"
+REST_REQUEST = "samsungtvws.rest_request"
+
+
+class Span:
+    """A traced operation, used as a context manager.
+
+    This base class does nothing, it is what span() returns while no tracer
+    is set. Tracers return subclasses that override these methods.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_val is not None:
+            self.record_exception(exc_val)
+        self.end()
+
+
+NOOP_SPAN = Span()
+
+
+class Tracer:
+    """Creates spans, subclass it to send the library's spans somewhere."""
+
+    def start_span(
+        self, name: str, attributes: Dict[str, Any], links: Sequence[Span]
+    ) -> Span:
+        return NOOP_SPAN
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Trace all clients in this process with tracer, None turns tracing off."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, links: Sequence[Span] = (), **attributes: Any) -> Span:
+    """Start a span, attributes that are None are left out.
+
+    links are spans this one follows from without being their child, such
+    as the request whose response is being handled.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.start_span(
+        name,
+        {key: value for key, value in attributes.items() if value is not None},
+        [link for link in links if link is not NOOP_SPAN],
+    )
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, otel_span: Any) -> None:
+        self.otel_span = otel_span
+        self._token: Any = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.otel_span.set_attribute(f"samsungtvws.{key}", value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.otel_span.record_exception(exception)
+        self.otel_span.set_status(
+            otel_trace.Status(otel_trace.StatusCode.ERROR, str(exception))
+        )
+
+    def end(self) -> None:
+        self.otel_span.end()
+
+    def __enter__(self) -> "Span":
+        # make this span the parent of spans started inside it, including
+        # those of tasks created inside it, which copy the current context
+        self._token = otel_context.attach(otel_trace.set_span_in_context(self.otel_span))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if self._token is not None:
+            otel_context.detach(self._token)
+            self._token = None
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that creates OpenTelemetry spans, attributes are prefixed with ``samsungtvws.``."""
+
+    def __init__(self, tracer: Any = None) -> None:
+        if otel_trace is None:
+            raise ImportError(
+                "OpenTelemetryTracer needs opentelemetry-api, install samsungtvws[tracing]"
+            )
+        self.tracer = tracer or otel_trace.get_tracer("samsungtvws", __version__)
+
+    def start_span(
+        self, name: str, attributes: Dict[str, Any], links: Sequence[Span]
+    ) -> Span:
+        return _OpenTelemetrySpan(
+            self.tracer.start_span(
+                name,
+                attributes={f"samsungtvws.{k}": v for k, v in attributes.items()},
+                links=[
+                    otel_trace.Link(link.otel_span.get_span_context())
+                    for link in links
+                    if isinstance(link, _OpenTelemetrySpan)
+                ],
+            )
+        )
@@ -0,0 +1,176 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Union
+
+from .art_catalog import (
+    IMAGE_ADDED_EVENT,
+    IMAGE_DELETED_EVENT,
+    MY_PHOTOS_CATEGORY,
+    ArtCatalog,
+)
+from .event import D2D_SERVICE_MESSAGE_EVENT, parse_art_content_ids
+from .sync import file_sha256
+
+if TYPE_CHECKING:
+    from .async_art import SamsungTVAsyncArt
+
+_LOGGING = logging.getLogger(__name__)
+
+
+class UploadIndex:
+    """Persistent map of content sha256 to content_id, per TV host.
+
+    ``upload()`` hashes the source and skips the transfer when the same
+    content is already on the TV, returning the existing content_id. Before
+    an entry is trusted it is checked against the live content of the TV,
+    taken from the TV's catalog if enabled, otherwise from ``available()``.
+    ``attach()`` keeps the live content up to date from ``image_added`` and
+    ``image_deleted`` events.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._live: Dict[str, Set[str]] = {}
+        self._listeners: Dict[int, Any] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        if path:
+            try:
+                with open(path) as index_file:
+                    data = json.load(index_file)
+                if data.get("version") == self.VERSION:
+                    self._hashes = data["hosts"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as index_file:
+            json.dump({"version": self.VERSION, "hosts": self._hashes}, index_file)
+        os.replace(tmp_path, self.path)
+
+    def get(self, host: str, digest: str) -> Optional[str]:
+        """Return the content_id recorded for digest, without validating it."""
+        return self._hashes.get(host, {}).get(digest)
+
+    def add(self, host: str, digest: str, content_id: str) -> None:
+        self._hashes.setdefault(host, {})[digest] = content_id
+        if host in self._live:
+            self._live[host].add(content_id)
+
+    def discard(self, host: str, content_ids: Any) -> None:
+        """Forget content_ids, eg because they were deleted on the TV."""
+        content_ids = set(content_ids)
+        if host in self._live:
+            self._live[host] -= content_ids
+        hashes = self._hashes.get(host, {})
+        stale = [digest for digest, cid in hashes.items() if cid in content_ids]
+        for digest in stale:
+            del hashes[digest]
+        if stale:
+            self.save()
+
+    async def _live_content_ids(self, tv: "SamsungTVAsyncArt") -> Set[str]:
+        catalog: Optional[ArtCatalog] = getattr(tv, "catalog", None)
+        if catalog is not None and catalog.loaded:
+            return catalog.content_ids(MY_PHOTOS_CATEGORY)
+        if tv.host not in self._live:
+            await self.validate(tv)
+        return self._live[tv.host]
+
+    async def validate(self, tv: "SamsungTVAsyncArt", timeout: float = 10) -> None:
+        """Drop entries whose content is no longer on the TV."""
+        content_list = await tv.available(MY_PHOTOS_CATEGORY, timeout=timeout)
+        live = {entry["content_id"] for entry in content_list}
+        self._live[tv.host] = live
+        hashes = self._hashes.get(tv.host, {})
+        stale = [digest for digest, cid in hashes.items() if cid not in live]
+        for digest in stale:
+            del hashes[digest]
+        if stale:
+            _LOGGING.debug("Dropped %d stale upload index entries", len(stale))
+            self.save()
+
+    async def lookup(self, tv: "SamsungTVAsyncArt", digest: str) -> Optional[str]:
+        """Return the content_id of digest if that content is still on the TV."""
+        content_id = self.get(tv.host, digest)
+        if content_id is None:
+            return None
+        if content_id in await self._live_content_ids(tv):
+            return content_id
+        self.discard(tv.host, [content_id])
+        return None
+
+    async def upload(
+        self,
+        tv: "SamsungTVAsyncArt",
+        file: Union[str, bytes],
+        digest: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Optional[str]:
+        """Upload file unless its content is already on the TV.
+
+        file is a path or the image data, as for
+        ``SamsungTVAsyncArt.upload()``, which is passed extra keyword
+        arguments. digest is the sha256 of the content, if already known,
+        eg when file is a preprocessed copy of the original.
+        Returns the new or existing content_id.
+        """
+        if digest is None:
+            if isinstance(file, str):
+                digest = await asyncio.get_running_loop().run_in_executor(
+                    None, file_sha256, file
+                )
+            else:
+                digest = hashlib.sha256(file).hexdigest()
+        # one upload per TV at a time, so concurrent copies are only sent once
+        if tv.host not in self._locks:
+            self._locks[tv.host] = asyncio.Lock()
+        async with self._locks[tv.host]:
+            content_id = await self.lookup(tv, digest)
+            if content_id:
+                _LOGGING.debug("Content already on TV as %s", content_id)
+                return content_id
+            uploaded: Optional[str] = await tv.upload(file, **kwargs)
+            if uploaded:
+                self.add(tv.host, digest, uploaded)
+                self.save()
+        return uploaded
+
+    def attach(self, tv: "SamsungTVAsyncArt") -> None:
+        """Track added and deleted images on the TV."""
+
+        def on_image_event(event: str, response: Dict[str, Any]) -> None:
+            if event != D2D_SERVICE_MESSAGE_EVENT:
+                return
+            data = json.loads(response["data"])
+            content_ids = parse_art_content_ids(data)
+            if data.get("event") == IMAGE_DELETED_EVENT:
+                self.discard(tv.host, content_ids)
+            elif tv.host in self._live:
+                self._live[tv.host].update(content_ids)
+
+        self._listeners[id(tv)] = on_image_event
+        tv.add_listener(IMAGE_ADDED_EVENT, on_image_event)
+        tv.add_listener(IMAGE_DELETED_EVENT, on_image_event)
+
+    def detach(self, tv: "SamsungTVAsyncArt") -> None:
+        listener = self._listeners.pop(id(tv), None)
+        if listener:
+            tv.remove_listener(IMAGE_ADDED_EVENT, listener)
+            tv.remove_listener(IMAGE_DELETED_EVENT, listener)
@@ -0,0 +1,212 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+from .sync import IMAGE_EXTENSIONS
+
+_LOGGING = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _inotify_init(folder: str) -> Optional[int]:
+    """Return an inotify fd watching folder, or None if inotify is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(folder), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(error, "inotify_add_watch failed")
+    except (OSError, AttributeError) as e:
+        _LOGGING.debug("inotify unavailable, falling back to polling: %s", e)
+        return None
+    return fd
+
+
+class FolderWatcher:
+    """Report image files that finished changing in a folder, in batches.
+
+    On Linux the folder is watched with inotify, a file is reported once it is
+    closed after writing, moved in, moved out or deleted. Events are debounced,
+    so a batch is only released after ``debounce`` seconds without new events.
+    Elsewhere the folder is polled every ``poll_interval`` seconds, and a file
+    is reported once its stat signature is unchanged for a whole interval.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        extensions: Sequence[str] = IMAGE_EXTENSIONS,
+        debounce: float = 1.0,
+        poll_interval: float = 5.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self.folder = folder
+        self.extensions = extensions
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._fd: Optional[int] = None
+        self._poll_task: Optional["asyncio.Task[None]"] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._pending: Set[str] = set()
+        self._ready: Set[str] = set()
+        # created in start(), on Python < 3.10 an Event binds to the loop
+        # current when it is made
+        self._ready_event: Optional[asyncio.Event] = None
+
+    @property
+    def inotify(self) -> bool:
+        return self._fd is not None
+
+    def _wanted(self, name: str) -> bool:
+        return os.path.splitext(name)[1][1:].lower() in self.extensions
+
+    async def start(self) -> None:
+        if self._ready_event is None:
+            self._ready_event = asyncio.Event()
+        if self._fd is not None or self._poll_task is not None:
+            return
+        if self.use_inotify:
+            self._fd = _inotify_init(self.folder)
+        if self._fd is not None:
+            asyncio.get_running_loop().add_reader(self._fd, self._read_events)
+        else:
+            self._poll_task = asyncio.ensure_future(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._poll_task:
+            self._poll_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._poll_task
+            self._poll_task = None
+
+    async def __aenter__(self) -> "FolderWatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    async def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Return the next batch of changed file names, empty on timeout.
+
+        Batches not collected yet are merged, so a slow consumer gets one
+        larger batch instead of falling behind.
+        """
+        await self.start()
+        assert self._ready_event is not None
+        if not self._ready:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._ready_event.wait(), timeout)
+        batch, self._ready = self._ready, set()
+        self._ready_event.clear()
+        return batch
+
+    def _release(self, names: Set[str]) -> None:
+        if names:
+            self._ready |= names
+            if self._ready_event is not None:
+                self._ready_event.set()
+
+    def _read_events(self) -> None:
+        assert self._fd is not None
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    _LOGGING.warning("inotify queue overflow watching %s", self.folder)
+                    self._pending.update(self._listdir())
+                elif mask & IN_IGNORED:
+                    _LOGGING.warning("%s is no longer watched", self.folder)
+                elif name and self._wanted(name):
+                    self._pending.add(name)
+        if self._pending:
+            if self._flush_handle:
+                self._flush_handle.cancel()
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.debounce, self._flush
+            )
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, set()
+        self._release(pending)
+
+    def _listdir(self) -> Set[str]:
+        return {name for name in os.listdir(self.folder) if self._wanted(name)}
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        snapshot = {}
+        with os.scandir(self.folder) as directory:
+            for entry in directory:
+                if self._wanted(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    async def _poll_loop(self) -> None:
+        previous = self._snapshot()
+        unstable: Set[str] = set()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                current = self._snapshot()
+            except OSError as e:
+                _LOGGING.debug("Unable to scan %s: %s", self.folder, e)
+                continue
+            changed = {
+                name
+                for name in previous.keys() | current.keys()
+                if previous.get(name) != current.get(name)
+            }
+            self._release(unstable - changed)
+            unstable = changed
+            previous = current
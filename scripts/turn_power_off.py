@@ -4,6 +4,7 @@ import os
 
 from dotenv import load_dotenv
 from samsungtvws import SamsungTVWS, exceptions
+from samsungtvws.proxy_client import ProxyClient
 
 
 def main() -> None:
@@ -12,6 +13,18 @@ def main() -> None:
 
     ip = os.getenv("TV_IP")
     token = os.getenv("TV_TOKEN")
+    proxy_socket = os.getenv("TV_PROXY_SOCKET")
+    if ip and proxy_socket:
+        try:
+            ProxyClient(path=proxy_socket).send_key(ip, "KEY_POWEROFF")
+            logging.info("Power off command sent")
+            return
+        except exceptions.ConnectionFailure as err:
+            logging.warning("Proxy not available, connecting directly: %s", err)
+        except exceptions.HttpApiError as err:
+            logging.error("Proxy request failed: %s", err)
+            return
+
     if not ip or not token:
         logging.error("Environment variables TV_IP and TV_TOKEN must be set")
         return
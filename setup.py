@@ -21,6 +21,15 @@ setup(
     install_requires=["websocket-client>=0.57.0", "requests>=2.21.0", "aiohttp>=3.8.1", "websockets>=10.2", "async_timeout>=4.0.3"],
     extras_require={
         "encrypted": ["cryptography>=35.0.0", "py3rijndael>=0.3.3"],
+        "images": ["Pillow>=9.0.0"],
+        "broker": ["msgpack>=1.0.0"],
+        "tracing": ["opentelemetry-api>=1.0.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "samsungtvws-proxy=samsungtvws.proxy:main",
+            "samsungtvws-broker=samsungtvws.broker:main",
+        ],
     },
     include_package_data=True,
     license="LGPL-3.0",
@@ -5,8 +5,11 @@ from unittest.mock import Mock, patch
 
 from aioresponses import aioresponses
 import pytest
+import pytest_asyncio
 from websockets.client import WebSocketClientProtocol
 
+from samsungtvws.emulator import FakeSamsungTV
+
 
 @pytest.fixture(autouse=True)
 def override_time_sleep():
@@ -52,3 +55,10 @@ def get_async_connection():
 def mock_aioresponse():
     with aioresponses() as m:
         yield m
+
+
+@pytest_asyncio.fixture(name="fake_tv")
+async def get_fake_tv():
+    """Start a local emulated TV."""
+    async with FakeSamsungTV() as tv:
+        yield tv
@@ -141,3 +141,29 @@ def test_send_image_failure(connection: Mock) -> None:
         connection.send.assert_called_once_with(
             '{"method": "ms.channel.emit", "params": {"event": "art_app_request", "to": "host", "data": "{\\"request\\": \\"send_image\\", \\"file_type\\": \\"png\\", \\"request_id\\": \\"07e72228-7110-4655-aaa6-d81b5188c219\\", \\"conn_info\\": {\\"d2d_mode\\": \\"socket\\", \\"connection_id\\": 4091151321, \\"id\\": \\"07e72228-7110-4655-aaa6-d81b5188c219\\"}, \\"image_date\\": \\"2023:05:02 15:06:39\\", \\"matte_id\\": \\"none\\", \\"portrait_matte_id\\": \\"shadowbox_polar\\", \\"file_size\\": 0, \\"id\\": \\"07e72228-7110-4655-aaa6-d81b5188c219\\"}"}}'
         )
+
+
+def test_art_channel_is_shared() -> None:
+    """Ensure art() reuses one connection until every user closed it."""
+    connection = Mock()
+    with patch(
+        "samsungtvws.connection.websocket.create_connection"
+    ) as connection_class, patch(
+        "samsungtvws.rest.SamsungTVRest.get_model_year", return_value=0
+    ):
+        connection_class.return_value = connection
+        connection.recv.side_effect = [
+            MS_CHANNEL_CONNECT_SAMPLE,
+            MS_CHANNEL_READY_SAMPLE,
+        ]
+        tv = SamsungTVWS("127.0.0.1")
+
+        tv.art().send_command({"method": "ms.channel.emit"})
+        tv.art().send_command({"method": "ms.channel.emit"})
+        assert tv.art() is tv.art()
+        tv.art().close()
+
+        connection_class.assert_called_once()
+        connection.close.assert_not_called()
+        tv.close()
+        connection.close.assert_called_once()
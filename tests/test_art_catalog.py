@@ -0,0 +1,178 @@
+"""Tests for art_catalog module."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from samsungtvws.art_catalog import ArtCatalog
+
+from .const import D2D_SERVICE_MESSAGE_AVAILABLE_SAMPLE
+
+CONTENT_LIST = json.loads(
+    json.loads(json.loads(D2D_SERVICE_MESSAGE_AVAILABLE_SAMPLE)["data"])[
+        "content_list"
+    ]
+)
+
+
+def art_event(data: dict) -> dict:
+    return {"event": "d2d_service_message", "data": json.dumps(data)}
+
+
+@pytest.fixture(name="catalog")
+def get_catalog() -> ArtCatalog:
+    catalog = ArtCatalog(Mock(), reconcile_interval=0)
+    catalog.replace(CONTENT_LIST)
+    return catalog
+
+
+def test_indexes(catalog: ArtCatalog) -> None:
+    """Ensure the content list is indexed by content_id, category and matte."""
+    assert len(catalog) == 12
+    assert catalog.get("MY_F0008")["width"] == 2160
+    assert catalog.categories("MY_F0011") == {"MY-C0002", "MY-C0003"}
+    assert catalog.content_ids("MY-C0003") >= {"SAM-F0122", "MY_F0003"}
+    assert {e["content_id"] for e in catalog.by_matte("shadowbox_black")} == {
+        "MY_F0007",
+        "MY_F0003",
+    }
+    def order(entry: dict) -> tuple:
+        return entry["category_id"], entry["content_id"]
+
+    assert sorted(catalog.available(), key=order) == sorted(CONTENT_LIST, key=order)
+
+
+@pytest.mark.asyncio
+async def test_events(catalog: ArtCatalog) -> None:
+    """Ensure art events are applied incrementally."""
+    catalog.tv.available = AsyncMock(return_value=CONTENT_LIST)
+    catalog._process_event(
+        "d2d_service_message",
+        art_event({"event": "image_added", "content_id": "MY_F0012"}),
+    )
+    catalog.apply_event(
+        {"event": "image_deleted", "content_id_list": '[{"content_id": "MY_F0001"}]'}
+    )
+    catalog.apply_event(
+        {"event": "favorite_changed", "content_id": "MY_F0002", "status": "on"}
+    )
+    catalog.apply_event(
+        {"event": "matte_changed", "content_id": "MY_F0003", "matte_id": "none"}
+    )
+
+    assert "MY_F0012" in catalog.content_ids("MY-C0002")
+    assert "MY_F0001" not in catalog
+    assert catalog.is_favourite("MY_F0002")
+    assert [e["content_id"] for e in catalog.favourites()] == ["MY_F0002"]
+    assert catalog.get("MY_F0003")["matte_id"] == "none"
+    assert {e["content_id"] for e in catalog.by_matte("shadowbox_black")} == {
+        "MY_F0007"
+    }
+    catalog._refresh_task.cancel()
+
+
+def test_reload_emits_drift(catalog: ArtCatalog) -> None:
+    """Ensure differences found on reload are sent to change listeners."""
+    changes = []
+    catalog.add_change_listener(changes.append)
+    content_list = [
+        dict(entry, matte_id="none") if entry["content_id"] == "MY_F0003" else entry
+        for entry in CONTENT_LIST
+        if entry["content_id"] != "MY_F0001"
+    ]
+    content_list.append(
+        {"content_id": "MY_F0001", "category_id": "MY-C0004", "matte_id": "none"}
+    )
+    content_list.append({"content_id": "MY_F0020", "category_id": "MY-C0002"})
+
+    catalog.replace(content_list)
+
+    assert sorted((c["event"], c.get("content_id")) for c in changes) == [
+        ("favorite_changed", "MY_F0001"),
+        ("image_added", "MY_F0020"),
+        ("matte_changed", "MY_F0001"),
+        ("matte_changed", "MY_F0003"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reload_after_image_added_has_no_matte_drift(catalog: ArtCatalog) -> None:
+    """Ensure an added image's first reload doesn't report a matte change."""
+    catalog.tv.available = AsyncMock(return_value=CONTENT_LIST)
+    changes = []
+    catalog.add_change_listener(changes.append)
+    catalog.apply_event(
+        {"event": "image_added", "content_id": "MY_F0020", "category_id": "MY-C0002"}
+    )
+    catalog._refresh_task.cancel()
+
+    catalog.replace(
+        CONTENT_LIST
+        + [{"content_id": "MY_F0020", "category_id": "MY-C0002", "matte_id": "none"}]
+    )
+
+    assert [c["event"] for c in changes] == ["image_added"]
+
+
+@pytest.mark.asyncio
+async def test_warm_start_from_snapshot(tmp_path) -> None:
+    """Ensure a snapshot is served at once, and reconciled in the background."""
+    path = str(tmp_path / "catalog.json")
+    tv = Mock(host="127.0.0.1", api_generation=None)
+    tv.start_listening = AsyncMock()
+    tv.available = AsyncMock(return_value=CONTENT_LIST)
+    tv.get_matte_list = AsyncMock(return_value=([{"matte_type": "none"}], []))
+    tv.get_photo_filter_list = AsyncMock(return_value=[{"filter_id": "ink"}])
+    tv.get_api_version = AsyncMock(return_value="4.3.4.0")
+    catalog = ArtCatalog(
+        tv, reconcile_interval=0, snapshot_path=path, snapshot_interval=0
+    )
+    await catalog.start()
+    await catalog.stop()
+
+    removed = CONTENT_LIST[0]["content_id"]
+    content_list = [e for e in CONTENT_LIST if e["content_id"] != removed]
+    tv.available = AsyncMock(return_value=content_list)
+    tv.api_generation = None
+    changes = []
+    catalog = ArtCatalog(
+        tv, reconcile_interval=0, snapshot_path=path, snapshot_interval=0
+    )
+    catalog.add_change_listener(changes.append)
+    await catalog.start()
+
+    assert len(catalog) == 12 and tv.api_generation == 1
+    assert catalog.photo_filters == [{"filter_id": "ink"}]
+    await catalog._refresh_task
+    assert removed not in catalog
+    assert changes[0]["event"] == "image_deleted"
+    await catalog.stop()
+    with open(path) as snapshot_file:
+        assert len(json.load(snapshot_file)["content"]) == len(content_list)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("hang", [True, False])
+async def test_warm_start_with_tv_unreachable(tmp_path, hang: bool) -> None:
+    """Ensure a snapshot is served without waiting for an unreachable TV."""
+    path = str(tmp_path / "catalog.json")
+    with open(path, "w") as snapshot_file:
+        json.dump(
+            {"version": 1, "host": "127.0.0.1", "content": CONTENT_LIST}, snapshot_file
+        )
+    tv = Mock(host="127.0.0.1", api_generation=None)
+    tv.start_listening = AsyncMock(
+        side_effect=asyncio.Event().wait if hang else ConnectionRefusedError
+    )
+    catalog = ArtCatalog(
+        tv, reconcile_interval=0, snapshot_path=path, snapshot_interval=0
+    )
+
+    await asyncio.wait_for(catalog.start(), 1)
+
+    assert len(catalog) == 12
+    if not hang:
+        await catalog._refresh_task
+    await catalog.stop()
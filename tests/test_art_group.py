@@ -0,0 +1,84 @@
+"""Tests for art_group module."""
+
+import contextlib
+import time
+
+import pytest
+
+from samsungtvws import exceptions
+from samsungtvws.art_group import SamsungTVArtGroup
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.emulator import DROP, FakeSamsungTV
+
+
+def art(fake_tv: FakeSamsungTV) -> SamsungTVAsyncArt:
+    return SamsungTVAsyncArt(
+        fake_tv.host, port=fake_tv.port, key_press_delay=0, check_token=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_select_image_at_deadline() -> None:
+    """Ensure every member is sent its request at the deadline and answers."""
+    async with contextlib.AsyncExitStack() as stack:
+        fake_tvs = [
+            await stack.enter_async_context(FakeSamsungTV(latency=0.01))
+            for _ in range(3)
+        ]
+        group = await stack.enter_async_context(
+            SamsungTVArtGroup(art(fake_tv) for fake_tv in fake_tvs)
+        )
+        deadline = time.monotonic() + 0.1
+        report = await group.select_image(["MY_F0001", "MY_F0002", "MY_F0003"], at=deadline)
+
+        assert report.ok and report.deadline == deadline
+        assert [fake_tv.current for fake_tv in fake_tvs] == ["MY_F0001", "MY_F0002", "MY_F0003"]
+        assert [m.port for m in report.members] == [fake_tv.port for fake_tv in fake_tvs]
+        for member in report.members:
+            assert 0 <= member.send_offset < 0.05
+            assert member.send_offset < member.ack_offset
+        assert report.send_skew < 0.05
+
+        report = await group.set_artmode("off")
+        assert report.ok
+        assert [fake_tv.artmode for fake_tv in fake_tvs] == ["off"] * 3
+
+
+@pytest.mark.asyncio
+async def test_failures_are_reported_per_member() -> None:
+    """Ensure a failing or silent TV does not hide the others' timings."""
+    async with contextlib.AsyncExitStack() as stack:
+        fake_tvs = [
+            await stack.enter_async_context(FakeSamsungTV(failures=failures))
+            for failures in ({}, {"set_artmode_status": DROP})
+        ]
+        group = await stack.enter_async_context(
+            SamsungTVArtGroup(art(fake_tv) for fake_tv in fake_tvs)
+        )
+        report = await group.select_image(["MY_F0001", "MISSING"])
+        assert not report.ok
+        assert report.members[0].error is None
+        assert isinstance(report.members[1].error, exceptions.ResponseError)
+
+        report = await group.set_artmode("on", timeout=0.2)
+        assert report.members[0].ack_offset is not None
+        assert report.members[1].ack_offset is None
+        assert report.ack_skew == 0
+
+        with pytest.raises(ValueError):
+            await group.select_image(["MY_F0001"])
+
+
+@pytest.mark.asyncio
+async def test_close_keeps_shared_channels_open() -> None:
+    """Ensure closing the group leaves a channel its owner still holds open."""
+    async with FakeSamsungTV() as fake_tv:
+        owned = art(fake_tv)
+        shared = art(fake_tv).acquire()
+        async with SamsungTVArtGroup([owned, shared]) as group:
+            assert (await group.set_artmode("off")).ok
+
+        assert not owned.is_alive()
+        assert shared.is_alive()
+        await shared.close()
+        assert not shared.is_alive()
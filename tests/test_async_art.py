@@ -0,0 +1,149 @@
+"""Tests for async art module."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from samsungtvws import exceptions
+from samsungtvws.art_batch import ArtOperation
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.event import D2D_SERVICE_MESSAGE_EVENT
+
+_SLEEP = asyncio.sleep
+
+
+@pytest.fixture(name="tv_art")
+def get_tv_art():
+    """Create an async art client without the remote token check."""
+    with patch.object(SamsungTVAsyncArt, "get_token"):
+        yield SamsungTVAsyncArt("127.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_get_thumbnails_old_api(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure old api tv's fetch one thumbnail per request and report failures."""
+
+    async def get_thumbnail(content_ids, as_dict=False):
+        if content_ids == ["MY_F0002"]:
+            raise AssertionError
+        return {"{}.jpg".format(content_ids[0]): b"data"}
+
+    tv_art.api_generation = 0
+    with patch.object(tv_art, "get_thumbnail", side_effect=get_thumbnail) as mock:
+        thumbnails, failures = await tv_art.get_thumbnails(
+            ["MY_F0001", "MY_F0002", "MY_F0003", "MY_F0001"]
+        )
+
+    assert mock.call_count == 3
+    assert thumbnails == {"MY_F0001": b"data", "MY_F0003": b"data"}
+    assert list(failures) == ["MY_F0002"]
+
+
+@pytest.mark.asyncio
+async def test_get_thumbnails_new_api(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure new api tv's fetch thumbnails in chunks."""
+    tv_art.api_generation = 1
+    tv_art.get_thumbnail_list = AsyncMock(
+        side_effect=[
+            {"MY_F0001.jpg": b"1", "MY_F0002.png": b"2"},
+            {},
+        ]
+    )
+    thumbnails, failures = await tv_art.get_thumbnails(
+        ["MY_F0001", "MY_F0002", "MY_F0003"], chunk_size=2
+    )
+
+    assert [c.args[0] for c in tv_art.get_thumbnail_list.call_args_list] == [
+        ["MY_F0001", "MY_F0002"],
+        ["MY_F0003"],
+    ]
+    assert thumbnails == {"MY_F0001": b"1", "MY_F0002": b"2"}
+    assert isinstance(failures["MY_F0003"], exceptions.ResponseError)
+
+
+@pytest.mark.asyncio
+async def test_run_batch_pipelines_and_chunks_deletes(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure requests are bounded in flight, deletes chunked, and failures kept per item."""
+    in_flight = []
+    peak = []
+    requests = []
+
+    async def send_art_request(request_data, wait_for_event=None, timeout=2):
+        in_flight.append(request_data["id"])
+        peak.append(len(in_flight))
+        requests.append(dict(request_data))
+        # really yield, so unbounded requests would all be in flight together
+        await _SLEEP(0.01)
+        in_flight.remove(request_data["id"])
+        if request_data.get("content_id") == "MY_F0002":
+            raise exceptions.ResponseError("change_matte request failed")
+        return {"event": request_data["request"]}
+
+    operations = [ArtOperation.change_matte(f"MY_F000{i}", "shadowbox_polar") for i in range(4)]
+    operations += [ArtOperation.delete(f"MY_F001{i}") for i in range(5)]
+    with patch.object(tv_art, "_send_art_request", side_effect=send_art_request):
+        outcomes = await tv_art.run_batch(operations, concurrency=2, delete_chunk_size=2)
+
+    deletes = [r["content_id_list"] for r in requests if r["request"] == "delete_image_list"]
+    assert [len(d) for d in deletes] == [2, 2, 1]
+    assert max(peak) == 2
+    assert isinstance(outcomes[2], exceptions.ResponseError)
+    assert outcomes[0] == {"event": "change_matte"}
+    assert outcomes[-1] == {"event": "delete_image_list"}
+
+
+@pytest.mark.asyncio
+async def test_run_batch_reports_timeouts(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure a request the TV doesn't answer is a failed outcome."""
+    with patch.object(tv_art, "_send_art_request", AsyncMock(return_value=None)):
+        outcomes = await tv_art.run_batch([ArtOperation.delete("MY_F0001")])
+
+    assert isinstance(outcomes[0], exceptions.TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_run_batch_matches_favourite_events(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure concurrent favourite changes are matched to their events by content_id."""
+
+    async def send_command(command):
+        data = json.loads(command.params["data"])
+        event = {"event": "favorite_changed", "content_id": data["content_id"], "status": "on"}
+        asyncio.get_running_loop().call_soon(
+            asyncio.ensure_future,
+            tv_art.process_event(D2D_SERVICE_MESSAGE_EVENT, {"data": json.dumps(event)}),
+        )
+
+    with patch.object(tv_art, "start_listening", AsyncMock()), patch.object(
+        tv_art, "send_command", side_effect=send_command
+    ):
+        outcomes = await tv_art.run_batch(
+            [ArtOperation.set_favourite("MY_F0001"), ArtOperation.set_favourite("MY_F0002")]
+        )
+
+    assert [outcome["content_id"] for outcome in outcomes] == ["MY_F0001", "MY_F0002"]
+    assert tv_art.listeners["favorite_changed"] == []
+
+
+@pytest.mark.asyncio
+async def test_run_batch_serializes_same_content_events(tv_art: SamsungTVAsyncArt) -> None:
+    """Ensure event matched requests for the same content_id don't overwrite each other."""
+
+    async def send_command(command):
+        data = json.loads(command.params["data"])
+        event = {"event": "favorite_changed", "content_id": data["content_id"], "status": data["status"]}
+        asyncio.get_running_loop().call_soon(
+            asyncio.ensure_future,
+            tv_art.process_event(D2D_SERVICE_MESSAGE_EVENT, {"data": json.dumps(event)}),
+        )
+
+    with patch.object(tv_art, "start_listening", AsyncMock()), patch.object(
+        tv_art, "send_command", side_effect=send_command
+    ):
+        outcomes = await tv_art.run_batch(
+            [ArtOperation.set_favourite("MY_F0001"), ArtOperation.set_favourite("MY_F0001", "off")],
+            timeout=1,
+        )
+
+    assert [outcome["status"] for outcome in outcomes] == ["on", "off"]
@@ -5,6 +5,7 @@ from unittest.mock import Mock, call, patch
 
 import pytest
 
+from samsungtvws import async_connection
 from samsungtvws.async_remote import SamsungTVWSAsyncRemote
 from samsungtvws.exceptions import ConnectionFailure
 from samsungtvws.remote import SendRemoteKey
@@ -162,3 +163,21 @@ async def test_send_hold_key(async_connection: Mock) -> None:
 
     assert patch_sleep.call_count == 3
     assert patch_sleep.call_args_list == [call(1), call(3), call(1)]
+
+
+@pytest.mark.asyncio
+async def test_art_channel_is_shared() -> None:
+    """Ensure art() returns one reference counted channel, without a token check."""
+    tv = SamsungTVWSAsyncRemote("127.0.0.1", token="123456789")
+    with patch("samsungtvws.async_art.SamsungTVWS") as sync_remote:
+        art_channel = tv.art()
+        assert tv.art() is art_channel
+    sync_remote.assert_not_called()
+    assert art_channel.token == "123456789"
+    with patch.object(
+        async_connection.SamsungTVWSAsyncConnection, "close"
+    ) as close:
+        await art_channel.close()
+        close.assert_not_called()
+        await tv.close()
+    assert close.call_count == 2
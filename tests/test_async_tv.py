@@ -0,0 +1,76 @@
+"""Tests for async_tv module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.async_rest import SamsungTVAsyncRest
+from samsungtvws.async_tv import SamsungTV
+
+DEVICE_INFO = {"device": {"FrameTVSupport": "true", "model": "22_PONTUSM_FTV"}}
+
+
+@pytest.mark.asyncio
+async def test_start_opens_channels_concurrently() -> None:
+    """Ensure both channels connect at the same time and share one session."""
+    art_started = asyncio.Event()
+    callback = Mock()
+
+    async def remote_start_listening(callback=None) -> None:
+        await asyncio.wait_for(art_started.wait(), 1)
+
+    async def art_start_listening() -> None:
+        art_started.set()
+
+    with patch.object(
+        SamsungTVWSAsyncRemote, "start_listening", side_effect=remote_start_listening
+    ) as remote_start, patch.object(
+        SamsungTVAsyncArt, "start_listening", side_effect=art_start_listening
+    ), patch.object(
+        SamsungTVAsyncArt, "get_token"
+    ) as get_token:
+        tv = SamsungTV("127.0.0.1", token="123456789")
+        await tv.start(callback)
+        remote_start.assert_called_once_with(callback)
+        assert tv.remote.art() is tv.art
+        assert tv.art.get_session() is tv.session
+        get_token.assert_not_called()
+        await tv.close()
+        assert tv.session is not None and tv.session.closed
+
+
+@pytest.mark.asyncio
+async def test_start_without_token_opens_remote_first() -> None:
+    """Ensure the art channel connects with the token the remote channel got."""
+    tv = SamsungTV("127.0.0.1")
+    callback = Mock()
+
+    async def remote_start_listening(callback=None) -> None:
+        assert not tv.art.start_listening.called
+        tv.remote.token = "123456789"
+
+    with patch.object(
+        tv.remote, "start_listening", side_effect=remote_start_listening
+    ) as remote_start, patch.object(tv.art, "start_listening"):
+        await tv.start(callback)
+    remote_start.assert_called_once_with(callback)
+    assert tv.art.token == "123456789"
+    await tv.close()
+
+
+@pytest.mark.asyncio
+async def test_device_info_is_cached() -> None:
+    tv = SamsungTV("127.0.0.1")
+    with patch.object(
+        SamsungTVAsyncRest,
+        "rest_device_info",
+        AsyncMock(return_value=DEVICE_INFO),
+    ) as rest_device_info:
+        assert await tv.supported()
+        assert await tv.model_year() == 22
+        assert not await tv.on()
+    assert rest_device_info.await_count == 2
+    await tv.close()
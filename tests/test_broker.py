@@ -0,0 +1,98 @@
+"""Tests for broker module."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from websockets.protocol import State
+
+from samsungtvws.async_tv import SamsungTV
+from samsungtvws.broker import EventBroker, _Subscriber, subscribe
+from samsungtvws.event import D2D_SERVICE_MESSAGE_EVENT
+
+# conftest replaces asyncio.sleep, the reconnect loop needs the real one
+_SLEEP = asyncio.sleep
+
+
+async def next_event(events):
+    return await asyncio.wait_for(events.__anext__(), 1)
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_filtered_events(tmp_path) -> None:
+    """Ensure art events from one TV reach each matching subscriber once."""
+    path = str(tmp_path / "broker.sock")
+    with patch.object(SamsungTV, "start", AsyncMock()), patch("asyncio.sleep", _SLEEP):
+        broker = EventBroker(["10.0.0.1"], path=path)
+        await broker.start()
+        tv = broker.tvs["10.0.0.1"]
+        everything = subscribe(path)
+        matte_changes = subscribe(path, sub_events=["matte_changed"])
+        # the subscriptions are only sent when iteration starts
+        first = asyncio.ensure_future(next_event(everything))
+        second = asyncio.ensure_future(next_event(matte_changes))
+        while broker.subscriber_count < 2:
+            await asyncio.sleep(0.01)
+
+        broker.publish(
+            {"tv": "10.0.0.1", "channel": "remote", "event": "ms.channel.clientConnect", "sub_event": None, "data": None}
+        )
+        await tv.art.process_event(
+            D2D_SERVICE_MESSAGE_EVENT,
+            {
+                "event": D2D_SERVICE_MESSAGE_EVENT,
+                "data": json.dumps({"event": "matte_changed", "content_id": "MY_F0001"}),
+            },
+        )
+
+        assert (await first)["event"] == "ms.channel.clientConnect"
+        message = await second
+        assert message == {
+            "tv": "10.0.0.1",
+            "channel": "art",
+            "event": D2D_SERVICE_MESSAGE_EVENT,
+            "sub_event": "matte_changed",
+            "data": {"event": "matte_changed", "content_id": "MY_F0001"},
+        }
+        assert (await next_event(everything))["sub_event"] == "matte_changed"
+        await everything.aclose()
+        await matte_changes.aclose()
+        await broker.close()
+
+
+@pytest.mark.asyncio
+async def test_dropped_tv_is_reconnected_at_once(tmp_path) -> None:
+    """Ensure a dropped connection is reopened without waiting for the retry interval."""
+    closed = asyncio.get_running_loop().create_future()
+    reconnected = asyncio.Event()
+
+    async def start(tv: SamsungTV, callback=None) -> None:
+        connection = Mock(state=State.OPEN)
+        if closed.done():
+            reconnected.set()
+            connection.wait_closed = asyncio.Event().wait
+        else:
+            connection.wait_closed = Mock(return_value=closed)
+        tv.remote.connection = tv.art.connection = connection
+
+    with patch.object(SamsungTV, "start", autospec=True, side_effect=start), patch.object(
+        SamsungTV, "close", AsyncMock()
+    ), patch("asyncio.sleep", _SLEEP):
+        broker = EventBroker(["10.0.0.1"], path=str(tmp_path / "broker.sock"))
+        await broker.start()
+        await _SLEEP(0)
+        tv = broker.tvs["10.0.0.1"]
+        tv.remote.connection.state = State.CLOSED
+        closed.set_result(None)
+        await asyncio.wait_for(reconnected.wait(), 1)
+        await broker.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_messages() -> None:
+    subscriber = _Subscriber(Mock(), queue_size=2)
+    for data in (b"1\n", b"2\n", b"3\n"):
+        subscriber.put(data)
+    assert subscriber.dropped == 1
+    assert [subscriber.queue.get_nowait() for _ in range(2)] == [b"2\n", b"3\n"]
@@ -0,0 +1,97 @@
+"""Tests for emulator module."""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from samsungtvws import exceptions
+from samsungtvws.art import SamsungTVArt
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.async_rest import SamsungTVAsyncRest
+from samsungtvws.emulator import DROP, ERROR, FakeSamsungTV
+from samsungtvws.remote import SendRemoteKey
+
+
+@pytest.mark.asyncio
+async def test_remote_and_rest(fake_tv: FakeSamsungTV) -> None:
+    """Ensure the real async clients work against the emulator."""
+    async with SamsungTVWSAsyncRemote(
+        fake_tv.host, port=fake_tv.port, key_press_delay=0
+    ) as remote:
+        await remote.start_listening()
+        await remote.send_command(SendRemoteKey.click("KEY_POWER"))
+        apps = await remote.app_list()
+    assert fake_tv.keys == ["KEY_POWER"]
+    assert [app["name"] for app in apps] == ["YouTube", "Netflix"]
+
+    async with aiohttp.ClientSession() as session:
+        rest = SamsungTVAsyncRest(fake_tv.host, port=fake_tv.port, session=session)
+        info = await rest.rest_device_info()
+    assert info["device"]["FrameTVSupport"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_art_requests_and_transfers(fake_tv: FakeSamsungTV) -> None:
+    """Ensure art requests, uploads and thumbnails go end to end."""
+    tv_art = SamsungTVAsyncArt(fake_tv.host, port=fake_tv.port, check_token=False)
+    try:
+        assert await tv_art.get_api_generation() == 1
+        assert len(await tv_art.available("MY-C0002")) == 10
+        await tv_art.select_image("MY_F0003")
+        assert (await tv_art.get_current())["content_id"] == "MY_F0003"
+
+        content_id = await tv_art.upload(b"\x89PNG" * 100000, file_type="png")
+        assert fake_tv.uploads[content_id] == b"\x89PNG" * 100000
+
+        thumbnails, failures = await tv_art.get_thumbnails(["MY_F0001", content_id])
+        assert not failures
+        assert thumbnails[content_id] == fake_tv.thumbnail(content_id)
+    finally:
+        await tv_art.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_client(fake_tv: FakeSamsungTV) -> None:
+    """Ensure the blocking client works from a thread."""
+
+    def run():
+        tv_art = SamsungTVArt(fake_tv.host, port=fake_tv.port, timeout=5)
+        try:
+            return tv_art.get_api_version(), tv_art.get_thumbnail("MY_F0002")
+        finally:
+            tv_art.close()
+
+    version, thumbnail = await asyncio.to_thread(run)
+    assert version == fake_tv.api_version
+    assert thumbnail == fake_tv.thumbnail("MY_F0002")
+
+
+@pytest.mark.asyncio
+async def test_failure_injection_and_latency() -> None:
+    """Ensure injected errors, drops and latency reach the client."""
+    async with FakeSamsungTV(
+        latency=0.05, failures={"set_brightness": ERROR, "get_brightness": DROP}
+    ) as fake_tv:
+        tv_art = SamsungTVAsyncArt(fake_tv.host, port=fake_tv.port, check_token=False)
+        try:
+            started = time.monotonic()
+            assert await tv_art.get_artmode() == "on"
+            assert time.monotonic() - started >= 0.05
+            with pytest.raises(exceptions.ResponseError, match="error number -1"):
+                await tv_art.set_brightness(3)
+            assert await tv_art._send_art_request({"request": "get_brightness"}, timeout=0.2) is None
+        finally:
+            await tv_art.close()
+
+
+@pytest.mark.asyncio
+async def test_close_stops_unused_d2d_listeners() -> None:
+    """Ensure a D2D listener nobody connected to is closed with the emulator."""
+    async with FakeSamsungTV() as fake_tv:
+        conn_info = await fake_tv._open_d2d(None)
+
+    with pytest.raises(OSError):
+        await asyncio.open_connection(conn_info["ip"], int(conn_info["port"]))
@@ -0,0 +1,148 @@
+"""Tests for fleet module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from websockets.protocol import State
+
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.async_tv import SamsungTV
+from samsungtvws.fleet import SamsungTVFleet
+
+_SLEEP = asyncio.sleep
+
+
+async def fake_start(tv: SamsungTV) -> None:
+    tv.remote.connection = Mock(state=State.OPEN)
+    tv.art.connection = Mock(state=State.OPEN)
+
+
+async def fake_close(tv: SamsungTV) -> None:
+    tv.remote.connection = None
+    tv.art.connection = None
+
+
+@pytest.fixture(name="fleet_tv")
+def mock_fleet_tv():
+    with patch.object(SamsungTV, "start", autospec=True, side_effect=fake_start) as start, patch.object(
+        SamsungTV, "close", autospec=True, side_effect=fake_close
+    ) as close, patch.object(SamsungTVAsyncArt, "get_token"):
+        yield start, close
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limits(fleet_tv) -> None:
+    """Ensure operations stay within the global and per host limits."""
+    in_flight = {"total": 0, "max": 0, "hosts": set()}
+
+    async def operation(tv: SamsungTV) -> str:
+        assert tv.host not in in_flight["hosts"]
+        in_flight["hosts"].add(tv.host)
+        in_flight["total"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["total"])
+        await _SLEEP(0.01)
+        in_flight["total"] -= 1
+        in_flight["hosts"].remove(tv.host)
+        return tv.host
+
+    async with SamsungTVFleet(max_concurrency=3, per_host_concurrency=1) as fleet:
+        hosts = [f"10.0.0.{i}" for i in range(6)]
+        results = await asyncio.gather(
+            *(fleet.run(host, operation) for host in hosts * 2)
+        )
+
+    assert results == hosts * 2
+    assert in_flight["max"] == 3
+    start, _ = fleet_tv
+    assert start.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_busy_tv_does_not_starve_others(fleet_tv) -> None:
+    """Ensure operations queued for a busy TV hold no fleet slot."""
+    release = asyncio.Event()
+
+    async def blocked(tv: SamsungTV) -> None:
+        await release.wait()
+
+    async with SamsungTVFleet(max_concurrency=2, per_host_concurrency=1) as fleet:
+        busy = [
+            asyncio.ensure_future(fleet.run("10.0.0.1", blocked)) for _ in range(3)
+        ]
+        result = await asyncio.wait_for(
+            fleet.run("10.0.0.2", AsyncMock(return_value="done")), 1
+        )
+        release.set()
+        await asyncio.gather(*busy)
+
+    assert result == "done"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_returns_outcomes_per_host(fleet_tv) -> None:
+    async with SamsungTVFleet() as fleet:
+        for host in ("10.0.0.1", "10.0.0.2"):
+            fleet.add(host)
+        with patch.object(
+            SamsungTVWSAsyncRemote,
+            "send_command",
+            AsyncMock(side_effect=[None, ConnectionError("off")]),
+        ):
+            results = dict([result async for result in fleet.send_key_all("KEY_POWER")])
+
+        with patch.object(SamsungTVAsyncArt, "select_image", autospec=True) as select_image:
+            select_image.return_value = None
+            results2 = [
+                result
+                async for result in fleet.select_image_all({"10.0.0.2": "MY_F0002"})
+            ]
+
+    assert len(results) == 2
+    assert sum(isinstance(outcome, ConnectionError) for outcome in results.values()) == 1
+    assert results2 == [("10.0.0.2", None)]
+    assert select_image.call_args.args[1:] == ("MY_F0002",)
+
+
+@pytest.mark.asyncio
+async def test_idle_tvs_are_closed_and_reopened(fleet_tv) -> None:
+    start, close = fleet_tv
+    async with SamsungTVFleet(idle_timeout=0) as fleet:
+        await fleet.run("10.0.0.1", AsyncMock())
+        await fleet.close_idle()
+        assert close.call_count == 1
+        await fleet.run("10.0.0.1", AsyncMock())
+        assert start.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_waits_for_idle_close(fleet_tv) -> None:
+    """Ensure a TV being closed as idle is reconnected, not used while closing."""
+    start, close = fleet_tv
+    closing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_close(tv: SamsungTV) -> None:
+        closing.set()
+        await release.wait()
+        await fake_close(tv)
+
+    async def operation(tv: SamsungTV) -> bool:
+        return tv.remote.is_alive()
+
+    close.side_effect = slow_close
+    async with SamsungTVFleet(idle_timeout=0) as fleet:
+        await fleet.run("10.0.0.1", AsyncMock())
+        idle = asyncio.ensure_future(fleet.close_idle())
+        await closing.wait()
+        used = asyncio.ensure_future(fleet.run("10.0.0.1", operation))
+        await _SLEEP(0.01)
+        waited = not used.done()
+        release.set()
+        assert await used
+        await idle
+
+    assert waited
+
+    assert start.call_count == 2
@@ -1,11 +1,56 @@
 """Tests for helper module."""
 
-from samsungtvws.helper import process_api_response
+import json
 
-from .const import ED_APPS_LAUNCH_SAMPLE
+from samsungtvws.helper import iter_content_list, process_api_response
+
+from .const import D2D_SERVICE_MESSAGE_AVAILABLE_SAMPLE, ED_APPS_LAUNCH_SAMPLE
 
 
 def test_data_simple() -> None:
     """Ensure simple data can be parsed."""
     parsed_response = process_api_response(ED_APPS_LAUNCH_SAMPLE)
     assert parsed_response == {"data": 200, "event": "ed.apps.launch", "from": "host"}
+
+
+def test_iter_content_list() -> None:
+    """Ensure content list entries are filtered and projected while parsing."""
+    content_list = json.loads(
+        json.loads(D2D_SERVICE_MESSAGE_AVAILABLE_SAMPLE)["data"]
+    )["content_list"]
+
+    entries = list(iter_content_list(content_list, "MY-C0003", ["content_id"]))
+
+    assert entries == [
+        {"content_id": v["content_id"]}
+        for v in json.loads(content_list)
+        if v["category_id"] == "MY-C0003"
+    ]
+    assert list(iter_content_list(content_list)) == json.loads(content_list)
+
+
+def test_iter_content_list_nested() -> None:
+    """Ensure braces in values and nested objects are parsed correctly."""
+    content_list = json.dumps(
+        [
+            {"category_id": "MY-C0002", "content_id": "a", "title": "{x}"},
+            {"category_id": "MY-C0003", "content_id": "b", "extra": {"c": 1}},
+            {"category_id": "MY-C0002", "content_id": "c"},
+        ]
+    )
+
+    assert [v["content_id"] for v in iter_content_list(content_list, "MY-C0002")] == [
+        "a",
+        "c",
+    ]
+    assert len(list(iter_content_list(content_list))) == 3
+
+
+def test_iter_content_list_escapes() -> None:
+    """Ensure backslashes and braces inside strings don't end an entry early."""
+    content_list = r'[{"content_id": "a\\", "title": "}x"}, {"content_id": "b\"}", "category_id": "MY-C0002"}]'
+
+    assert list(iter_content_list(content_list)) == json.loads(content_list)
+    assert [v["content_id"] for v in iter_content_list(content_list, "MY-C0002")] == [
+        'b"}'
+    ]
@@ -0,0 +1,62 @@
+"""Tests for image_hash module."""
+
+import io
+import random
+
+import pytest
+
+from samsungtvws.image_hash import BKTree, HashStore, dhash, hamming, match_hashes
+
+
+def test_bktree_search() -> None:
+    """Ensure the tree returns every item within the distance, nearest first."""
+    random.seed(1)
+    values = {f"c{i}": random.getrandbits(64) for i in range(500)}
+    tree: BKTree[str] = BKTree()
+    for key, value in values.items():
+        tree.add(value, key)
+    query = values["c7"] ^ 0b101
+
+    found = tree.search(query, 20)
+
+    assert found[0] == (2, "c7")
+    assert sorted(key for _, key in found) == sorted(
+        key for key, value in values.items() if hamming(query, value) <= 20
+    )
+
+
+def test_match_hashes_claims_each_target_once() -> None:
+    matches = match_hashes(
+        {"a.jpg": 0b1111, "b.jpg": 0b1110, "c.jpg": 0xFFFF0000},
+        {"MY_F0001": 0b1111, "MY_F0002": 0b0110},
+        max_distance=3,
+    )
+    assert matches == {"a.jpg": "MY_F0001", "b.jpg": "MY_F0002"}
+
+
+def test_dhash_matches_thumbnail(tmp_path) -> None:
+    """Ensure a file and its downscaled jpeg thumbnail hash alike."""
+    image_module = pytest.importorskip("PIL.Image")
+    image = image_module.linear_gradient("L").resize((400, 300)).convert("RGB")
+    path = str(tmp_path / "gradient.png")
+    image.save(path)
+    thumbnail = io.BytesIO()
+    image.resize((160, 120)).save(thumbnail, "JPEG", quality=70)
+
+    store = HashStore(str(tmp_path / "hashes.json"))
+    file_hash = store.hash_file(path)
+    store.save()
+
+    assert hamming(file_hash, dhash(thumbnail.getvalue())) <= 4
+    assert HashStore(str(tmp_path / "hashes.json")).hash_file(path) == file_hash
+
+
+def test_dhash_leaves_caller_image_unchanged() -> None:
+    """Ensure a PIL image passed in is not downscaled by draft()."""
+    image_module = pytest.importorskip("PIL.Image")
+    data = io.BytesIO()
+    image_module.linear_gradient("L").resize((400, 300)).save(data, "JPEG")
+    image = image_module.open(io.BytesIO(data.getvalue()))
+
+    assert hamming(dhash(image), dhash(data.getvalue())) <= 2
+    assert image.size == (400, 300)
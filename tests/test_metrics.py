@@ -0,0 +1,81 @@
+"""Tests for metrics module."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from samsungtvws import exceptions, metrics
+from samsungtvws.remote import SamsungTVWS
+
+from .const import MS_CHANNEL_CONNECT_SAMPLE, MS_ERROR_SAMPLE
+
+
+@pytest.fixture(name="enabled_metrics")
+def get_enabled_metrics():
+    yield metrics.enable(metrics.Metrics())
+    metrics.disable()
+
+
+def test_histogram_percentiles() -> None:
+    """Ensure percentiles stay within the histogram's relative error."""
+    histogram = metrics.Histogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+    assert histogram.count == 1000
+    for quantile in (0.5, 0.9, 0.99):
+        assert histogram.percentile(quantile) == pytest.approx(quantile, rel=1 / 32)
+    assert histogram.percentile(1) == 1
+
+
+def test_hooks_do_nothing_when_disabled() -> None:
+    assert metrics.start() is None
+    metrics.observe(metrics.ART_REQUEST_SECONDS, None, "127.0.0.1")
+    metrics.increment(metrics.WS_COMMANDS, "127.0.0.1")
+    assert metrics.get_metrics() is None
+    assert metrics.format_prometheus() == ""
+
+
+def test_connections_and_commands_are_counted(
+    connection: Mock, enabled_metrics: metrics.Metrics
+) -> None:
+    connection.recv = Mock(side_effect=[MS_CHANNEL_CONNECT_SAMPLE, MS_ERROR_SAMPLE])
+    with patch("samsungtvws.rest.SamsungTVRest.get_model_year", return_value=0):
+        tv = SamsungTVWS("127.0.0.1")
+    tv.send_key("KEY_POWER")
+    tv.close()
+    with pytest.raises(exceptions.ConnectionFailure):
+        tv.open()
+
+    snapshot = enabled_metrics.snapshot()
+    counters = {c["name"]: c for c in snapshot["counters"]}
+    assert counters[metrics.WS_CONNECTS]["labels"] == {
+        "host": "127.0.0.1",
+        "endpoint": "samsung.remote.control",
+    }
+    assert counters[metrics.WS_COMMANDS]["value"] == 1
+    assert counters[metrics.WS_CONNECT_ERRORS]["value"] == 1
+    [connect] = snapshot["histograms"]
+    assert connect["name"] == metrics.WS_CONNECT_SECONDS and connect["count"] == 1
+
+    text = metrics.format_prometheus(snapshot)
+    assert "# TYPE samsungtvws_ws_connect_seconds summary" in text
+    assert (
+        'samsungtvws_ws_commands_total{host="127.0.0.1",endpoint="samsung.remote.control"} 1'
+        in text
+    )
+
+
+def test_reconnects_and_throughput(enabled_metrics: metrics.Metrics) -> None:
+    labels = ("127.0.0.1", "com.samsung.art-app", "")
+    enabled_metrics.connected(labels, 0.1)
+    enabled_metrics.connected(labels, 0.1)
+    enabled_metrics.observe(
+        metrics.D2D_TRANSFER_SECONDS, ("127.0.0.1", "com.samsung.art-app", "upload"), 2
+    )
+    metrics.increment(
+        metrics.D2D_BYTES, "127.0.0.1", "com.samsung.art-app", "upload", 4000000
+    )
+    snapshot = enabled_metrics.snapshot()
+    counters = {c["name"]: c["value"] for c in snapshot["counters"]}
+    assert counters[metrics.WS_RECONNECTS] == 1
+    assert metrics.throughput(snapshot) == {("127.0.0.1", "upload"): 2000000}
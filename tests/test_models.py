@@ -0,0 +1,63 @@
+"""Tests for models module."""
+
+import sys
+
+from samsungtvws.models import ArtContent, Matte, PhotoFilter
+
+
+def test_art_content_round_trip() -> None:
+    """Ensure records keep unknown keys and give back the original dict."""
+    data = {
+        "content_id": "MY_F0001",
+        "category_id": "MY-C0004",
+        "matte_id": "shadowbox_polar",
+        "width": 3840,
+        "height": 2160,
+        "content_type": "mobile",
+        "slideshow": "false",
+        "tag": "x",
+    }
+    record = ArtContent.from_dict(data)
+
+    assert record.to_dict() == data
+    assert record.extra == {"tag": "x"}
+    assert record.content_id == "MY_F0001"
+    assert record.portrait_matte_id is None
+    assert record.favourite
+    assert record == ArtContent.from_dict(dict(data))
+    assert not hasattr(record, "__dict__")
+
+
+def test_explicit_nulls_round_trip() -> None:
+    """Ensure keys the TV sent as null are kept apart from absent ones."""
+    data = {"content_id": "MY_F0001", "matte_id": None, "tag": None}
+    record = ArtContent.from_dict(data)
+
+    assert record.to_dict() == data
+    assert record.matte_id is None and record.portrait_matte_id is None
+    assert record != ArtContent.from_dict({"content_id": "MY_F0001", "tag": None})
+
+
+def test_favourite_flag() -> None:
+    """Ensure an is_favorite key overrides the category."""
+    record = ArtContent.from_dict(
+        {"content_id": "a", "category_id": "MY-C0002", "is_favorite": "true"}
+    )
+
+    assert record.favourite
+    assert record.extra is None
+    assert not ArtContent.from_dict({"content_id": "b", "category_id": "MY-C0002"}).favourite
+
+
+def test_strings_are_interned() -> None:
+    """Ensure repeated category and matte strings are shared."""
+    first = ArtContent.from_dict({"content_id": "a", "matte_id": "".join(["no", "ne"])})
+    second = ArtContent.from_dict({"content_id": "b", "matte_id": "".join(["n", "one"])})
+
+    assert first.matte_id is second.matte_id is sys.intern("none")
+
+
+def test_matte_and_filter() -> None:
+    assert Matte.from_dict({"matte_type": "shadowbox"}).matte_type == "shadowbox"
+    photo_filter = PhotoFilter.from_dict({"filter_id": "ink", "filter_name": "INK"})
+    assert photo_filter.to_dict() == {"filter_id": "ink", "filter_name": "INK"}
@@ -0,0 +1,99 @@
+"""Tests for preprocess module."""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from samsungtvws import preprocess
+from samsungtvws.preprocess import ImagePreprocessor, prepare_image
+from samsungtvws.sync import DirectorySync
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def noise(size) -> "Image.Image":
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+def test_prepare_image_fits_and_rotates(tmp_path) -> None:
+    """Ensure images are shrunk to fit, and turned upright from their EXIF."""
+    source = str(tmp_path / "camera.png")
+    exif = Image.Exif()
+    exif[preprocess.EXIF_ORIENTATION] = 6
+    noise((800, 400)).save(source, exif=exif)
+    output = str(tmp_path / "out.jpg")
+
+    assert prepare_image(source, output, max_size=(200, 100))
+
+    with Image.open(output) as image:
+        assert image.format == "JPEG"
+        assert image.size == (100, 200)
+
+
+def test_prepare_image_copies_small_jpeg(tmp_path) -> None:
+    source = str(tmp_path / "small.jpg")
+    noise((100, 50)).save(source)
+    output = str(tmp_path / "out.jpg")
+
+    assert not prepare_image(source, output, max_size=(200, 100))
+
+    with open(source, "rb") as a, open(output, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_prepare_image_max_bytes(tmp_path) -> None:
+    """Ensure quality is lowered until the jpeg fits in max_bytes."""
+    source = str(tmp_path / "big.png")
+    noise((300, 200)).save(source)
+    output = str(tmp_path / "out.jpg")
+    prepare_image(source, output, quality=95)
+    max_bytes = os.path.getsize(output) * 2 // 3
+
+    prepare_image(source, output, quality=95, max_bytes=max_bytes)
+
+    assert os.path.getsize(output) <= max_bytes
+
+
+@pytest.mark.asyncio
+async def test_preprocessor_caches_by_source_hash(tmp_path) -> None:
+    """Ensure each source is only converted once, even when renamed."""
+    source = tmp_path / "a.png"
+    noise((400, 200)).save(source)
+    with ThreadPoolExecutor() as executor, patch.object(
+        preprocess, "prepare_image", wraps=prepare_image
+    ) as convert:
+        preprocessor = ImagePreprocessor(
+            str(tmp_path / "cache"), max_size=(200, 100), executor=executor
+        )
+        outputs, failures = await preprocessor.prepare_many(
+            [str(source), str(source)]
+        )
+        os.rename(source, tmp_path / "b.png")
+        output = await preprocessor.prepare(str(tmp_path / "b.png"))
+
+    assert convert.call_count == 1
+    assert outputs == {str(source): output} and not failures
+    assert output.endswith(".jpg")
+
+
+@pytest.mark.asyncio
+async def test_directory_sync_uploads_preprocessed(tmp_path) -> None:
+    folder = tmp_path / "images"
+    folder.mkdir()
+    noise((400, 200)).save(folder / "a.png")
+    (folder / "b.jpg").write_bytes(b"not an image")
+    tv = Mock()
+    tv.upload = AsyncMock(return_value="MY_F0001")
+    tv.delete_list = AsyncMock()
+
+    with ThreadPoolExecutor() as executor:
+        preprocessor = ImagePreprocessor(str(tmp_path / "cache"), executor=executor)
+        sync = DirectorySync(tv, str(folder), preprocessor=preprocessor)
+        await sync.sync()
+
+    path = tv.upload.await_args.args[0]
+    assert tv.upload.await_count == 1
+    assert path.startswith(str(tmp_path / "cache")) and path.endswith(".jpg")
+    assert sync.manifest.content_ids() == {"a.png": "MY_F0001"}
@@ -0,0 +1,128 @@
+"""Tests for proxy module."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, call, patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from websockets.protocol import State
+
+from samsungtvws import exceptions
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.async_tv import SamsungTV
+from samsungtvws.fleet import SamsungTVFleet
+from samsungtvws.models import PhotoFilter
+from samsungtvws.proxy import SamsungTVProxy, main
+from samsungtvws.proxy_client import ProxyClient
+
+
+async def fake_start(tv: SamsungTV) -> None:
+    tv.remote.connection = Mock(state=State.OPEN)
+    tv.art.connection = Mock(state=State.OPEN)
+
+
+async def request(proxy: SamsungTVProxy, method: str, path: str, body=None):
+    connector = aiohttp.UnixConnector(path=proxy.path)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.request(method, f"http://proxy{path}", json=body) as response:
+            return response.status, await response.json()
+
+
+@pytest_asyncio.fixture(name="proxy")
+async def get_proxy(tmp_path):
+    with patch.object(SamsungTV, "start", autospec=True, side_effect=fake_start), patch.object(
+        SamsungTV, "close", autospec=True
+    ), patch.object(SamsungTVAsyncArt, "get_token"):
+        proxy = SamsungTVProxy(SamsungTVFleet(), path=str(tmp_path / "proxy.sock"))
+        await proxy.start()
+        yield proxy
+        await proxy.close()
+
+
+@pytest.mark.asyncio
+async def test_commands_reuse_open_connection(proxy) -> None:
+    """Ensure commands from separate clients go over one connection per TV."""
+    client = ProxyClient(path=proxy.path)
+    with patch.object(
+        SamsungTVWSAsyncRemote, "send_command", AsyncMock()
+    ) as send_command, patch.object(
+        SamsungTVAsyncArt, "select_image", AsyncMock(return_value=None)
+    ) as select_image:
+        await asyncio.to_thread(client.send_key, "10.0.0.1", "KEY_POWER")
+        await asyncio.to_thread(client.send_key, "10.0.0.1", "KEY_POWER")
+        await asyncio.to_thread(
+            client.art, "10.0.0.1", "select_image", content_id="MY_F0001", show=False
+        )
+
+    assert send_command.await_count == 2
+    assert send_command.call_args.args[0].params["DataOfCmd"] == "KEY_POWER"
+    select_image.assert_awaited_once_with(content_id="MY_F0001", show=False)
+    assert SamsungTV.start.call_count == 1
+    assert await asyncio.to_thread(client.tvs) == ["10.0.0.1"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_returned_to_client(proxy) -> None:
+    client = ProxyClient(path=proxy.path)
+    with patch.object(
+        SamsungTVAsyncArt,
+        "get_artmode",
+        AsyncMock(side_effect=exceptions.ResponseError("error number -1")),
+    ):
+        with pytest.raises(exceptions.HttpApiError, match="ResponseError"):
+            await asyncio.to_thread(client.art, "10.0.0.1", "get_artmode")
+        assert (
+            await asyncio.to_thread(
+                main, ["--socket", proxy.path, "art", "10.0.0.1", "get_artmode"]
+            )
+            == 1
+        )
+    with pytest.raises(exceptions.HttpApiError, match="Unknown art method"):
+        await asyncio.to_thread(client.art, "10.0.0.1", "upload")
+
+
+@pytest.mark.asyncio
+async def test_error_statuses(proxy) -> None:
+    """Ensure bad arguments answer 400 and errors from the TV answer 502."""
+    with patch.object(
+        SamsungTVAsyncArt, "set_brightness", autospec=True, side_effect=ValueError("bad")
+    ) as set_brightness:
+        status, data = await request(
+            proxy, "POST", "/tvs/10.0.0.1/art/set_brightness", {"level": 5}
+        )
+        assert status == 400 and data["error"] == "TypeError"
+        set_brightness.assert_not_called()
+        status, data = await request(
+            proxy, "POST", "/tvs/10.0.0.1/art/set_brightness", {"value": 5}
+        )
+        assert (status, data["error"]) == (502, "ValueError")
+    status, _ = await request(proxy, "POST", "/tvs/10.0.0.1/key", {})
+    assert status == 400
+
+
+@pytest.mark.asyncio
+async def test_results_are_fresh_and_serialized(proxy) -> None:
+    """Ensure device info is fetched on every request and records are sent as dicts."""
+    with patch.object(
+        SamsungTV, "device_info", AsyncMock(return_value={"device": {}})
+    ) as device_info, patch.object(
+        SamsungTVAsyncArt,
+        "get_photo_filter_list",
+        AsyncMock(return_value=[PhotoFilter.from_dict({"filter_id": "ink"})]),
+    ):
+        await request(proxy, "GET", "/tvs/10.0.0.1/device_info")
+        await request(proxy, "GET", "/tvs/10.0.0.1/device_info")
+        status, data = await request(
+            proxy, "POST", "/tvs/10.0.0.1/art/get_photo_filter_list", {"as_records": True}
+        )
+
+    assert device_info.await_args_list == [call(refresh=True)] * 2
+    assert (status, data["result"]) == (200, [{"filter_id": "ink"}])
+
+
+def test_client_without_proxy(tmp_path) -> None:
+    client = ProxyClient(path=str(tmp_path / "missing.sock"))
+    with pytest.raises(exceptions.ConnectionFailure):
+        client.send_key("10.0.0.1", "KEY_POWER")
@@ -0,0 +1,97 @@
+"""Tests for reconcile module."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from samsungtvws.art_batch import ArtOperation
+from samsungtvws.reconcile import DesiredState, Reconciler
+
+CONTENT = [
+    {"content_id": "MY_F0001", "category_id": "MY-C0002", "matte_id": "none"},
+    {"content_id": "MY_F0002", "category_id": "MY-C0002", "matte_id": "shadowbox_polar"},
+    {"content_id": "MY_F0002", "category_id": "MY-C0004", "matte_id": "shadowbox_polar"},
+    {"content_id": "MY_F0003", "category_id": "MY-C0002", "matte_id": "none"},
+]
+
+DOCUMENT = {
+    "art": {
+        "MY_F0001": {"matte_id": "shadowbox_polar", "favourite": True},
+        "MY_F0002": {"matte_id": "shadowbox_polar", "favourite": True},
+        "MY_F0004": {},
+    },
+    "exclusive": True,
+    "slideshow": {"duration": 15, "shuffle": True, "category": 2},
+}
+
+
+def mock_tv(slideshow_value: str = "off") -> Mock:
+    tv = Mock(catalog=None)
+    tv.available = AsyncMock(return_value=CONTENT)
+    tv.get_matte_list = AsyncMock(
+        return_value=([{"matte_type": "shadowbox"}], [{"color": "polar"}])
+    )
+    tv.get_slideshow_status = AsyncMock(
+        return_value={
+            "value": slideshow_value,
+            "category_id": "MY-C0002",
+            "type": "shuffleslideshow",
+        }
+    )
+    tv.run_batch = AsyncMock(side_effect=lambda operations, **kwargs: [None] * len(operations))
+    tv.set_slideshow_status = AsyncMock()
+    return tv
+
+
+@pytest.mark.asyncio
+async def test_plan_is_minimal_diff() -> None:
+    """Ensure only changes that are not in place yet are planned."""
+    tv = mock_tv()
+
+    plan, outcomes = await Reconciler(tv).reconcile(
+        DesiredState.from_dict(DOCUMENT), dry_run=True
+    )
+
+    assert plan.operations == [
+        ArtOperation.change_matte("MY_F0001", "shadowbox_polar"),
+        ArtOperation.set_favourite("MY_F0001", "on"),
+        ArtOperation.delete("MY_F0003"),
+    ]
+    assert plan.missing == ["MY_F0004"]
+    assert plan.slideshow is not None and plan.slideshow.duration == 15
+    assert outcomes == []
+    tv.run_batch.assert_not_awaited()
+    tv.set_slideshow_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_applies_plan_and_skips_unknown_mattes() -> None:
+    tv = mock_tv()
+    desired = DesiredState.from_dict(
+        {"art": {"MY_F0001": {"matte_id": "flexible_ink"}, "MY_F0003": {"favourite": True}}}
+    )
+
+    plan, outcomes = await Reconciler(tv).reconcile(desired)
+
+    assert plan.skipped == {"MY_F0001": "unknown matte flexible_ink"}
+    tv.run_batch.assert_awaited_once_with(
+        [ArtOperation.set_favourite("MY_F0003", "on")], concurrency=8
+    )
+    assert outcomes == [None]
+    tv.get_slideshow_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_in_place_costs_one_read() -> None:
+    """Ensure nothing is sent when the TV is already in the desired state."""
+    tv = mock_tv(slideshow_value="15")
+    desired = DesiredState.from_dict(
+        {"art": {"MY_F0002": {"matte_id": "shadowbox_polar", "favourite": True}}}
+    )
+
+    plan, _ = await Reconciler(tv).reconcile(desired)
+
+    assert not plan
+    tv.available.assert_awaited_once()
+    tv.get_matte_list.assert_not_awaited()
+    tv.run_batch.assert_not_awaited()
@@ -0,0 +1,69 @@
+"""Tests for recorder module."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from samsungtvws import recorder
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.remote import SamsungTVWS
+
+from .const import MS_CHANNEL_CONNECT_SAMPLE
+
+
+@pytest.fixture(name="dumps")
+def get_dumps():
+    dumps = []
+    recorder.enable(size=3, max_payload=10, on_dump=lambda *dump: dumps.append(dump))
+    yield dumps
+    recorder.disable()
+
+
+def test_ring_buffer_keeps_last_frames() -> None:
+    flight_recorder = recorder.FlightRecorder(size=2, max_payload=4)
+    for payload in ("first", "second", "3"):
+        flight_recorder.record(recorder.OUTBOUND, payload)
+    frames = flight_recorder.dump()
+    assert [frame["payload"] for frame in frames] == ["seco", "3"]
+    assert [frame["size"] for frame in frames] == [6, 1]
+    assert [frame["truncated"] for frame in frames] == [True, False]
+
+
+def test_compressed_payloads_are_kept_whole() -> None:
+    flight_recorder = recorder.FlightRecorder(max_payload=4, compress=True)
+    flight_recorder.record(recorder.INBOUND, "a long payload")
+    flight_recorder.record(recorder.INBOUND, b"\xff\x00")
+    [text, binary] = flight_recorder.dump()
+    assert text["payload"] == "a long payload" and not text["truncated"]
+    assert binary["payload"] == b"\xff\x00"
+    assert "ff00" in flight_recorder.format()
+
+
+def test_frames_are_recorded(connection: Mock, dumps: list) -> None:
+    connection.recv = Mock(side_effect=[MS_CHANNEL_CONNECT_SAMPLE])
+    with patch("samsungtvws.rest.SamsungTVRest.get_model_year", return_value=0):
+        tv = SamsungTVWS("127.0.0.1")
+    tv.send_key("KEY_POWER")
+    frames = tv.recorder.dump()
+    assert [frame["direction"] for frame in frames] == [
+        recorder.INBOUND,
+        recorder.OUTBOUND,
+    ]
+    assert frames[0]["size"] == len(MS_CHANNEL_CONNECT_SAMPLE)
+    assert not dumps
+
+
+def test_disabled_by_default() -> None:
+    with patch("samsungtvws.rest.SamsungTVRest.get_model_year", return_value=0):
+        assert SamsungTVWS("127.0.0.1").recorder is None
+
+
+@pytest.mark.asyncio
+async def test_dump_on_art_timeout(dumps: list) -> None:
+    with patch.object(SamsungTVAsyncArt, "get_token"):
+        tv_art = SamsungTVAsyncArt("127.0.0.1")
+    tv_art.recorder.record(recorder.OUTBOUND, "request")
+    assert await tv_art.wait_for_response("123", timeout=0.01) is None
+    [(reason, frames)] = dumps
+    assert reason == "Art request timed out"
+    assert frames[0]["payload"] == "request"
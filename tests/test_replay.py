@@ -0,0 +1,73 @@
+"""Tests for replay module."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from samsungtvws import recorder
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.emulator import FakeSamsungTV
+from samsungtvws.replay import ReplayServer, load_capture, main, run_load
+
+
+async def capture_session(fake_tv: FakeSamsungTV, path: str) -> None:
+    recorder.start_capture(path)
+    try:
+        tv_art = SamsungTVAsyncArt(
+            fake_tv.host, port=fake_tv.port, key_press_delay=0, check_token=False
+        )
+        try:
+            await tv_art.start_listening()
+            for content_id in ("MY_F0001", "MY_F0002", "MY_F0003"):
+                await tv_art.select_image(content_id)
+            await tv_art.upload(b"\x89PNG" * 1000, file_type="png")
+            await tv_art.get_thumbnail_list(["MY_F0001", "MY_F0002"])
+        finally:
+            await tv_art.close()
+    finally:
+        recorder.stop_capture()
+
+
+@pytest.mark.asyncio
+async def test_capture(fake_tv: FakeSamsungTV, tmp_path: Path) -> None:
+    """Ensure websocket frames and D2D transfers are captured."""
+    path = str(tmp_path / "session.jsonl.gz")
+    await capture_session(fake_tv, path)
+    [connection] = load_capture(path)
+    assert connection.endpoint == "com.samsung.art-app"
+    assert connection.host == fake_tv.host
+    assert sum('"select_image' in payload for _, payload in connection.requests()) == 3
+    transfers = [f for f in connection.frames if f[1].startswith("D")]
+    assert [(f[1], f[4]) for f in transfers][0] == (recorder.D2D_OUTBOUND, 4000)
+    assert [f[1] for f in transfers[1:]] == [recorder.D2D_INBOUND] * 2
+    times = [frame[0] for frame in connection.frames]
+    assert times == sorted(times)
+
+
+@pytest.mark.asyncio
+async def test_replay_under_load(fake_tv: FakeSamsungTV, tmp_path: Path) -> None:
+    """Ensure concurrent clients replay a capture without errors."""
+    path = str(tmp_path / "session.jsonl.gz")
+    await capture_session(fake_tv, path)
+    connections = load_capture(path)
+
+    async with ReplayServer(connections, speed=10) as server:
+        report = await run_load(
+            connections, server.host, server.port, concurrency=3, speed=10
+        )
+    assert not report.errors
+    assert report.latencies["select_image"].count == 9
+    assert report.latencies["send_image"].count == 3
+    assert report.latencies["get_thumbnail_list"].count == 3
+    assert report.latencies["connect"].count == 3
+    assert "select_image" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_main_load(fake_tv: FakeSamsungTV, tmp_path: Path, capsys) -> None:
+    """Ensure the command line starts its own server for a load run."""
+    path = str(tmp_path / "session.jsonl.gz")
+    await capture_session(fake_tv, path)
+    assert await asyncio.to_thread(main, [path, "--speed", "20", "load", "-n", "2"]) == 0
+    assert "select_image" in capsys.readouterr().out
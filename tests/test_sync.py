@@ -0,0 +1,106 @@
+"""Tests for sync module."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from samsungtvws import sync as sync_module
+from samsungtvws.sync import DirectorySync, Manifest, scan
+
+
+def write(path, data: bytes, mtime_ns: int = 1_000_000_000) -> None:
+    with open(path, "wb") as image:
+        image.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_scan_hashes_only_changed_files(tmp_path) -> None:
+    """Ensure unchanged files are not read again."""
+    write(tmp_path / "a.jpg", b"a")
+    write(tmp_path / "b.png", b"b")
+    write(tmp_path / "notes.txt", b"c")
+    manifest = Manifest()
+
+    changes = scan(str(tmp_path), manifest)
+    assert changes.added == ["a.jpg", "b.png"]
+    manifest.files = {
+        name: dict(entry, content_id=name) for name, entry in changes.entries.items()
+    }
+
+    write(tmp_path / "b.png", b"B", mtime_ns=2_000_000_000)
+    with patch.object(
+        sync_module, "file_sha256", wraps=sync_module.file_sha256
+    ) as file_sha256:
+        changes = scan(str(tmp_path), manifest)
+
+    file_sha256.assert_called_once_with(str(tmp_path / "b.png"))
+    assert changes.modified == ["b.png"]
+    assert not changes.added and not changes.removed
+
+
+def test_scan_detects_renames(tmp_path) -> None:
+    write(tmp_path / "a.jpg", b"a")
+    manifest = Manifest()
+    manifest.files = {
+        name: dict(entry, content_id="MY_F0001")
+        for name, entry in scan(str(tmp_path), manifest).entries.items()
+    }
+    os.rename(tmp_path / "a.jpg", tmp_path / "z.jpg")
+
+    changes = scan(str(tmp_path), manifest)
+
+    assert changes.renamed == {"z.jpg": "a.jpg"}
+    assert not changes.added and not changes.removed
+
+
+@pytest.mark.asyncio
+async def test_directory_sync(tmp_path) -> None:
+    """Ensure changes are applied through the art api and saved."""
+    folder = tmp_path / "images"
+    folder.mkdir()
+    write(folder / "a.jpg", b"a")
+    write(folder / "b.jpg", b"b")
+    tv = Mock()
+    tv.upload = AsyncMock(side_effect=["MY_F0001", "MY_F0002", "MY_F0003"])
+    tv.delete_list = AsyncMock()
+    manifest_path = str(tmp_path / "manifest.json")
+
+    await DirectorySync(tv, str(folder), manifest_path).sync()
+    os.remove(folder / "a.jpg")
+    write(folder / "b.jpg", b"bb", mtime_ns=2_000_000_000)
+    sync = DirectorySync(tv, str(folder), manifest_path)
+    changes = await sync.sync()
+
+    assert changes.removed == ["a.jpg"] and changes.modified == ["b.jpg"]
+    tv.delete_list.assert_awaited_once_with(["MY_F0001", "MY_F0002"])
+    assert Manifest(manifest_path).content_ids() == {"b.jpg": "MY_F0003"}
+    assert not await sync.sync()
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_cancels_preprocessing(tmp_path) -> None:
+    """Ensure preprocessing of later files is not left running."""
+    write(tmp_path / "a.jpg", b"a")
+    write(tmp_path / "b.jpg", b"b")
+    cancelled = []
+
+    async def prepare(path: str, digest: str) -> str:
+        if path.endswith("b.jpg"):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(path)
+                raise
+        return path
+
+    tv = Mock()
+    tv.upload = AsyncMock(side_effect=ConnectionError)
+    preprocessor = Mock()
+    preprocessor.prepare = prepare
+
+    with pytest.raises(ConnectionError):
+        await DirectorySync(tv, str(tmp_path), preprocessor=preprocessor).sync()
+
+    assert cancelled == [str(tmp_path / "b.jpg")]
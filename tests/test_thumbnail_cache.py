@@ -0,0 +1,78 @@
+"""Tests for thumbnail_cache module."""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from samsungtvws.thumbnail_cache import ThumbnailCache
+
+JPEG = b"\xff\xd8\xff" + b"j" * 97
+PNG = b"\x89PNG\r\n\x1a\n" + b"p" * 92
+
+
+def test_put_get_and_reload(tmp_path) -> None:
+    """Ensure thumbnails survive a reload of the cache."""
+    cache = ThumbnailCache(str(tmp_path))
+    cache.put("127.0.0.1", "MY_F0001", JPEG)
+    cache.put("127.0.0.2", "MY_F0001", JPEG)
+
+    assert cache.total_bytes == len(JPEG)
+    cache = ThumbnailCache(str(tmp_path))
+    assert cache.get("127.0.0.1", "MY_F0001") == JPEG
+    assert cache.get("127.0.0.1", "MY_F0002") is None
+    assert len(cache) == 2
+
+
+def test_lru_eviction(tmp_path) -> None:
+    """Ensure least recently used thumbnails are evicted first."""
+    cache = ThumbnailCache(str(tmp_path), max_bytes=250)
+    cache.put("127.0.0.1", "MY_F0001", JPEG)
+    cache.put("127.0.0.1", "MY_F0002", PNG)
+    cache.get("127.0.0.1", "MY_F0001")
+    cache.put("127.0.0.1", "MY_F0003", b"x" * 100)
+
+    assert ("127.0.0.1", "MY_F0002") not in cache
+    assert cache.get("127.0.0.1", "MY_F0001") == JPEG
+    assert cache.total_bytes == 200
+
+
+@pytest.mark.asyncio
+async def test_get_thumbnails_fetches_missing(tmp_path) -> None:
+    """Ensure only missing thumbnails are fetched, in one call."""
+    cache = ThumbnailCache(str(tmp_path))
+    cache.put("127.0.0.1", "MY_F0001", JPEG)
+    tv = Mock(host="127.0.0.1")
+    tv.get_thumbnails = AsyncMock(return_value=({"MY_F0002": PNG}, {}))
+
+    thumbnails, failures = await cache.get_thumbnails(tv, ["MY_F0001", "MY_F0002"])
+
+    tv.get_thumbnails.assert_awaited_once_with(["MY_F0002"])
+    assert thumbnails == {"MY_F0001": JPEG, "MY_F0002": PNG}
+    assert failures == {}
+    assert cache.get("127.0.0.1", "MY_F0002") == PNG
+
+
+def test_image_deleted_invalidates(tmp_path) -> None:
+    """Ensure image_deleted events drop cached thumbnails."""
+    cache = ThumbnailCache(str(tmp_path))
+    cache.put("127.0.0.1", "MY_F0001", JPEG)
+    tv = Mock(host="127.0.0.1")
+    cache.attach(tv)
+    trigger, listener = tv.add_listener.call_args.args
+
+    listener(
+        "d2d_service_message",
+        {
+            "data": json.dumps(
+                {
+                    "event": trigger,
+                    "content_id_list": json.dumps([{"content_id": "MY_F0001"}]),
+                }
+            )
+        },
+    )
+
+    assert trigger == "image_deleted"
+    assert cache.get("127.0.0.1", "MY_F0001") is None
+    assert cache.total_bytes == 0
@@ -0,0 +1,105 @@
+"""Tests for tracing module."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from samsungtvws import tracing
+from samsungtvws.async_art import SamsungTVAsyncArt
+from samsungtvws.event import D2D_SERVICE_MESSAGE_EVENT
+
+
+class RecordingSpan(tracing.Span):
+    def __init__(self, name, attributes, links):
+        self.name = name
+        self.attributes = attributes
+        self.links = links
+        self.exception = None
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exception = exception
+
+    def end(self):
+        self.ended = True
+
+
+class RecordingTracer(tracing.Tracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes, links):
+        span = RecordingSpan(name, attributes, links)
+        self.spans.append(span)
+        return span
+
+
+@pytest.fixture(name="tracer")
+def get_tracer():
+    tracer = RecordingTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+def test_noop_span_without_tracer() -> None:
+    with tracing.span(tracing.OPEN, host="127.0.0.1") as span:
+        span.set_attribute("bytes", 1)
+    assert span is tracing.NOOP_SPAN
+
+
+@pytest.mark.asyncio
+async def test_response_handling_is_linked_to_request(tracer: RecordingTracer) -> None:
+    """Ensure the span handling a response links to the request that caused it."""
+    with patch.object(SamsungTVAsyncArt, "get_token"):
+        tv_art = SamsungTVAsyncArt("127.0.0.1")
+    handled = []
+    tv_art.add_listener("image_selected", lambda event, response: handled.append(response))
+
+    async def send_command(command):
+        request = json.loads(command.params["data"])
+        response = {
+            "event": D2D_SERVICE_MESSAGE_EVENT,
+            "data": json.dumps(
+                {
+                    "event": "image_selected",
+                    "request_id": request["request_id"],
+                    "content_id": request["content_id"],
+                }
+            ),
+        }
+        asyncio.get_running_loop().call_soon(
+            asyncio.ensure_future, tv_art.process_event(D2D_SERVICE_MESSAGE_EVENT, response)
+        )
+
+    with patch.object(tv_art, "start_listening"), patch.object(
+        tv_art, "send_command", side_effect=send_command
+    ):
+        await tv_art.select_image("MY_F0001")
+
+    spans = {span.name: span for span in tracer.spans}
+    request = spans[tracing.ART_REQUEST]
+    assert request.attributes["request"] == "select_image"
+    assert request.attributes["content_id"] == "MY_F0001"
+    assert spans[tracing.WAIT_FOR_RESPONSE].attributes["request_id"] == request.attributes["request_id"]
+    event = spans[tracing.ART_EVENT]
+    assert event.links == [request]
+    assert event.attributes["sub_event"] == "image_selected"
+    assert len(handled) == 1
+    assert all(span.ended for span in tracer.spans)
+    assert not tv_art._request_spans
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_recorded(tracer: RecordingTracer) -> None:
+    with patch.object(SamsungTVAsyncArt, "get_token"):
+        tv_art = SamsungTVAsyncArt("127.0.0.1")
+    with patch.object(tv_art, "start_listening"), patch.object(tv_art, "send_command"):
+        assert await tv_art.wait_for_response("123", timeout=0.01) is None
+    [span] = tracer.spans
+    assert isinstance(span.exception, asyncio.TimeoutError)
@@ -0,0 +1,89 @@
+"""Tests for upload_index module."""
+
+import hashlib
+import json
+import os
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from samsungtvws.event import D2D_SERVICE_MESSAGE_EVENT
+from samsungtvws.sync import DirectorySync
+from samsungtvws.upload_index import UploadIndex
+
+DATA = b"\xff\xd8\xff" + b"j" * 97
+
+
+def mock_tv(content_ids) -> Mock:
+    tv = Mock(host="127.0.0.1", catalog=None)
+    tv.available = AsyncMock(
+        return_value=[{"content_id": content_id} for content_id in content_ids]
+    )
+    tv.upload = AsyncMock(side_effect=["MY_F0001", "MY_F0002"])
+    tv.delete_list = AsyncMock()
+    return tv
+
+
+@pytest.mark.asyncio
+async def test_upload_skips_known_content(tmp_path) -> None:
+    """Ensure identical content is only uploaded once, across reloads."""
+    path = str(tmp_path / "index.json")
+    tv = mock_tv(["MY_F0001"])
+
+    assert await UploadIndex(path).upload(tv, DATA, matte="none") == "MY_F0001"
+    index = UploadIndex(path)
+    (tmp_path / "copy.jpg").write_bytes(DATA)
+    assert await index.upload(tv, str(tmp_path / "copy.jpg")) == "MY_F0001"
+
+    tv.upload.assert_awaited_once_with(DATA, matte="none")
+    tv.available.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_validates_against_tv(tmp_path) -> None:
+    """Ensure content deleted on the TV is uploaded again."""
+    index = UploadIndex(str(tmp_path / "index.json"))
+    index.add("127.0.0.1", hashlib.sha256(DATA).hexdigest(), "MY_F0009")
+    tv = mock_tv([])
+
+    assert await index.upload(tv, DATA) == "MY_F0001"
+    assert index.get("127.0.0.1", hashlib.sha256(DATA).hexdigest()) == "MY_F0001"
+
+
+@pytest.mark.asyncio
+async def test_image_events_update_index(tmp_path) -> None:
+    index = UploadIndex()
+    listeners = {}
+    tv = mock_tv([])
+    tv.add_listener = lambda trigger, listener: listeners.setdefault(trigger, listener)
+    index.attach(tv)
+    await index.validate(tv)
+    await index.upload(tv, DATA)
+
+    def event(name: str, content_id: str) -> None:
+        data = json.dumps({"event": name, "content_id": content_id})
+        listeners[name](D2D_SERVICE_MESSAGE_EVENT, {"data": data})
+
+    event("image_added", "MY_F0005")
+    assert "MY_F0005" in await index._live_content_ids(tv)
+    event("image_deleted", "MY_F0001")
+    assert index.get("127.0.0.1", hashlib.sha256(DATA).hexdigest()) is None
+
+
+@pytest.mark.asyncio
+async def test_directory_sync_copies_share_content(tmp_path) -> None:
+    """Ensure copies are uploaded once, and kept on the TV while a copy is left."""
+    folder = tmp_path / "images"
+    folder.mkdir()
+    (folder / "a.jpg").write_bytes(DATA)
+    (folder / "b.jpg").write_bytes(DATA)
+    tv = mock_tv(["MY_F0001"])
+    sync = DirectorySync(tv, str(folder), upload_index=UploadIndex())
+
+    await sync.sync()
+    os.remove(folder / "a.jpg")
+    await sync.sync()
+
+    tv.upload.assert_awaited_once()
+    tv.delete_list.assert_not_awaited()
+    assert sync.manifest.content_ids() == {"b.jpg": "MY_F0001"}
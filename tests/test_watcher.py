@@ -0,0 +1,45 @@
+"""Tests for watcher module."""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from samsungtvws.watcher import FolderWatcher
+
+# conftest replaces asyncio.sleep, the polling loop needs the real one
+_SLEEP = asyncio.sleep
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs inotify")
+@pytest.mark.asyncio
+async def test_inotify_batches_finished_files(tmp_path) -> None:
+    """Ensure closed and moved files are released together after the debounce."""
+    async with FolderWatcher(str(tmp_path), debounce=0.05) as watcher:
+        assert watcher.inotify
+        (tmp_path / "a.jpg").write_bytes(b"a")
+        (tmp_path / "notes.txt").write_bytes(b"b")
+        (tmp_path / "partial").write_bytes(b"c")
+        os.rename(tmp_path / "partial", tmp_path / "c.png")
+        assert await watcher.wait(timeout=2) == {"a.jpg", "c.png"}
+
+        os.remove(tmp_path / "a.jpg")
+        assert await watcher.wait(timeout=2) == {"a.jpg"}
+        assert await watcher.wait(timeout=0.1) == set()
+
+
+@pytest.mark.asyncio
+async def test_polling_waits_for_stable_files(tmp_path) -> None:
+    """Ensure polling only reports a file once it stopped changing."""
+    (tmp_path / "old.jpg").write_bytes(b"old")
+    with patch("asyncio.sleep", _SLEEP):
+        watcher = FolderWatcher(str(tmp_path), poll_interval=0.05, use_inotify=False)
+        await watcher.start()
+        assert not watcher.inotify
+        await asyncio.sleep(0)
+        (tmp_path / "new.jpg").write_bytes(b"new")
+        os.remove(tmp_path / "old.jpg")
+        assert await watcher.wait(timeout=2) == {"new.jpg", "old.jpg"}
+        await watcher.stop()